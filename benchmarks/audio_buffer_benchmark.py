@@ -0,0 +1,81 @@
+"""
+Measure memory used to prepare one file's waveform for Whisper, before and after AudioBuffer.
+
+The previous path decoded the WAV into int16 bytes, flattened, converted and
+normalized them into new arrays, copied the first 30 seconds for language
+detection with whisper.pad_or_trim and concatenated the VAD speech regions
+into another array. The AudioBuffer path fills one float32 array, hands out
+views and compacts speech regions in place. Peak memory is traced with
+tracemalloc, which sees numpy's allocations.
+
+Usage:
+    python -m benchmarks.audio_buffer_benchmark --duration 3600
+"""
+
+import os
+import sys
+import json
+import wave
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+
+from benchmarks.resample_benchmark import write_long_wav
+from src.audio_buffer import WINDOW_SAMPLES, AudioBuffer
+from src.vad import detect_speech_regions, extract_speech
+
+def previous_path(path):
+    """Waveform preparation as done before AudioBuffer."""
+    with wave.open(path, 'rb') as f:
+        data = f.readframes(f.getnframes())
+    # whisper.load_audio
+    audio = np.frombuffer(data, np.int16).flatten().astype(np.float32) / 32768.0
+    # whisper.pad_or_trim for language detection
+    window = audio.take(indices=range(WINDOW_SAMPLES), axis=-1) if len(audio) >= WINDOW_SAMPLES else \
+        np.pad(audio, (0, WINDOW_SAMPLES - len(audio)))
+    speech = extract_speech(audio, detect_speech_regions(audio))
+    return len(speech), len(window)
+
+def buffer_path(path):
+    """Waveform preparation with AudioBuffer."""
+    buffer = AudioBuffer.from_wav(path)
+    window = buffer.window()
+    buffer.compact(detect_speech_regions(buffer.samples))
+    return len(buffer), len(window)
+
+def measure(func, path):
+    tracemalloc.start()
+    try:
+        func(path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare waveform preparation memory with and without AudioBuffer')
+    parser.add_argument('--duration', type=float, default=3600, help='Seconds of synthetic 16kHz audio')
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--workdir', help='Directory for the generated input (default: a temp dir)')
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='audio-buffer-bench-')
+    path = os.path.join(workdir, 'input_16000.wav')
+    write_long_wav(path, args.duration, 16000)
+    waveform_bytes = int(args.duration * 16000) * 4
+
+    results = {}
+    for name, func in (('previous', previous_path), ('audio_buffer', buffer_path)):
+        peak = measure(func, path)
+        results[name] = {'peak_traced_bytes': peak, 'waveforms': round(peak / waveform_bytes, 2)}
+        print(f"{name:<13} peak={peak / 2**20:.0f}MiB ({results[name]['waveforms']}x the float32 waveform)")
+    os.unlink(path)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
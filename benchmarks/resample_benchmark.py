@@ -0,0 +1,137 @@
+"""
+Compare the streaming resampler with the scipy fallback it replaced on long WAV files.
+
+The old fallback read the whole file, resampled it in one FFT with
+scipy.signal.resample and then converted it to float32, so its memory grew
+with several copies of the input. The streaming resampler reads fixed-size
+blocks and fills a single float32 output array.
+
+Each measurement runs in a fresh process so peak RSS is not inflated by
+memory an earlier run left with the allocator, and a run killed for lack of
+memory is reported instead of ending the benchmark.
+
+Usage:
+    python -m benchmarks.resample_benchmark                       # one hour at 44.1 and 48 kHz
+    python -m benchmarks.resample_benchmark --duration 600 --rates 22050
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import argparse
+import tempfile
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from benchmarks.run_benchmarks import RSSSampler
+from benchmarks.synthetic import synthetic_audio
+from src.resample import resample_wav
+
+# Seconds of audio generated at a time when writing the input file
+WRITE_CHUNK_SECONDS = 60
+
+def write_long_wav(path, seconds, sample_rate, channels=1):
+    """Write a long 16-bit synthetic WAV without holding it all in memory."""
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        written, seed = 0.0, 0
+        while written < seconds:
+            length = min(WRITE_CHUNK_SECONDS, seconds - written)
+            pcm = (synthetic_audio(length, sample_rate, seed=seed) * 32767).astype('<i2')
+            f.writeframes(np.repeat(pcm[:, None], channels, axis=1).tobytes())
+            written += length
+            seed += 1
+
+def streaming(path, block_frames):
+    """Streaming polyphase resampler."""
+    return resample_wav(path, block_frames=block_frames)
+
+def scipy_fallback(path, block_frames=None):
+    """The fallback load_audio used before the streaming resampler."""
+    from scipy.io import wavfile
+    import scipy.signal
+
+    sr, audio = wavfile.read(path)
+    if sr != 16000:
+        audio = scipy.signal.resample(audio, int(len(audio) * 16000 / sr))
+    return audio.astype(np.float32) / 32768.0
+
+METHODS = {'streaming': streaming, 'scipy': scipy_fallback}
+
+def _run(name, path, block_frames, audio_seconds):
+    """Run one resampler on a file and record wall time and peak RSS."""
+    with RSSSampler() as sampler:
+        started = time.perf_counter()
+        audio = METHODS[name](path, block_frames)
+        wall = time.perf_counter() - started
+    return {
+        'wall_seconds': round(wall, 4),
+        'peak_rss_bytes': sampler.peak,
+        'output_samples': len(audio),
+        'audio_seconds': audio_seconds,
+        'real_time_factor': round(wall / audio_seconds, 6)
+    }
+
+def measure(name, path, block_frames, audio_seconds):
+    """Measure one resampler in its own process."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        try:
+            return executor.submit(_run, name, path, block_frames, audio_seconds).result()
+        except BrokenProcessPool:
+            return {'error': 'process died, most likely out of memory'}
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark WAV resampling to 16 kHz')
+    parser.add_argument('--duration', type=float, default=3600,
+                        help='Seconds of synthetic audio per input file')
+    parser.add_argument('--rates', type=int, nargs='+', default=[44100, 48000],
+                        help='Input sample rates to test')
+    parser.add_argument('--channels', type=int, default=1,
+                        help='Channels in the input files')
+    parser.add_argument('--block-frames', type=int, default=65536,
+                        help='Frames per block for the streaming resampler')
+    parser.add_argument('--skip-scipy', action='store_true',
+                        help='Only run the streaming resampler')
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--workdir', help='Directory for generated inputs (default: a temp dir)')
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    workdir = args.workdir or tempfile.mkdtemp(prefix='resample-bench-')
+    methods = ['streaming']
+    if not args.skip_scipy:
+        try:
+            import scipy.signal  # noqa: F401
+            methods.append('scipy')
+        except ImportError:
+            print("scipy is not installed, only the streaming resampler is measured")
+
+    results = {}
+    for rate in args.rates:
+        path = os.path.join(workdir, f'input_{rate}.wav')
+        write_long_wav(path, args.duration, rate, args.channels)
+        for name in methods:
+            record = measure(name, path, args.block_frames, args.duration)
+            results[f'{name}_{rate}'] = record
+            if 'error' in record:
+                print(f"{name:<10} {rate:>6} Hz failed: {record['error']}")
+                continue
+            print(f"{name:<10} {rate:>6} Hz wall={record['wall_seconds']:.3f}s "
+                  f"rtf={record['real_time_factor']:.5f} peak_rss={record['peak_rss_bytes'] / 2**20:.0f}MiB")
+        os.unlink(path)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Run the end-to-end benchmark suite and compare it against a JSON baseline.
+
+All inputs are generated offline and translation goes to a local stub
+backend, so runs are reproducible and need no network access. FFmpeg is
+required to mux the synthetic media.
+
+Timings and memory depend on the machine, so no baseline is committed. Run
+with --update-baseline once on the machine that does the comparisons (a run
+without a baseline records one too), and again after intentional changes.
+
+Usage:
+    python -m benchmarks.run_benchmarks                    # compare with benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --update-baseline  # record a new baseline
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+
+from src.utils import get_rss_bytes
+from benchmarks import stub_translator
+from benchmarks.synthetic import make_media, synthetic_transcript
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Wall-time differences below this many seconds are treated as noise
+MIN_WALL_DELTA = 0.05
+
+class RSSSampler:
+    """Track the peak resident set size while a block of code runs."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, get_rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = get_rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, get_rss_bytes())
+
+def measure(func, audio_seconds=None):
+    """Run func and record its wall time, peak RSS and real-time factor.
+
+    Returns:
+        tuple: (result, record)
+    """
+    stub_translator.StubBackend.reset()
+    with RSSSampler() as sampler:
+        started = time.perf_counter()
+        result = func()
+        wall = time.perf_counter() - started
+
+    record = {
+        'wall_seconds': round(wall, 4),
+        'peak_rss_bytes': sampler.peak,
+        'requests': stub_translator.StubBackend.requests
+    }
+    if audio_seconds:
+        record['audio_seconds'] = audio_seconds
+        record['real_time_factor'] = round(wall / audio_seconds, 6)
+    return result, record
+
+def run_suite(args):
+    """Benchmark each pipeline stage.
+
+    Returns:
+        dict: Records keyed by stage name
+    """
+    results = {}
+    workdir = args.workdir or tempfile.mkdtemp(prefix='subtitle-bench-')
+    try:
+        run_stages(args, workdir, results)
+    finally:
+        # Generated media can be large; only keep it when the caller chose the directory
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def run_stages(args, workdir, results):
+    """Run each stage's benchmark with inputs in workdir, adding records to results."""
+    from src.transcriber import WhisperTranscriber
+    from src.translator import Translator
+    from src.formatter import SubtitleFormatter
+
+    if not args.skip_transcribe:
+        media_path, audio = make_media(workdir, args.duration, container=args.container)
+        audio_seconds = len(audio) / 16000
+
+        transcriber, results['model_load'] = measure(
+            lambda: WhisperTranscriber(model_name=args.model, use_gpu=False)
+        )
+        transcriber.vad = args.vad
+
+        def extract():
+            path = transcriber._preprocess_audio(media_path)
+            os.unlink(path)
+
+        _, results['extraction'] = measure(extract, audio_seconds)
+        _, results['transcription'] = measure(lambda: transcriber.transcribe(media_path), audio_seconds)
+
+    transcript = synthetic_transcript(args.sentences)
+    transcript_seconds = transcript['segments'][-1]['end']
+
+    translator = Translator()
+    translator.configure_quality(quality_mode='balanced', chunk_size=args.chunk_size)
+    translator.translation_services = [stub_translator.install()]
+    _, results['translation'] = measure(
+        lambda: translator.translate(transcript['text'], source_lang='en', target_lang='fr'),
+        transcript_seconds
+    )
+
+    formatter = SubtitleFormatter()
+    for format in ('srt', 'vtt'):
+        _, results[f'formatting_{format}'] = measure(
+            lambda: formatter.format_subtitles(
+                text=transcript['text'],
+                segments=transcript['segments'],
+                output_path=os.path.join(workdir, f'benchmark.{format}'),
+                format=format
+            ),
+            transcript_seconds
+        )
+
+def compare(results, baseline, threshold):
+    """Find metrics that regressed past the threshold.
+
+    Args:
+        results (dict): Current records by stage
+        baseline (dict): Baseline records by stage
+        threshold (float): Allowed relative increase, e.g. 0.25 for 25%
+
+    Returns:
+        list: Human-readable regression descriptions
+    """
+    regressions = []
+    for stage, record in results.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+
+        wall, base_wall = record['wall_seconds'], base.get('wall_seconds', 0)
+        if base_wall and wall > base_wall * (1 + threshold) and wall - base_wall > MIN_WALL_DELTA:
+            regressions.append(f"{stage}: wall time {base_wall:.3f}s -> {wall:.3f}s")
+
+        rss, base_rss = record['peak_rss_bytes'], base.get('peak_rss_bytes', 0)
+        if base_rss and rss > base_rss * (1 + threshold):
+            regressions.append(f"{stage}: peak RSS {base_rss / 2**20:.0f} MiB -> {rss / 2**20:.0f} MiB")
+
+        if record['requests'] > base.get('requests', record['requests']):
+            regressions.append(f"{stage}: requests {base['requests']} -> {record['requests']}")
+
+    return regressions
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark the subtitle pipeline')
+    parser.add_argument('--baseline', default=os.path.join(BENCHMARK_DIR, 'baseline.json'),
+                        help='Baseline JSON file')
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'results.json'),
+                        help='Where to write the results of this run')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Write this run as the new baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed relative regression before the run fails')
+    parser.add_argument('--duration', type=float, default=120,
+                        help='Seconds of synthetic media to transcribe')
+    parser.add_argument('--container', default='mp4', choices=['mp4', 'mkv', 'mov', 'avi'],
+                        help='Container for the synthetic media')
+    parser.add_argument('--sentences', type=int, default=3000,
+                        help='Sentences in the synthetic transcript')
+    parser.add_argument('--chunk-size', type=int, default=3000,
+                        help='Translator chunk size')
+    parser.add_argument('--model', default='tiny',
+                        help='Whisper model for the transcription benchmark')
+    parser.add_argument('--vad', action='store_true',
+                        help='Run the transcription benchmark with voice activity detection')
+    parser.add_argument('--skip-transcribe', action='store_true',
+                        help='Only benchmark translation and formatting')
+    parser.add_argument('--workdir', help='Directory for generated inputs (default: a temp dir)')
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    results = run_suite(args)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    for stage, record in results.items():
+        rtf = f" rtf={record['real_time_factor']:.3f}" if 'real_time_factor' in record else ''
+        print(f"{stage:<18} wall={record['wall_seconds']:.3f}s{rtf} "
+              f"peak_rss={record['peak_rss_bytes'] / 2**20:.0f}MiB requests={record['requests']}")
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        if not args.update_baseline:
+            print(f"No baseline at {args.baseline}; recording this run as the baseline")
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Offline generators for benchmark inputs: synthetic audio, muxed media files and transcripts.
+"""
+
+import os
+import wave
+import random
+import subprocess
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog while speakers discuss results of "
+    "an experiment about sound video language model translation quality timing "
+    "and many other topics that appear in long recorded lectures or meetings"
+).split()
+
+def synthetic_audio(seconds, sample_rate=SAMPLE_RATE, seed=0):
+    """Build a waveform alternating tones, noise and silence.
+
+    Tone bursts stand in for voiced speech, noise for music or ambience and
+    silence for pauses, so VAD and decoding see a realistic mix.
+
+    Args:
+        seconds (float): Duration of the waveform
+        sample_rate (int): Sample rate in Hz
+        seed (int): Random seed, for reproducible inputs
+
+    Returns:
+        np.ndarray: float32 samples in [-1, 1]
+    """
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(int(seconds * sample_rate), dtype=np.float32)
+    position = 0
+    while position < len(audio):
+        length = min(len(audio) - position, int(rng.uniform(0.5, 4.0) * sample_rate))
+        kind = rng.choice(['tone', 'noise', 'silence'], p=[0.5, 0.2, 0.3])
+        t = np.arange(length, dtype=np.float32) / sample_rate
+        if kind == 'tone':
+            pitch = rng.uniform(110, 330)
+            # Harmonics with a slow amplitude envelope, roughly like a voice
+            envelope = 0.5 * (1 - np.cos(2 * np.pi * t / max(t[-1], 1e-3))) if length > 1 else 1.0
+            chunk = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in (1, 2, 3)) * envelope * 0.3
+        elif kind == 'noise':
+            chunk = rng.normal(0, 0.05, length)
+        else:
+            chunk = rng.normal(0, 0.002, length)
+        audio[position:position + length] = chunk
+        position += length
+    return np.clip(audio, -1.0, 1.0)
+
+def write_wav(path, audio, sample_rate=SAMPLE_RATE):
+    """Write float32 samples as a 16-bit mono WAV file."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype('<i2')
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+def mux_media(wav_path, output_path, ffmpeg='ffmpeg'):
+    """Mux a WAV file with a tiny black video track into a container.
+
+    The container is chosen from the output extension (mp4, mkv, mov, avi), so
+    extraction is benchmarked on real demuxing and audio decoding.
+
+    Args:
+        wav_path (str): Source audio
+        output_path (str): Media file to create
+        ffmpeg (str): FFmpeg executable
+    """
+    audio_codec = 'pcm_s16le' if output_path.endswith('.avi') else 'aac'
+    subprocess.run(
+        [
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=c=black:s=64x64:r=5',
+            '-i', wav_path,
+            '-shortest', '-c:v', 'mpeg4', '-c:a', audio_codec,
+            output_path
+        ],
+        check=True
+    )
+
+def make_media(directory, seconds, container='mp4', seed=0, ffmpeg='ffmpeg'):
+    """Generate a synthetic media file.
+
+    Args:
+        directory (str): Where to write the files
+        seconds (float): Duration
+        container (str): Container extension
+        seed (int): Random seed
+        ffmpeg (str): FFmpeg executable
+
+    Returns:
+        tuple: (media_path, audio) with the generated waveform
+    """
+    os.makedirs(directory, exist_ok=True)
+    audio = synthetic_audio(seconds, seed=seed)
+    wav_path = os.path.join(directory, f"synthetic_{seed}_{int(seconds)}s.wav")
+    media_path = os.path.splitext(wav_path)[0] + '.' + container
+    write_wav(wav_path, audio)
+    mux_media(wav_path, media_path, ffmpeg=ffmpeg)
+    return media_path, audio
+
+def synthetic_transcript(sentences, seed=0):
+    """Build a long transcript with timed segments.
+
+    Args:
+        sentences (int): Number of sentences, one segment each
+        seed (int): Random seed
+
+    Returns:
+        dict: Transcription in the shape returned by WhisperTranscriber.transcribe
+    """
+    rng = random.Random(seed)
+    segments = []
+    start = 0.0
+    for _ in range(sentences):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(4, 18))]
+        text = ' '.join(words).capitalize() + rng.choice(['.', '.', '?', '!'])
+        duration = 0.35 * len(words)
+        segments.append({'start': start, 'end': start + duration, 'text': ' ' + text})
+        start += duration + rng.uniform(0.1, 1.0)
+    return {
+        'text': ''.join(segment['text'] for segment in segments),
+        'segments': segments,
+        'language': 'en'
+    }
@@ -0,0 +1,140 @@
+"""
+Load-test Translator.translate against the local translation-service simulator.
+
+Concurrent callers translate synthetic transcripts through the real
+Translator (chunking, quality checks, service fallback and retry backoff)
+while the simulator injects latency, 429s, 503s and empty responses. The
+report shows throughput, call and request tail latency, and retry
+amplification: backend requests sent per chunk that needed translating.
+
+Usage:
+    python -m benchmarks.translation_load --calls 40 --concurrency 8 --failure-rate 0.1
+    python -m benchmarks.translation_load --rate-limit 5 --fallback --retry-delay 0.2
+"""
+
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from src.metrics import MetricsRecorder
+from src.translator import Translator
+from benchmarks.synthetic import synthetic_transcript
+from benchmarks.translation_simulator import (
+    SimulatedBackend, TranslationSimulator, add_profile_arguments, install, profile_from_arguments
+)
+
+def percentiles(values):
+    """p50, p95, p99 and max of a list of seconds."""
+    if not values:
+        return {}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50': round(float(p50), 4), 'p95': round(float(p95), 4),
+            'p99': round(float(p99), 4), 'max': round(float(max(values)), 4)}
+
+def run_load_test(args):
+    """Drive concurrent translations against a simulator.
+
+    Returns:
+        dict: Report with throughput, latencies, responses and retry amplification
+    """
+    profiles = {'primary': profile_from_arguments(args)}
+    if args.fallback:
+        profiles['fallback'] = profile_from_arguments(args, prefix='fallback-')
+    server = TranslationSimulator(profiles, seed=args.seed).start()
+
+    try:
+        translator = Translator()
+        translator.configure_quality(quality_mode='balanced', chunk_size=args.chunk_size)
+        translator.translation_services = [install(server.url, name) for name in profiles]
+        translator.max_retries = args.max_retries
+        translator.retry_delay = args.retry_delay
+        translator.verbose = False
+        translator.metrics = MetricsRecorder()
+
+        texts = [synthetic_transcript(args.sentences, seed=args.seed + i)['text'] for i in range(args.calls)]
+        chunks = sum(len(translator._smart_split_text(text)) for text in texts)
+        SimulatedBackend.reset()
+
+        def call(text):
+            started = time.perf_counter()
+            try:
+                translator.translate(text, source_lang='en', target_lang='fr')
+                return True, time.perf_counter() - started
+            except Exception:
+                return False, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            outcomes = list(executor.map(call, texts))
+        wall = time.perf_counter() - started
+        server_stats = server.stats()
+    finally:
+        server.stop()
+
+    succeeded = [seconds for ok, seconds in outcomes if ok]
+    translated_chars = sum(len(text) for text, (ok, _) in zip(texts, outcomes) if ok)
+    backend_requests = sum(SimulatedBackend.responses.values())
+    retried = sum(value for (name, _), value in translator.metrics.counters.items()
+                  if name == 'translation_retries_total')
+
+    return {
+        'profiles': {name: profile.to_dict() for name, profile in profiles.items()},
+        'calls': args.calls,
+        'concurrency': args.concurrency,
+        'succeeded': len(succeeded),
+        'failed': args.calls - len(succeeded),
+        'wall_seconds': round(wall, 4),
+        'calls_per_second': round(len(succeeded) / wall, 4),
+        'characters_per_second': round(translated_chars / wall, 1),
+        'call_latency': percentiles([seconds for _, seconds in outcomes]),
+        'request_latency': percentiles(SimulatedBackend.latencies),
+        'chunks': chunks,
+        'backend_requests': backend_requests,
+        'retried_requests': retried,
+        'retry_amplification': round(backend_requests / chunks, 3) if chunks else None,
+        'responses': {str(status): count for status, count in sorted(SimulatedBackend.responses.items())},
+        'server': server_stats
+    }
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Load-test the translator against a simulated service')
+    parser.add_argument('--calls', type=int, default=40, help='Translate calls to make')
+    parser.add_argument('--concurrency', type=int, default=8, help='Calls in flight at once')
+    parser.add_argument('--sentences', type=int, default=60, help='Sentences per translated text')
+    parser.add_argument('--chunk-size', type=int, default=3000, help='Translator chunk size')
+    parser.add_argument('--max-retries', type=int, default=3, help='Translator retry rounds')
+    parser.add_argument('--retry-delay', type=float, default=1.0,
+                        help='Translator backoff base delay in seconds')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--output', help='Write the report as JSON')
+    add_profile_arguments(parser)
+    parser.add_argument('--fallback', action='store_true',
+                        help='Add a second simulated service after the primary one')
+    add_profile_arguments(parser, prefix='fallback-')
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    report = run_load_test(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    call, request = report['call_latency'], report['request_latency']
+    print(f"calls        {report['succeeded']}/{report['calls']} succeeded in {report['wall_seconds']:.2f}s "
+          f"({report['calls_per_second']:.2f} calls/s, {report['characters_per_second']:.0f} chars/s)")
+    if call:
+        print(f"call latency p50={call['p50']:.3f}s p95={call['p95']:.3f}s p99={call['p99']:.3f}s max={call['max']:.3f}s")
+    if request:
+        print(f"request      p50={request['p50']:.3f}s p95={request['p95']:.3f}s p99={request['p99']:.3f}s max={request['max']:.3f}s")
+    print(f"retries      {report['backend_requests']} requests for {report['chunks']} chunks "
+          f"(amplification {report['retry_amplification']}x, {report['retried_requests']} in backoff rounds)")
+    print(f"responses    {report['responses']}")
+    return 1 if report['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
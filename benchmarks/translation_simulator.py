@@ -0,0 +1,355 @@
+"""
+Local HTTP stand-in for a translation service, for load and failure testing.
+
+The server answers POST /translate/<service> with a word-reversed
+"translation" (like the stub backend), after a latency drawn from a
+configurable distribution. Each service name has its own profile, so a
+primary and a fallback service can behave differently, and can answer with
+rate-limit 429s, intermittent 503s or empty translations. SimulatedBackend is
+the matching client, registered with the translator through install().
+
+Usage:
+    python -m benchmarks.translation_simulator --port 8790 --failure-rate 0.1
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.translator import register_translation_service
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'exponential', 'lognormal')
+
+def reverse_words(text):
+    """Reverse each word, keeping the word count and line structure intact."""
+    return '\n'.join(' '.join(word[::-1] for word in line.split(' ')) for line in text.split('\n'))
+
+class ServiceProfile:
+    def __init__(self, latency='lognormal', latency_mean=0.2, latency_sigma=0.5, rate_limit=None,
+                 burst=None, failure_rate=0.0, empty_rate=0.0):
+        """How one simulated service behaves.
+
+        Args:
+            latency (str): Latency distribution, one of LATENCY_DISTRIBUTIONS
+            latency_mean (float): Mean response time in seconds
+            latency_sigma (float): Shape of the lognormal distribution; larger
+                values give a longer tail
+            rate_limit (float, optional): Requests per second allowed before
+                answering 429, shared by all clients
+            burst (int, optional): Requests allowed at once above the rate,
+                defaults to one second's worth
+            failure_rate (float): Fraction of requests answered with a 503
+            empty_rate (float): Fraction of requests answered with an empty translation
+        """
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency}")
+        self.latency = latency
+        self.latency_mean = latency_mean
+        self.latency_sigma = latency_sigma
+        self.rate_limit = rate_limit
+        self.burst = burst or max(1, int(rate_limit or 1))
+        self.failure_rate = failure_rate
+        self.empty_rate = empty_rate
+
+    def sample_latency(self, rng):
+        """Draw one response time in seconds."""
+        if self.latency == 'fixed':
+            return self.latency_mean
+        if self.latency == 'uniform':
+            return rng.uniform(0, 2 * self.latency_mean)
+        if self.latency == 'exponential':
+            return rng.expovariate(1 / self.latency_mean) if self.latency_mean > 0 else 0.0
+        # Lognormal with the requested mean rather than median
+        mu = math.log(max(self.latency_mean, 1e-6)) - self.latency_sigma ** 2 / 2
+        return rng.lognormvariate(mu, self.latency_sigma)
+
+    def to_dict(self):
+        return dict(vars(self))
+
+class _TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Take one token. Returns seconds until one is available, 0 on success."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+class _SimulatedService:
+    def __init__(self, profile, seed):
+        self.profile = profile
+        self.bucket = _TokenBucket(profile.rate_limit, profile.burst) if profile.rate_limit else None
+        self.counts = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def decide(self):
+        """Pick the outcome and latency of one request."""
+        with self._lock:
+            latency = self.profile.sample_latency(self._rng)
+            roll = self._rng.random()
+        if self.bucket is not None:
+            wait = self.bucket.take()
+            if wait:
+                # Throttled requests are rejected quickly
+                return 'rate_limited', min(latency, 0.01), wait
+        if roll < self.profile.failure_rate:
+            return 'failed', latency, None
+        if roll < self.profile.failure_rate + self.profile.empty_rate:
+            return 'empty', latency, None
+        return 'ok', latency, None
+
+    def count(self, outcome):
+        with self._lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """HTTP API of the simulator.
+
+    POST /translate/<service>  {"text", "source", "target"} -> {"translation"}
+    GET  /stats                responses per service and outcome
+    POST /reset                clear the response counts
+    """
+
+    server_version = "TranslationSimulator"
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.server.stats())
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+
+        if parts == ['reset']:
+            self.server.reset()
+            self._send_json(200, {'status': 'ok'})
+            return
+        if len(parts) != 2 or parts[0] != 'translate':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        service = self.server.service(parts[1])
+        try:
+            text = json.loads(body or b'{}')['text']
+        except (ValueError, KeyError) as e:
+            service.count('bad_request')
+            self._send_json(400, {'error': f"Invalid translation request: {str(e)}"})
+            return
+
+        outcome, latency, retry_after = service.decide()
+        time.sleep(latency)
+        service.count(outcome)
+        if outcome == 'rate_limited':
+            self._send_json(429, {'error': 'Too many requests'},
+                            headers={'Retry-After': str(max(1, round(retry_after)))})
+        elif outcome == 'failed':
+            self._send_json(503, {'error': 'Service temporarily unavailable'})
+        elif outcome == 'empty':
+            self._send_json(200, {'translation': ''})
+        else:
+            self._send_json(200, {'translation': reverse_words(text)})
+
+class TranslationSimulator(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, profiles=None, default_profile=None, host='127.0.0.1', port=0, seed=0):
+        """Threaded HTTP server simulating one or more translation services.
+
+        Args:
+            profiles (dict, optional): ServiceProfile by service name
+            default_profile (ServiceProfile, optional): Profile of services not
+                in profiles, defaults to a healthy service
+            host (str): Interface to listen on
+            port (int): TCP port, 0 to pick a free one
+            seed (int): Random seed, for reproducible outcomes
+        """
+        super().__init__((host, port), SimulatorRequestHandler)
+        self.profiles = dict(profiles or {})
+        self.default_profile = default_profile or ServiceProfile()
+        self.seed = seed
+        self._services = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def service(self, name):
+        with self._lock:
+            if name not in self._services:
+                profile = self.profiles.get(name, self.default_profile)
+                self._services[name] = _SimulatedService(profile, f"{self.seed}-{name}")
+            return self._services[name]
+
+    def stats(self):
+        """Responses sent per service and outcome."""
+        with self._lock:
+            services = dict(self._services)
+        return {name: dict(service.counts) for name, service in services.items()}
+
+    def reset(self):
+        with self._lock:
+            self._services = {}
+
+    def start(self):
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+class SimulatedBackend:
+    """Translation backend that sends each request to the simulator.
+
+    Non-200 responses raise, like the real backends do, so Translator's
+    fallback and retry logic sees realistic failures. Responses are counted
+    per status code and every request's latency is kept.
+    """
+
+    timeout = 30.0
+    responses = {}
+    latencies = []
+    _lock = threading.Lock()
+
+    def __init__(self, url, service, source='auto', target='en'):
+        self.endpoint = f"{url.rstrip('/')}/translate/{service}"
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        payload = json.dumps({'text': text, 'source': self.source, 'target': self.target}).encode('utf-8')
+        request = urllib.request.Request(self.endpoint, data=payload,
+                                         headers={'Content-Type': 'application/json'})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=SimulatedBackend.timeout) as response:
+                status = response.status
+                translation = json.loads(response.read())['translation']
+        except urllib.error.HTTPError as e:
+            SimulatedBackend._record(e.code, time.perf_counter() - started)
+            raise Exception(f"HTTP {e.code} {e.reason}")
+        SimulatedBackend._record(status, time.perf_counter() - started)
+        return translation
+
+    @classmethod
+    def _record(cls, status, seconds):
+        with cls._lock:
+            cls.responses[status] = cls.responses.get(status, 0) + 1
+            cls.latencies.append(seconds)
+
+    @classmethod
+    def reset(cls):
+        """Clear the response counts and latencies."""
+        with cls._lock:
+            cls.responses = {}
+            cls.latencies = []
+
+def install(url, name='simulator'):
+    """Register a simulated service with the translator.
+
+    Args:
+        url (str): Base URL of a running TranslationSimulator
+        name (str): Service name, also selecting the simulator profile
+
+    Returns:
+        str: The service name to put in Translator.translation_services
+    """
+    register_translation_service(
+        name, lambda source='auto', target='en': SimulatedBackend(url, name, source=source, target=target)
+    )
+    return name
+
+def add_profile_arguments(parser, prefix=''):
+    """Add the ServiceProfile options to an argument parser."""
+    parser.add_argument(f'--{prefix}latency', default='lognormal', choices=LATENCY_DISTRIBUTIONS,
+                        help='Response time distribution')
+    parser.add_argument(f'--{prefix}latency-mean', type=float, default=0.2,
+                        help='Mean response time in seconds')
+    parser.add_argument(f'--{prefix}latency-sigma', type=float, default=0.5,
+                        help='Lognormal shape; larger means a longer tail')
+    parser.add_argument(f'--{prefix}rate-limit', type=float,
+                        help='Requests per second before answering 429')
+    parser.add_argument(f'--{prefix}burst', type=int,
+                        help='Requests allowed at once above the rate limit')
+    parser.add_argument(f'--{prefix}failure-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with a 503')
+    parser.add_argument(f'--{prefix}empty-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with an empty translation')
+
+def profile_from_arguments(args, prefix=''):
+    """Build a ServiceProfile from options added by add_profile_arguments."""
+    option = lambda name: getattr(args, (prefix + name).replace('-', '_'))
+    return ServiceProfile(
+        latency=option('latency'),
+        latency_mean=option('latency-mean'),
+        latency_sigma=option('latency-sigma'),
+        rate_limit=option('rate-limit'),
+        burst=option('burst'),
+        failure_rate=option('failure-rate'),
+        empty_rate=option('empty-rate')
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a simulated translation service')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8790, help='TCP port')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    # Every service name gets the profile given on the command line
+    server = TranslationSimulator(default_profile=profile_from_arguments(args),
+                                  host=args.host, port=args.port, seed=args.seed)
+    print(f"Simulating translation services at {server.url}/translate/<service>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
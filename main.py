@@ -2,15 +2,34 @@
 
 import argparse
 import os
+import time
+from contextlib import nullcontext
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from src.transcriber import WhisperTranscriber
 from src.translator import Translator
 from src.formatter import SubtitleFormatter
-from src.utils import setup_logging, validate_input, create_output_dir
+from src.retranslator import IncrementalRetranslator
+from src.pipeline import StreamingTranslation, translate_transcription
+from src.batch import PipelineEngine, RetryingFeed, TranscriptionPool, create_batch_stages, find_artifacts, find_videos
+from src.artifacts import ARTIFACT_EXTENSION, read_artifact, read_artifact_header, write_artifact
+from src.manifest import BatchManifest
+from src.journal import JobJournal, DONE
+from src.service import SubtitleService, create_server
+from src.metrics import MetricsRecorder
+from src.audio_cache import AudioCache
+from src.work_queue import WorkQueue, default_node_id
+from src.memory import MemoryBudget
+from src.coalescer import TranslationCoalescer
+from src.profiling import StageProfiler
+from src.probe import BatchETA, ProbeCache, get_ffprobe_path, probe_all, unusable_reason
+from src.utils import setup_logging, validate_input, create_output_dir, format_duration, get_rss_bytes
 
 console = Console()
 
+# Translation stage workers with --coalesce; each one just waits on a shared request
+COALESCE_WORKERS = 32
+
 def parse_arguments():
     parser = argparse.ArgumentParser(
         description='🎬 Interactive Video Subtitle Generator 🎥',
@@ -38,6 +57,111 @@ def parse_arguments():
     parser.add_argument('--context-aware', action='store_true', default=True,
                       help='🧠 Use context-aware translation for better accuracy')
     
+    # Incremental re-translation options
+    parser.add_argument('--retranslate', action='store_true',
+                      help='♻️ Re-translate only the edited cues of --input (a corrected SRT/VTT file)')
+    parser.add_argument('--previous-source', type=str,
+                      help='📜 Source subtitle file the existing translation was made from')
+    parser.add_argument('--translation', type=str,
+                      help='🌍 Existing translated subtitle file to update')
+    parser.add_argument('--source-language', type=str, default='auto',
+                      help='🗣️ Source language code of the subtitles (used with --retranslate)')
+    
+    # Batch pipeline options
+    parser.add_argument('--extract-workers', type=int, default=1,
+                      help='🎵 Concurrent audio extractions in batch mode')
+    parser.add_argument('--transcribe-workers', type=int, default=1,
+                      help='🎙️ Whisper worker processes in batch mode (each loads its own model)')
+    parser.add_argument('--translate-workers', type=int, default=2,
+                      help='🌍 Concurrent translations in batch mode')
+    parser.add_argument('--format-workers', type=int, default=1,
+                      help='📝 Concurrent subtitle writers in batch mode')
+    parser.add_argument('--queue-size', type=int, default=2,
+                      help='📦 Maximum files waiting in front of each batch stage')
+    
+    # Incremental batch options
+    parser.add_argument('--incremental', action='store_true',
+                      help='⏭️ Skip videos whose subtitles are up to date according to the manifest')
+    parser.add_argument('--manifest', type=str,
+                      help='🗂️ Manifest file for --incremental (default: OUTPUT_DIR/.subtitle_manifest.json)')
+    
+    # Resumable batch options
+    parser.add_argument('--journal', type=str,
+                      help='📒 Job journal database (default: OUTPUT_DIR/.subtitle_journal.sqlite)')
+    parser.add_argument('--resume', action='store_true',
+                      help='🔁 Resume an interrupted batch, processing only files not yet done')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                      help='🔂 Attempts per file before it is reported as failed')
+    parser.add_argument('--retry-delay', type=float, default=5.0,
+                      help='⏳ Seconds before the first retry, doubled for each further attempt')
+    
+    # Service mode options
+    parser.add_argument('--serve', action='store_true',
+                      help='🛰️ Run as a long-lived service that keeps models loaded and accepts jobs over HTTP')
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                      help='🏠 Interface for the service to listen on')
+    parser.add_argument('--port', type=int, default=8765,
+                      help='🔌 TCP port for the service')
+    parser.add_argument('--socket', type=str,
+                      help='🧦 Listen on a Unix socket instead of TCP')
+    parser.add_argument('--service-workers', type=int, default=1,
+                      help='👷 Resident Whisper models, i.e. jobs processed at once')
+    
+    # Observability options
+    parser.add_argument('--metrics-json', type=str,
+                      help='📈 Write a JSON run report with per-file and per-stage metrics')
+    parser.add_argument('--metrics-prom', type=str,
+                      help='📉 Write metrics as a Prometheus textfile')
+    parser.add_argument('--quiet', action='store_true',
+                      help='🤫 Turn off per-chunk translation output')
+    
+    # Profiling options
+    parser.add_argument('--profile', type=str, metavar='DIR',
+                      help='🔬 Profile every stage with cProfile, writing per-file profiles and a hotspot summary to DIR')
+    parser.add_argument('--profile-top', type=int, default=30,
+                      help='🏆 Functions listed per section of the profile summary')
+    parser.add_argument('--profile-torch', action='store_true',
+                      help='🔥 Also run the torch profiler around Whisper decoding (with --profile)')
+    
+    # Scheduling options
+    parser.add_argument('--probe-workers', type=int, default=8,
+                      help='🔎 Concurrent ffprobe processes for the batch pre-pass')
+    parser.add_argument('--probe-cache', type=str,
+                      help='🗃️ Media probe cache (default: OUTPUT_DIR/.subtitle_probe_cache.json)')
+    
+    parser.add_argument('--vad', action='store_true',
+                      help='🔇 Skip silence and non-speech audio before running Whisper')
+    
+    # Stage-separated runs
+    parser.add_argument('--stages', type=str, default='all',
+                      choices=['all', 'transcribe', 'translate', 'format'],
+                      help=f'🧩 Run one stage only, exchanging {ARTIFACT_EXTENSION} artifacts (e.g. over a shared filesystem)')
+    
+    parser.add_argument('--stream-translation', action='store_true',
+                      help='🔀 Translate finished sentences while Whisper is still decoding the rest of the file')
+    parser.add_argument('--coalesce', action='store_true',
+                      help='🧺 Combine translations of short files with the same language pair into full-size requests (batch mode)')
+    parser.add_argument('--coalesce-wait', type=float, default=2.0,
+                      help='⌛ Longest a file waits for others to share a translation request, in seconds')
+    parser.add_argument('--memory-budget', type=float, metavar='GIB',
+                      help='🧮 Admit batch files only while their estimated memory (model size + media duration) fits this many GiB')
+    
+    # Multi-node options
+    parser.add_argument('--queue-dir', type=str, metavar='DIR',
+                      help='🤝 Shared work queue directory; every node pointed at it drains the same batch without duplicates')
+    parser.add_argument('--node-id', type=str,
+                      help='🏷️ Name of this node in the work queue (default: hostname-pid)')
+    parser.add_argument('--lease-ttl', type=float, default=120.0,
+                      help='⏲️ Seconds without a heartbeat before a claimed file is handed to another node')
+    
+    # Audio cache options
+    parser.add_argument('--audio-cache', type=str, metavar='DIR',
+                      help='💾 Cache decoded 16kHz audio in DIR so repeat runs skip extraction')
+    parser.add_argument('--audio-cache-size', type=float, default=10.0,
+                      help='📦 Disk quota for the audio cache in GiB (least recently used files are evicted)')
+    parser.add_argument('--audio-cache-dtype', choices=['float32', 'int16'], default='float32',
+                      help='🎚️ Sample format of cached audio (int16 halves the size but is not zero-copy)')
+    
     return parser.parse_args()
 
 def create_progress():
@@ -50,21 +174,56 @@ def create_progress():
         console=console
     )
 
-def process_single_video(input_path, output_path, args, transcriber, translator, formatter):
+def profile_stage(profiler, stage):
+    """Profile a block as one stage when --profile is active."""
+    return profiler.stage(stage) if profiler is not None else nullcontext()
+
+def process_single_video(input_path, output_path, args, transcriber, translator, formatter,
+                         metrics=None, profiler=None):
     """Process a single video file."""
+    timings = {}
+    file_scope = profiler.file(os.path.basename(input_path)) if profiler is not None else nullcontext()
     try:
-        with create_progress() as progress:
+        with file_scope, create_progress() as progress:
             # Transcription
             task1 = progress.add_task("🎙️ [cyan]Transcribing audio...", total=100)
-            transcription = transcriber.transcribe(input_path, progress, task1)
+            streaming = None
+            if args.stream_translation:
+                translator.configure_quality(
+                    quality_mode=args.translation_quality,
+                    chunk_size=args.chunk_size,
+                    context_aware=args.context_aware
+                )
+                streaming = StreamingTranslation(translator, args.language)
+            
+            started = time.perf_counter()
+            transcription = transcriber.transcribe(
+                input_path, progress, task1,
+                on_segments=streaming.feed if streaming is not None else None
+            )
+            timings['transcription'] = time.perf_counter() - started
             
-            console.print(f"\n📝 [cyan]Detected language: {transcription['language']}[/cyan]")
-            console.print(f"🎯 [cyan]Target language: {args.language}[/cyan]")
-            console.print(f"⚙️ [cyan]Translation quality: {args.translation_quality}[/cyan]")
+            if not transcription['segments']:
+                console.print("\n🔇 [yellow]No speech detected, writing empty subtitles[/yellow]")
+            else:
+                console.print(f"\n📝 [cyan]Detected language: {transcription['language']}[/cyan]")
+                console.print(f"🎯 [cyan]Target language: {args.language}[/cyan]")
+                console.print(f"⚙️ [cyan]Translation quality: {args.translation_quality}[/cyan]")
             
             # Translation (if needed)
             task2 = progress.add_task("🌍 [yellow]Translating...", total=100)
-            if transcription['language'] != args.language:
+            started = time.perf_counter()
+            if streaming is not None:
+                # Most batches were translated while decoding; wait for the rest
+                with profile_stage(profiler, 'translation'):
+                    translated_text, segments = streaming.finish()
+                progress.update(task2, advance=100)
+                if streaming.batches:
+                    console.print(f"\n🔀 [cyan]Translated {streaming.batches} batches alongside transcription[/cyan]")
+            elif not transcription['segments']:
+                progress.update(task2, advance=100)
+                segments = []
+            elif transcription['language'] != args.language:
                 console.print(f"\n🔄 [cyan]Translating from {transcription['language']} to {args.language}[/cyan]")
                 
                 # Configure translator based on quality settings
@@ -74,54 +233,476 @@ def process_single_video(input_path, output_path, args, transcriber, translator,
                     context_aware=args.context_aware
                 )
                 
-                translated_text = translator.translate(
-                    text=transcription['text'],
-                    source_lang=transcription['language'],
-                    target_lang=args.language,
-                    progress=progress,
-                    task_id=task2
-                )
-                
-                # Update segments with translated text
-                segments = transcription['segments']
-                if len(segments) > 0:
-                    # Split translated text into roughly equal parts based on original segment lengths
-                    total_chars = len(translated_text)
-                    total_orig_chars = len(transcription['text'])
-                    char_ratio = total_chars / total_orig_chars if total_orig_chars > 0 else 1
-                    
-                    start_idx = 0
-                    for segment in segments:
-                        orig_len = len(segment['text'])
-                        target_len = int(orig_len * char_ratio)
-                        # Find the nearest sentence end or space
-                        end_idx = min(start_idx + target_len, len(translated_text))
-                        while end_idx < len(translated_text) and translated_text[end_idx] not in '.!?。，':
-                            end_idx += 1
-                        segment['text'] = translated_text[start_idx:end_idx].strip()
-                        start_idx = end_idx
+                with profile_stage(profiler, 'translation'):
+                    translated_text, segments = translate_transcription(
+                        transcription,
+                        translator,
+                        args.language,
+                        progress=progress,
+                        task_id=task2
+                    )
             else:
                 console.print("\n✨ [green]No translation needed (same language)[/green]")
                 progress.update(task2, advance=100)
                 segments = transcription['segments']
+            timings['translation'] = time.perf_counter() - started
             
             # Formatting
             task3 = progress.add_task("📝 [green]Formatting subtitles...", total=100)
-            formatter.format_subtitles(
-                text=translated_text if 'translated_text' in locals() else transcription['text'],
-                segments=segments,
-                output_path=output_path,
-                format=args.format,
-                progress=progress,
-                task_id=task3
-            )
+            started = time.perf_counter()
+            with profile_stage(profiler, 'formatting'):
+                formatter.format_subtitles(
+                    text=translated_text if 'translated_text' in locals() else transcription['text'],
+                    segments=segments,
+                    output_path=output_path,
+                    format=args.format,
+                    progress=progress,
+                    task_id=task3
+                )
+            timings['formatting'] = time.perf_counter() - started
             
+        if metrics is not None:
+            metrics.record_file(input_path, 'done', timings, transcription.get('duration'),
+                                allocations=audio_allocations(transcription))
+            record_vad(metrics, transcription)
         console.print(f"✨ [green]Successfully generated subtitles: {output_path}")
         return True
     except Exception as e:
+        if metrics is not None:
+            metrics.record_file(input_path, 'failed', timings, error=str(e))
         console.print(f"❌ [red]Error processing {input_path}: {str(e)}")
         return False
 
+def retranslate_subtitles(args, translator, formatter):
+    """Refresh an existing translation after its source subtitles were corrected."""
+    try:
+        previous_source = formatter.parse_subtitles(args.previous_source)
+        current_source = formatter.parse_subtitles(args.input)
+        translation = formatter.parse_subtitles(args.translation)
+        
+        translator.configure_quality(
+            quality_mode=args.translation_quality,
+            chunk_size=args.chunk_size,
+            context_aware=args.context_aware
+        )
+        
+        retranslator = IncrementalRetranslator(translator)
+        segments, stats = retranslator.retranslate(
+            previous_source,
+            current_source,
+            translation,
+            source_lang=args.source_language,
+            target_lang=args.language
+        )
+        
+        formatter.format_subtitles(
+            text=' '.join(segment['text'] for segment in segments),
+            segments=segments,
+            output_path=args.output,
+            format=args.format
+        )
+        
+        console.print(f"♻️ [green]Reused {stats['reused']} cues, re-translated {stats['retranslated']} of {stats['total']}[/green]")
+        console.print(f"✨ [green]Successfully updated subtitles: {args.output}")
+        return True
+    except Exception as e:
+        console.print(f"❌ [red]Error re-translating {args.input}: {str(e)}")
+        return False
+
+def run_single_stage(args, transcriber, translator, formatter, metrics=None):
+    """Run one --stages stage on --input, reading or writing a segments artifact."""
+    timings = {}
+    started = time.perf_counter()
+    try:
+        if args.stages == 'transcribe':
+            transcription = transcriber.transcribe(args.input)
+            write_artifact(args.output, transcription, 'transcribe',
+                           source=os.path.basename(args.input), model=args.model)
+        else:
+            transcription = read_artifact(args.input)
+            console.print(f"📦 [cyan]Loaded {len(transcription['segments'])} segments "
+                          f"({transcription['language']}) from {args.input}[/cyan]")
+        
+        if args.stages == 'translate':
+            translator.configure_quality(
+                quality_mode=args.translation_quality,
+                chunk_size=args.chunk_size,
+                context_aware=args.context_aware
+            )
+            _, segments = translate_transcription(transcription, translator, args.language)
+            write_artifact(args.output, dict(transcription, segments=segments, language=args.language), 'translate',
+                           source=transcription['artifact'].get('source'), model=transcription['artifact'].get('model'))
+        elif args.stages == 'format':
+            if transcription['segments'] and transcription['language'] != args.language:
+                console.print(f"⚠️ [yellow]Artifact is in {transcription['language']}, not {args.language}; "
+                              f"run --stages translate first to translate it[/yellow]")
+            formatter.format_subtitles(
+                text=transcription['text'],
+                segments=transcription['segments'],
+                output_path=args.output,
+                format=args.format
+            )
+        stage_name = {'transcribe': 'transcription', 'translate': 'translation', 'format': 'formatting'}[args.stages]
+        timings[stage_name] = time.perf_counter() - started
+        
+        if metrics is not None:
+            metrics.record_file(args.input, 'done', timings, transcription.get('duration'),
+                                allocations=audio_allocations(transcription))
+            if args.stages == 'transcribe':
+                record_vad(metrics, transcription)
+        console.print(f"✨ [green]Stage {args.stages} finished: {args.output}")
+        return True
+    except Exception as e:
+        if metrics is not None:
+            metrics.record_file(args.input, 'failed', timings, error=str(e))
+        console.print(f"❌ [red]Error running stage {args.stages} on {args.input}: {str(e)}")
+        return False
+
+def record_vad(metrics, transcription):
+    """Count the audio VAD kept away from the model."""
+    skipped = (transcription.get('duration') or 0) - (transcription.get('speech_seconds') or 0)
+    if skipped > 0:
+        metrics.increment('vad_skipped_seconds_total', skipped)
+
+def audio_allocations(transcription):
+    """(arrays, bytes) allocated for a transcription's waveform, if it was measured."""
+    if transcription.get('audio_allocations') is None:
+        return None
+    return transcription['audio_allocations'], transcription['audio_allocated_bytes']
+
+def write_metrics(args, metrics):
+    """Write the run report to the requested destinations."""
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+        console.print(f"📈 [cyan]Metrics report written to {args.metrics_json}[/cyan]")
+    if args.metrics_prom:
+        metrics.write_prometheus(args.metrics_prom)
+        console.print(f"📉 [cyan]Prometheus metrics written to {args.metrics_prom}[/cyan]")
+
+def schedule_jobs(args, jobs, journal, metrics):
+    """Probe every input, drop unusable files and order the rest longest-first.
+    
+    Returns:
+        tuple: (scheduled jobs, BatchETA or None when durations are unknown)
+    """
+    if args.stages in ('translate', 'format'):
+        return schedule_artifacts(jobs, journal, metrics)
+    
+    ffprobe = get_ffprobe_path()
+    if not ffprobe or not jobs:
+        if jobs:
+            console.print("⚠️ [yellow]ffprobe not found, skipping the media pre-pass[/yellow]")
+        return jobs, None
+    
+    console.print(f"🔎 [cyan]Probing {len(jobs)} files...[/cyan]")
+    cache = ProbeCache(args.probe_cache or os.path.join(args.output_dir, '.subtitle_probe_cache.json'))
+    probes = probe_all([job.input_path for job in jobs], cache=cache, workers=args.probe_workers, ffprobe=ffprobe)
+    cache.save()
+    
+    scheduled = []
+    for job in jobs:
+        reason = unusable_reason(probes[job.input_path])
+        if reason:
+            journal.fail(job.rel_path, reason)
+            metrics.record_file(job.rel_path, 'failed', error=reason)
+            console.print(f"🚫 [red]Skipping {job.rel_path}: {reason}[/red]")
+        else:
+            job.duration = probes[job.input_path]['duration']
+            scheduled.append(job)
+    
+    # Longest processing time first, so a long file found last doesn't become the tail of the run
+    scheduled.sort(key=lambda job: job.duration, reverse=True)
+    total_audio = sum(job.duration for job in scheduled)
+    console.print(f"🗓️ [cyan]Scheduled {len(scheduled)} files, {format_duration(total_audio)} of audio[/cyan]")
+    return scheduled, BatchETA(total_audio)
+
+def schedule_artifacts(jobs, journal, metrics):
+    """Order artifact jobs longest-first using the durations in their headers."""
+    scheduled = []
+    for job in jobs:
+        try:
+            job.duration = read_artifact_header(job.input_path).get('duration') or 0.0
+        except (OSError, ValueError) as e:
+            journal.fail(job.rel_path, str(e))
+            metrics.record_file(job.rel_path, 'failed', error=str(e))
+            console.print(f"🚫 [red]Skipping {job.rel_path}: {str(e)}[/red]")
+            continue
+        scheduled.append(job)
+    
+    scheduled.sort(key=lambda job: job.duration, reverse=True)
+    total_audio = sum(job.duration for job in scheduled)
+    console.print(f"🗓️ [cyan]Scheduled {len(scheduled)} artifacts, {format_duration(total_audio)} of audio[/cyan]")
+    return scheduled, BatchETA(total_audio)
+
+def report_eta(eta, job):
+    """Account for a file leaving the batch for good and print the estimate."""
+    if eta is None:
+        return
+    eta.complete(job.duration)
+    remaining = eta.remaining_seconds()
+    if remaining is not None:
+        console.print(f"⏳ [dim]{eta.fraction * 100:.0f}% of audio done, ETA {format_duration(remaining)}[/dim]")
+
+def create_audio_cache(args):
+    """Open the decoded-audio cache, if one was requested."""
+    if not args.audio_cache:
+        return None
+    return AudioCache(args.audio_cache, max_bytes=int(args.audio_cache_size * 2**30), dtype=args.audio_cache_dtype)
+
+def run_batch(args, transcriber, translator, formatter, metrics, profiler=None, audio_cache=None):
+    """Process every video in --input_dir through the staged batch pipeline."""
+    console.print("📂 [bold]Starting batch processing...[/bold]\n")
+    
+    if args.stages in ('translate', 'format'):
+        extension = ARTIFACT_EXTENSION if args.stages == 'translate' else '.' + args.format
+        jobs = find_artifacts(args.input_dir, args.output_dir, extension)
+    elif args.stages == 'transcribe':
+        jobs = find_videos(args.input_dir, args.output_dir, ARTIFACT_EXTENSION.lstrip('.'))
+    else:
+        jobs = find_videos(args.input_dir, args.output_dir, args.format)
+    skipped_count = 0
+    
+    manifest = None
+    if args.incremental:
+        # Shared by every node of a --queue-dir batch; saves merge with the other nodes' entries
+        manifest = BatchManifest(
+            args.manifest or os.path.join(args.output_dir, '.subtitle_manifest.json'),
+            settings={
+                'model': args.model,
+                'language': args.language,
+                'format': args.format,
+                'translation_quality': args.translation_quality,
+                'chunk_size': args.chunk_size,
+                'context_aware': args.context_aware,
+                # Only part of the fingerprint for stage runs, so full-pipeline manifests stay valid
+                **({'stages': args.stages} if args.stages != 'all' else {})
+            }
+        )
+        pending = []
+        for job in jobs:
+            if manifest.is_current(job.rel_path, job.input_path, job.output_path):
+                metrics.increment('cache_hits_total', cache='manifest')
+                metrics.record_file(job.rel_path, 'skipped')
+            else:
+                metrics.increment('cache_misses_total', cache='manifest')
+                pending.append(job)
+        skipped_count = len(jobs) - len(pending)
+        jobs = pending
+        console.print(f"⏭️ [cyan]{skipped_count} files up to date, {len(jobs)} to process[/cyan]")
+    
+    work_queue = None
+    journal_name = '.subtitle_journal.sqlite'
+    if args.queue_dir:
+        work_queue = WorkQueue(args.queue_dir, node_id=args.node_id or default_node_id(), lease_ttl=args.lease_ttl)
+        # Each node keeps its own local journal; outcomes are shared through the queue
+        journal_name = f'.subtitle_journal.{work_queue.node_id}.sqlite'
+        console.print(f"🤝 [cyan]Joining work queue {args.queue_dir} as {work_queue.node_id}[/cyan]")
+    
+    journal = JobJournal(args.journal or os.path.join(args.output_dir, journal_name))
+    if args.resume:
+        pending = [job for job in jobs if journal.state(job.rel_path) != DONE]
+        console.print(f"🔁 [cyan]Resuming: {len(jobs) - len(pending)} files already done, {len(pending)} remaining[/cyan]")
+        jobs = pending
+    else:
+        journal.reset()
+    
+    for job in jobs:
+        journal.add(job.rel_path, job.input_path, job.output_path)
+    
+    total_files = len(jobs)
+    success_count = 0
+    jobs, eta = schedule_jobs(args, jobs, journal, metrics)
+    
+    # Configure translator once; the translation workers share it
+    translator.configure_quality(
+        quality_mode=args.translation_quality,
+        chunk_size=args.chunk_size,
+        context_aware=args.context_aware
+    )
+    
+    transcription_pool = None
+    if args.transcribe_workers > 1 and args.stages in ('all', 'transcribe'):
+        console.print(f"🤖 [cyan]Starting {args.transcribe_workers} Whisper worker processes...[/cyan]")
+        transcription_pool = TranscriptionPool(
+            args.model, args.gpu, args.transcribe_workers,
+            profile_dir=args.profile, torch_profile=args.profile_torch, vad=args.vad,
+            audio_cache=audio_cache
+        )
+    
+    memory_budget = None
+    if args.memory_budget and args.stages in ('all', 'transcribe'):
+        if transcription_pool is not None:
+            # Worker processes load their models on start, outside this process's RSS
+            rss = lambda: get_rss_bytes() + transcription_pool.rss_bytes()
+            resident_models = args.transcribe_workers
+        else:
+            rss, resident_models = get_rss_bytes, 0
+        memory_budget = MemoryBudget(int(args.memory_budget * 2**30), args.model, resident_models, rss)
+        if memory_budget.available <= 0:
+            console.print(f"⚠️ [yellow]--memory-budget {args.memory_budget:g} GiB doesn't cover the resident models; "
+                          f"files will run one at a time (try fewer --transcribe-workers or a smaller model)[/yellow]")
+        else:
+            console.print(f"🧮 [cyan]Memory budget {args.memory_budget:g} GiB, "
+                          f"{memory_budget.available / 2**30:.1f} GiB left for files after models[/cyan]")
+        memory_budget.start()
+    
+    def start_job(job):
+        if manifest is not None:
+            # Before processing, so edits made while the file runs invalidate the entry
+            job.input_state = manifest.snapshot(job.input_path)
+        if memory_budget is not None:
+            memory_budget.acquire(job)
+        journal.start(job.rel_path)
+    
+    batch_translator, translate_workers = translator, args.translate_workers
+    coalescer = None
+    if args.coalesce and args.stages in ('all', 'translate'):
+        coalescer = TranslationCoalescer(translator, max_wait=args.coalesce_wait, senders=args.translate_workers)
+        batch_translator = coalescer
+        # Translation workers now mostly wait for a shared request, so allow many files in flight
+        translate_workers = max(args.translate_workers, COALESCE_WORKERS)
+    
+    stages = create_batch_stages(
+        transcriber, batch_translator, formatter, args.language, args.format,
+        extract_workers=args.extract_workers,
+        transcribe_workers=args.transcribe_workers,
+        translate_workers=translate_workers,
+        format_workers=args.format_workers,
+        transcription_pool=transcription_pool,
+        profiler=profiler,
+        audio_cache=audio_cache,
+        only=None if args.stages == 'all' else args.stages,
+        artifact_metadata={'model': args.model} if args.stages == 'transcribe' else None,
+        memory_budget=memory_budget
+    )
+    engine = PipelineEngine(stages, queue_size=args.queue_size)
+    
+    done_elsewhere = []
+    if work_queue is not None:
+        def finished_elsewhere(job):
+            done_elsewhere.append(job)
+            report_eta(eta, job)
+        
+        # Claim files lazily as the pipeline has room, so other nodes get the rest;
+        # while waiting on other nodes' leases the feed serves this node's retries
+        jobs = work_queue.claim_jobs(jobs, on_skip=finished_elsewhere, yield_idle=True)
+    
+    feed = RetryingFeed(
+        jobs,
+        max_attempts=args.max_attempts,
+        retry_delay=args.retry_delay,
+        on_start=start_job
+    )
+    
+    try:
+        for job in engine.run(feed):
+            if memory_budget is not None:
+                # Jobs that failed before transcription still hold their reservation
+                memory_budget.release(job)
+            if job.error is None:
+                success_count += 1
+                journal.finish(job.rel_path, job.timings)
+                metrics.record_file(job.rel_path, 'done', job.timings, job.transcription.get('duration'), job.attempts,
+                                    allocations=audio_allocations(job.transcription))
+                if args.stages in ('all', 'transcribe'):
+                    record_vad(metrics, job.transcription)
+                console.print(f"✨ [green]Successfully generated {'subtitles' if args.stages in ('all', 'format') else 'artifact'}: {job.output_path}")
+                if manifest is not None:
+                    manifest.record(job.rel_path, job.input_path, job.input_state)
+                if work_queue is not None:
+                    work_queue.complete(job.rel_path, 'done', attempts=job.attempts, timings=job.timings)
+                feed.settle(job)
+                report_eta(eta, job)
+            else:
+                error, failed_stage, attempts = job.error, job.failed_stage, job.attempts
+                journal.fail(job.rel_path, error, job.timings)
+                if feed.settle(job):
+                    console.print(f"⚠️ [yellow]Attempt {attempts} failed for {job.rel_path} during {failed_stage}, retrying: {error}[/yellow]")
+                else:
+                    metrics.record_file(job.rel_path, 'failed', job.timings, attempts=attempts, error=error)
+                    if work_queue is not None:
+                        work_queue.complete(job.rel_path, 'failed', error, attempts, job.timings)
+                    console.print(f"❌ [red]Error processing {job.rel_path} during {failed_stage}: {error}")
+                    report_eta(eta, job)
+    finally:
+        if transcription_pool is not None:
+            transcription_pool.shutdown()
+        if manifest is not None:
+            manifest.close()
+        if work_queue is not None:
+            work_queue.close()
+        if memory_budget is not None:
+            memory_budget.stop()
+        if coalescer is not None:
+            coalescer.close()
+        journal.close()
+    
+    if work_queue is not None:
+        # Only the files this node claimed count towards its summary
+        total_files = work_queue.claimed
+    
+    # Final summary with emojis
+    console.print(f"\n📊 [bold]Batch processing summary:[/bold]")
+    console.print(f"✅ Successfully processed: {success_count} files")
+    if manifest is not None:
+        console.print(f"⏭️ Skipped (up to date): {skipped_count} files")
+    console.print(f"❌ Failed: {total_files - success_count} files")
+    if total_files:
+        console.print(f"📈 Success rate: {(success_count/total_files)*100:.1f}%")
+    console.print(f"📒 Job journal: {journal.path}")
+    if work_queue is not None:
+        console.print(f"🤝 Finished by other nodes: {len(done_elsewhere)} files, reclaimed from expired leases: {work_queue.reclaimed}")
+        console.print(f"🧾 Shared results journal: {work_queue.results_path}")
+    if coalescer is not None and coalescer.texts:
+        console.print(f"🧺 Coalesced {coalescer.texts} translations into {coalescer.requests} requests")
+    if memory_budget is not None:
+        console.print(f"🧮 Peak RSS: {memory_budget.peak_rss / 2**30:.2f} GiB of {args.memory_budget:g} GiB, "
+                      f"admission waits: {memory_budget.waits}, estimate correction: {memory_budget.scale:.2f}x")
+    
+    console.print(f"\n⏱️ [bold]Stage utilization ({engine.wall_seconds:.1f}s wall time):[/bold]")
+    for stats in engine.report():
+        console.print(
+            f"   {stats['stage']:<14} workers={stats['workers']:<3} jobs={stats['jobs']:<5} "
+            f"busy={stats['busy_seconds']:.1f}s utilization={stats['utilization'] * 100:.0f}%"
+        )
+    console.print()
+
+def serve(args):
+    """Keep models loaded and process jobs submitted over HTTP."""
+    console.print(f"🤖 [cyan]Loading {args.service_workers} resident Whisper model(s)...[/cyan]")
+    transcribers = [
+        WhisperTranscriber(model_name=args.model, use_gpu=args.gpu)
+        for _ in range(max(1, args.service_workers))
+    ]
+    audio_cache = create_audio_cache(args)
+    for transcriber in transcribers:
+        transcriber.vad = args.vad
+        transcriber.audio_cache = audio_cache
+    
+    console.print("🌐 [yellow]Initializing enhanced translator...[/yellow]")
+    translator = Translator()
+    translator.configure_quality(
+        quality_mode=args.translation_quality,
+        chunk_size=args.chunk_size,
+        context_aware=args.context_aware
+    )
+    translator.verbose = not args.quiet
+    
+    service = SubtitleService(transcribers, translator, SubtitleFormatter())
+    service.start()
+    server = create_server(service, host=args.host, port=args.port, socket_path=args.socket)
+    
+    address = args.socket or f"http://{args.host}:{args.port}"
+    console.print(f"🛰️ [bold green]Service listening on {address}[/bold green] (Ctrl+C to stop)\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n👋 [yellow]Shutting down service...[/yellow]")
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
 def main():
     console.print("\n🎬 [bold cyan]Interactive Video Subtitle Generator[/bold cyan] 🎥")
     console.print("✨ [italic]Enhanced with Multi-Engine Translation for Superior Accuracy[/italic] ✨\n")
@@ -129,15 +710,36 @@ def main():
     args = parse_arguments()
     logger = setup_logging()
     
+    if args.serve:
+        serve(args)
+        return
+    
     # Validate inputs and create output directory
     if not validate_input(args):
         return
     
     create_output_dir(args.output_dir if args.output_dir else os.path.dirname(args.output))
     
+    if args.retranslate:
+        # Subtitle-only mode: no Whisper model needed
+        console.print("🌐 [yellow]Initializing enhanced translator...[/yellow]")
+        translator = Translator()
+        formatter = SubtitleFormatter()
+        
+        console.print("♻️ [bold]Re-translating edited cues...[/bold]\n")
+        retranslate_subtitles(args, translator, formatter)
+        
+        console.print("✨ [bold green]All done! Thank you for using the Interactive Video Subtitle Generator![/bold green] 🎉\n")
+        return
+    
     # Initialize components with loading messages
-    console.print("🤖 [cyan]Loading Whisper model...[/cyan]")
-    transcriber = WhisperTranscriber(model_name=args.model, use_gpu=args.gpu)
+    transcriber = None
+    if args.stages not in ('all', 'transcribe'):
+        console.print(f"🧩 [cyan]Running the {args.stages} stage only, no Whisper model needed[/cyan]")
+    elif not (args.input_dir and args.transcribe_workers > 1):
+        # With several transcription workers every worker process loads its own model
+        console.print("🤖 [cyan]Loading Whisper model...[/cyan]")
+        transcriber = WhisperTranscriber(model_name=args.model, use_gpu=args.gpu)
     
     console.print("🌐 [yellow]Initializing enhanced translator...[/yellow]")
     translator = Translator()
@@ -145,39 +747,45 @@ def main():
     console.print("📝 [green]Setting up subtitle formatter...[/green]\n")
     formatter = SubtitleFormatter()
     
+    audio_cache = create_audio_cache(args)
+    if transcriber is not None:
+        transcriber.vad = args.vad
+        transcriber.audio_cache = audio_cache
+    
+    translator.verbose = not args.quiet
+    metrics = MetricsRecorder()
+    translator.metrics = metrics
+    
+    profiler = None
+    if args.profile:
+        profiler = StageProfiler(args.profile, top_n=args.profile_top, torch_profile=args.profile_torch)
+        if transcriber is not None:
+            transcriber.profiler = profiler
+    
     if args.input_dir:
-        # Batch processing
-        success_count = 0
-        total_files = 0
-        
-        console.print("📂 [bold]Starting batch processing...[/bold]\n")
-        
-        for root, _, files in os.walk(args.input_dir):
-            for file in files:
-                if file.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
-                    total_files += 1
-                    input_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(input_path, args.input_dir)
-                    output_path = os.path.join(
-                        args.output_dir,
-                        os.path.splitext(rel_path)[0] + '.' + args.format
-                    )
-                    
-                    console.print(f"\n🎥 [bold]Processing: {rel_path}")
-                    if process_single_video(input_path, output_path, args, 
-                                         transcriber, translator, formatter):
-                        success_count += 1
-        
-        # Final summary with emojis
-        console.print(f"\n📊 [bold]Batch processing summary:[/bold]")
-        console.print(f"✅ Successfully processed: {success_count} files")
-        console.print(f"❌ Failed: {total_files - success_count} files")
-        console.print(f"📈 Success rate: {(success_count/total_files)*100:.1f}%\n")
+        run_batch(args, transcriber, translator, formatter, metrics, profiler, audio_cache)
+    
+    elif args.stages != 'all':
+        run_single_stage(args, transcriber, translator, formatter, metrics)
     
     else:
         # Single file processing
         console.print("🎥 [bold]Processing single video...[/bold]\n")
-        process_single_video(args.input, args.output, args, transcriber, translator, formatter)
+        process_single_video(args.input, args.output, args, transcriber, translator, formatter, metrics, profiler)
+    
+    if audio_cache is not None:
+        metrics.increment('cache_hits_total', audio_cache.hits, cache='audio')
+        metrics.increment('cache_misses_total', audio_cache.misses, cache='audio')
+        console.print(f"💾 [cyan]Audio cache: {audio_cache.hits} hits, {audio_cache.misses} misses[/cyan]")
+    
+    write_metrics(args, metrics)
+    
+    if profiler is not None:
+        summary_path = profiler.summarize()
+        if summary_path:
+            console.print(f"🔬 [cyan]Profiles written to {args.profile}, hotspot summary: {summary_path}[/cyan]")
+        if profiler.skipped:
+            console.print(f"⚠️ [yellow]{profiler.skipped} concurrent stage runs could not be profiled[/yellow]")
     
     console.print("✨ [bold green]All done! Thank you for using the Interactive Video Subtitle Generator![/bold green] 🎉\n")
 
@@ -0,0 +1,101 @@
+import os
+import json
+import time
+
+ARTIFACT_FORMAT = 'subtitle-segments'
+ARTIFACT_VERSION = 1
+ARTIFACT_EXTENSION = '.segments.jsonl'
+
+# Stages that write an artifact, in pipeline order
+ARTIFACT_STAGES = ('transcribe', 'translate')
+
+def write_artifact(path, transcription, stage, **metadata):
+    """Write segments and their metadata as a versioned JSONL artifact.
+
+    The first line is a header with the format, version, producing stage,
+    language and audio durations; every following line is one segment with
+    only its id, start, end and text. The file is replaced atomically, so a
+    node reading from a shared filesystem never sees a partial artifact.
+
+    Args:
+        path (str): Artifact file, normally ending in ARTIFACT_EXTENSION
+        transcription (dict): 'segments', 'language' and optionally 'duration',
+            'speech_seconds' and 'source_language'
+        stage (str): Stage that produced the artifact, 'transcribe' or 'translate'
+        **metadata: Extra header fields, e.g. source file and model
+    """
+    if stage not in ARTIFACT_STAGES:
+        raise ValueError(f"Unknown artifact stage: {stage}")
+
+    segments = transcription['segments']
+    header = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'stage': stage,
+        'language': transcription['language'],
+        'source_language': transcription.get('source_language', transcription['language']),
+        'duration': transcription.get('duration'),
+        'speech_seconds': transcription.get('speech_seconds'),
+        'segments': len(segments),
+        'created_at': time.time()
+    }
+    header.update(metadata)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header, ensure_ascii=False) + '\n')
+        for index, segment in enumerate(segments):
+            f.write(json.dumps({
+                'id': segment.get('id', index),
+                'start': round(float(segment['start']), 3),
+                'end': round(float(segment['end']), 3),
+                'text': segment['text']
+            }, ensure_ascii=False) + '\n')
+    os.replace(temp_path, path)
+
+def read_artifact_header(path):
+    """Read and validate only the header line of an artifact."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return _check_header(path, f.readline())
+
+def _check_header(path, line):
+    try:
+        header = json.loads(line)
+    except ValueError:
+        raise ValueError(f"{path} is not a segments artifact")
+    if not isinstance(header, dict) or header.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a segments artifact")
+    if header.get('version', 0) > ARTIFACT_VERSION:
+        raise ValueError(f"{path} was written by a newer version (artifact version {header['version']})")
+    return header
+
+def read_artifact(path):
+    """Load an artifact as a transcription dictionary.
+
+    Args:
+        path (str): Artifact written by write_artifact
+
+    Returns:
+        dict: 'text', 'segments', 'language', 'duration', 'speech_seconds' and
+            'source_language', plus the raw header under 'artifact'
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        header = _check_header(path, f.readline())
+        segments = [json.loads(line) for line in f if line.strip()]
+
+    if len(segments) != header['segments']:
+        raise ValueError(f"{path} is truncated: expected {header['segments']} segments, found {len(segments)}")
+
+    return {
+        # Whisper's full text is the concatenation of its segments
+        'text': ''.join(segment['text'] for segment in segments),
+        'segments': segments,
+        'language': header['language'],
+        'source_language': header['source_language'],
+        'duration': header.get('duration'),
+        'speech_seconds': header.get('speech_seconds'),
+        'artifact': header
+    }
@@ -0,0 +1,144 @@
+import numpy as np
+
+from src.resample import pcm_to_float, resample_wav
+
+SAMPLE_RATE = 16000
+
+# Whisper's 30-second input window, in samples
+WINDOW_SAMPLES = 30 * SAMPLE_RATE
+
+# Samples converted at a time when filling a buffer from PCM
+CONVERT_BLOCK = 2**20
+
+class AudioBuffer:
+    def __init__(self, samples, owned=True):
+        """One contiguous 16kHz mono float32 waveform, handed out as views.
+
+        Language detection, VAD, windowing and decoding all work on slices of
+        the same array, so a file's audio is normally allocated once, when it
+        is decoded. Every array the buffer does allocate is recorded in
+        allocations, which makes copies per file visible in the run metrics.
+
+        Args:
+            samples (np.ndarray): 1-D C-contiguous float32 array or memmap
+            owned (bool): Whether the buffer may overwrite the samples, e.g.
+                to compact speech regions in place
+        """
+        if samples.dtype != np.float32 or samples.ndim != 1 or not samples.flags.c_contiguous:
+            raise ValueError("AudioBuffer needs a 1-D contiguous float32 array")
+        self._samples = samples
+        self.owned = owned
+        self.allocations = []  # (purpose, bytes) of every array allocated for this file
+        self._padding = None
+
+    def _allocate(self, length, purpose):
+        array = np.empty(length, dtype=np.float32)
+        self.allocations.append((purpose, array.nbytes))
+        return array
+
+    @classmethod
+    def from_array(cls, audio):
+        """Wrap an existing waveform, copying only if it is not contiguous float32.
+
+        The caller keeps the array, so the buffer never writes to it.
+        """
+        audio = np.asarray(audio)
+        if audio.dtype == np.float32 and audio.ndim == 1 and audio.flags.c_contiguous:
+            return cls(audio, owned=False)
+        buffer = cls(np.zeros(0, dtype=np.float32))
+        samples = buffer._allocate(audio.size, 'convert')
+        samples[...] = audio.reshape(-1)
+        buffer._samples = samples
+        return buffer
+
+    @classmethod
+    def from_pcm(cls, data, dtype=np.int16):
+        """Convert 16kHz mono PCM to float32 block by block into a single allocation.
+
+        Args:
+            data (bytes or np.ndarray): Raw samples, e.g. AudioSegment.raw_data
+                or a memory-mapped int16 cache file
+            dtype (np.dtype): Sample type of raw bytes
+        """
+        pcm = np.frombuffer(data, dtype=dtype) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        buffer = cls(np.zeros(0, dtype=np.float32))
+        samples = buffer._allocate(len(pcm), 'decode')
+        for start in range(0, len(pcm), CONVERT_BLOCK):
+            pcm_to_float(pcm[start:start + CONVERT_BLOCK], out=samples[start:start + CONVERT_BLOCK])
+        buffer._samples = samples
+        return buffer
+
+    @classmethod
+    def decoded(cls, samples):
+        """Take ownership of a freshly decoded waveform, recording it as the decode allocation."""
+        samples = np.ascontiguousarray(samples, dtype=np.float32).reshape(-1)
+        buffer = cls(samples)
+        buffer.allocations.append(('decode', samples.nbytes))
+        return buffer
+
+    @classmethod
+    def from_wav(cls, path):
+        """Read a PCM WAV file, resampled to 16kHz mono as it streams in."""
+        return cls.decoded(resample_wav(path, target_rate=SAMPLE_RATE))
+
+    @property
+    def samples(self):
+        """The whole waveform (no copy)."""
+        return self._samples
+
+    @property
+    def duration(self):
+        """Length in seconds."""
+        return len(self._samples) / SAMPLE_RATE
+
+    @property
+    def allocated_bytes(self):
+        return sum(nbytes for _, nbytes in self.allocations)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def view(self, start=0, end=None):
+        """Samples start:end, as a view."""
+        return self._samples[start:end]
+
+    def window(self, start=0, length=WINDOW_SAMPLES):
+        """A fixed-length window, zero-padded past the end of the audio.
+
+        A view when the audio is long enough; otherwise the tail is copied
+        into one padding array that the buffer allocates once and reuses.
+        """
+        if start + length <= len(self._samples):
+            return self._samples[start:start + length]
+        if self._padding is None or len(self._padding) != length:
+            self._padding = self._allocate(length, 'padding')
+        tail = self._samples[start:]
+        self._padding[:len(tail)] = tail
+        self._padding[len(tail):] = 0
+        return self._padding
+
+    def compact(self, regions):
+        """Keep only the given regions, moved to the front in order.
+
+        Owned buffers are compacted in place, overwriting the original
+        samples; borrowed arrays are copied into one new allocation.
+
+        Args:
+            regions (list): Sorted, non-overlapping (start, end) sample ranges
+
+        Returns:
+            AudioBuffer: This buffer, now holding only the regions
+        """
+        total = sum(end - start for start, end in regions)
+        target = self._samples if self.owned else self._allocate(total, 'vad')
+        position = 0
+        for start, end in regions:
+            # Regions only ever move towards the front, so block-wise copies
+            # never overwrite samples that are still to be moved
+            for block in range(start, end, CONVERT_BLOCK):
+                block_end = min(block + CONVERT_BLOCK, end)
+                target[position:position + block_end - block] = self._samples[block:block_end]
+                position += block_end - block
+        self._samples = target[:total]
+        self.owned = True
+        return self
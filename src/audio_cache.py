@@ -0,0 +1,159 @@
+import os
+import hashlib
+import threading
+import numpy as np
+
+from src.resample import pcm_to_float
+
+# File suffix for each supported sample format
+SUFFIXES = {'float32': '.f32', 'int16': '.s16'}
+
+# Samples converted at a time between int16 and float32
+BLOCK_SAMPLES = 2**20
+
+def is_cached_audio(path):
+    """Whether a path points at a decoded-audio cache file rather than a WAV."""
+    return bool(path) and os.path.splitext(path)[1] in SUFFIXES.values()
+
+def open_cached_audio(path):
+    """Memory-map a cache file as a 16kHz mono float32 waveform.
+
+    float32 files are mapped copy-on-write, so pages are read from disk on
+    demand and never written back. int16 files are converted block by block
+    into one float32 array.
+
+    Args:
+        path (str): Cache file written by AudioCache.store
+
+    Returns:
+        np.ndarray: Audio samples in the range [-1, 1]
+    """
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    if path.endswith(SUFFIXES['int16']):
+        pcm = np.memmap(path, dtype=np.int16, mode='r')
+        audio = np.empty(len(pcm), dtype=np.float32)
+        for start in range(0, len(pcm), BLOCK_SAMPLES):
+            pcm_to_float(pcm[start:start + BLOCK_SAMPLES], out=audio[start:start + BLOCK_SAMPLES])
+        return audio
+    return np.memmap(path, dtype=np.float32, mode='c')
+
+class AudioCache:
+    def __init__(self, directory, max_bytes=10 * 2**30, dtype='float32'):
+        """Cache decoded 16kHz mono audio as raw PCM files, keyed by input file.
+
+        Entries are identified by absolute path, size and mtime, so an edited
+        file is decoded again. Hits refresh the entry's mtime and the least
+        recently used entries are evicted once the directory exceeds max_bytes.
+        Several processes can share one directory.
+
+        Args:
+            directory (str): Cache directory
+            max_bytes (int): Disk quota for cached audio
+            dtype (str): Sample format on disk, 'float32' or 'int16' (half the size)
+        """
+        if dtype not in SUFFIXES:
+            raise ValueError(f"Unsupported audio cache dtype: {dtype}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self):
+        # Sent to transcription worker processes, which can't share the lock
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _path(self, media_path):
+        stat = os.stat(media_path)
+        identity = f"{os.path.abspath(media_path)}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        digest = hashlib.blake2b(identity.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.directory, digest + SUFFIXES[self.dtype])
+
+    def lookup(self, media_path):
+        """Path of the cached audio for a media file, or None on a miss."""
+        path = self._path(media_path)
+        try:
+            # Refresh the entry for LRU eviction
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def store(self, media_path, audio):
+        """Write a decoded waveform for a media file and enforce the quota.
+
+        Args:
+            media_path (str): Source media file
+            audio (np.ndarray): 16kHz mono float32 waveform
+
+        Returns:
+            str: Path of the cache file
+        """
+        path = self._path(media_path)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            if self.dtype == 'int16':
+                # Convert in blocks so no full-length temporaries are made
+                for start in range(0, len(audio), BLOCK_SAMPLES):
+                    block = np.clip(audio[start:start + BLOCK_SAMPLES], -1.0, 1.0) * 32767
+                    block.astype(np.int16).tofile(f)
+            else:
+                np.asarray(audio, dtype=np.float32).tofile(f)
+        os.replace(temp_path, path)
+
+        self.evict(keep=path)
+        return path
+
+    def entries(self):
+        """(mtime, size, path) of every cache file, oldest first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not is_cached_audio(path):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits its quota.
+
+        Args:
+            keep (str, optional): Entry that must survive, e.g. one just written
+
+        Returns:
+            int: Bytes freed
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                # Open memory maps stay valid on POSIX after the file is removed
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            freed += size
+        return freed
@@ -0,0 +1,491 @@
+import os
+import heapq
+import queue
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from rich.console import Console
+from src.transcriber import WhisperTranscriber, configure_ffmpeg, extract_audio
+from src.audio_cache import is_cached_audio
+from src.artifacts import ARTIFACT_EXTENSION, read_artifact, write_artifact
+from src.pipeline import translate_transcription
+from src.profiling import StageProfiler
+from src.utils import get_rss_bytes
+
+console = Console()
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+# Queue marker telling a stage worker that no more jobs will arrive
+_STOP = object()
+
+class BatchJob:
+    def __init__(self, input_path, output_path, rel_path):
+        """A single video travelling through the batch pipeline.
+
+        Args:
+            input_path (str): Path to the video file
+            output_path (str): Path of the subtitle file to write
+            rel_path (str): Path relative to the input directory, used for display
+        """
+        self.input_path = input_path
+        self.output_path = output_path
+        self.rel_path = rel_path
+        self.audio_path = None
+        self.transcription = None
+        self.text = None
+        self.segments = None
+        self.error = None
+        self.failed_stage = None
+        self.timings = {}
+        self.attempts = 0
+        self.duration = None  # Audio seconds, when probed
+        self.input_state = None  # Manifest snapshot of the input, taken as the job starts
+
+    def reset(self):
+        """Clear the results of a failed attempt before retrying."""
+        self.audio_path = None
+        self.transcription = None
+        self.text = None
+        self.segments = None
+        self.error = None
+        self.failed_stage = None
+        self.timings = {}
+
+class Stage:
+    def __init__(self, name, func, workers=1):
+        """A pipeline stage with its own worker pool.
+
+        Args:
+            name (str): Stage name used in reports
+            func (callable): Called with a BatchJob; raises on failure
+            workers (int): Number of concurrent workers for this stage
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.jobs = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        """Account for one processed job."""
+        with self._lock:
+            self.jobs += 1
+            self.busy_seconds += seconds
+
+    def utilization(self, wall_seconds):
+        """Fraction of the available worker time this stage spent busy."""
+        if wall_seconds <= 0:
+            return 0.0
+        return self.busy_seconds / (wall_seconds * self.workers)
+
+class RetryingFeed:
+    def __init__(self, jobs, max_attempts=3, retry_delay=5.0, on_start=None):
+        """Job source for PipelineEngine that can take failed jobs back for another attempt.
+
+        Iteration yields the initial jobs, then keeps waiting for retries until
+        every job has been completed or has used up its attempts. The initial
+        jobs are pulled lazily, so they can come from a generator that claims
+        work as the pipeline has room for it; a None from that generator means
+        it is idle, and retries that are due are served before pulling again.
+
+        Args:
+            jobs (iterable): Initial BatchJob objects, possibly interleaved with None
+            max_attempts (int): Attempts per job before it is reported as failed
+            retry_delay (float): Base delay in seconds, doubled for every further attempt
+            on_start (callable, optional): Called with each job as it enters the pipeline
+        """
+        self._jobs = jobs
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.on_start = on_start
+        self._outstanding = 0
+        self._retries = []
+        self._counter = 0
+        self._condition = threading.Condition()
+
+    def _start(self, job):
+        job.attempts += 1
+        if self.on_start is not None:
+            self.on_start(job)
+        return job
+
+    def _due_retry(self):
+        """Pop a retry whose delay has passed, or return None. Called with the condition held."""
+        if self._retries and self._retries[0][0] <= time.monotonic():
+            return heapq.heappop(self._retries)[2]
+        return None
+
+    def __iter__(self):
+        for job in self._jobs:
+            if job is None:
+                while True:
+                    with self._condition:
+                        retry = self._due_retry()
+                    if retry is None:
+                        break
+                    yield self._start(retry)
+                continue
+            with self._condition:
+                self._outstanding += 1
+            yield self._start(job)
+
+        while True:
+            with self._condition:
+                while True:
+                    job = self._due_retry()
+                    if job is not None:
+                        break
+                    if self._outstanding == 0:
+                        return
+                    timeout = self._retries[0][0] - time.monotonic() if self._retries else None
+                    self._condition.wait(timeout)
+            yield self._start(job)
+
+    def settle(self, job):
+        """Decide what happens to a job leaving the pipeline.
+
+        Args:
+            job (BatchJob): Finished job
+
+        Returns:
+            bool: True if the job was queued for another attempt, False if its outcome is final
+        """
+        with self._condition:
+            if job.error is not None and job.attempts < self.max_attempts:
+                delay = self.retry_delay * (2 ** (job.attempts - 1))
+                job.reset()
+                self._counter += 1
+                heapq.heappush(self._retries, (time.monotonic() + delay, self._counter, job))
+                self._condition.notify_all()
+                return True
+
+            self._outstanding -= 1
+            self._condition.notify_all()
+            return False
+
+class PipelineEngine:
+    def __init__(self, stages, queue_size=2):
+        """Run jobs through a chain of stages connected by bounded queues.
+
+        Every stage has its own workers, so a slow stage never stops the
+        others from working on different files. The bounded queues apply
+        backpressure: an upstream stage blocks once its downstream queue is full.
+
+        Args:
+            stages (list): Ordered list of Stage objects
+            queue_size (int): Maximum number of jobs waiting in front of each stage
+        """
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.wall_seconds = 0.0
+
+    def _feed(self, jobs, inbox):
+        """Push jobs into the first stage, blocking while it is saturated."""
+        for job in jobs:
+            inbox.put(job)
+        for _ in range(self.stages[0].workers):
+            inbox.put(_STOP)
+
+    def _work(self, index, inbox, outbox, remaining):
+        """Worker loop for one stage."""
+        stage = self.stages[index]
+        downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+
+        while True:
+            job = inbox.get()
+            if job is _STOP:
+                with stage._lock:
+                    remaining[index] -= 1
+                    last = remaining[index] == 0
+                # The last worker to finish closes the next stage
+                if last:
+                    for _ in range(downstream):
+                        outbox.put(_STOP)
+                return
+
+            # Failed jobs skip the remaining stages but still reach the caller
+            if job.error is None:
+                started = time.perf_counter()
+                try:
+                    stage.func(job)
+                except Exception as e:
+                    job.error = str(e)
+                    job.failed_stage = stage.name
+                elapsed = time.perf_counter() - started
+                job.timings[stage.name] = elapsed
+                stage.record(elapsed)
+
+            outbox.put(job)
+
+    def run(self, jobs):
+        """Process jobs and yield each one as soon as it leaves the last stage.
+
+        Args:
+            jobs (iterable): BatchJob objects, consumed lazily
+
+        Yields:
+            BatchJob: Finished jobs, with error set if a stage failed
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        # The caller drains the final queue, so it doesn't need a bound
+        queues.append(queue.Queue())
+        remaining = [stage.workers for stage in self.stages]
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=self._feed, args=(jobs, queues[0]), daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(index, queues[index], queues[index + 1], remaining),
+                    daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                job = queues[-1].get()
+                if job is _STOP:
+                    break
+                yield job
+        finally:
+            self.wall_seconds = time.perf_counter() - started
+
+    def report(self):
+        """Per-stage statistics for the last run.
+
+        Returns:
+            list: One dict per stage with workers, jobs, busy seconds and utilization
+        """
+        return [
+            {
+                'stage': stage.name,
+                'workers': stage.workers,
+                'jobs': stage.jobs,
+                'busy_seconds': stage.busy_seconds,
+                'utilization': stage.utilization(self.wall_seconds)
+            }
+            for stage in self.stages
+        ]
+
+# Per-process transcriber used by TranscriptionPool workers
+_worker_transcriber = None
+
+def _init_transcription_worker(model_name, use_gpu, profile_dir=None, torch_profile=False, vad=False,
+                               audio_cache=None):
+    """Load the Whisper model once per worker process."""
+    global _worker_transcriber
+    _worker_transcriber = WhisperTranscriber(model_name=model_name, use_gpu=use_gpu)
+    _worker_transcriber.vad = vad
+    _worker_transcriber.audio_cache = audio_cache
+    if profile_dir:
+        _worker_transcriber.profiler = StageProfiler(profile_dir, torch_profile=torch_profile)
+
+def _transcribe_in_worker(audio_path, file_key=None, media_path=None):
+    """Transcribe an extracted WAV file (or cached audio) inside a worker process."""
+    profiler = _worker_transcriber.profiler
+    if profiler is None:
+        buffer = _worker_transcriber.load_buffer(audio_path, media_path)
+        return _worker_transcriber.transcribe_audio(buffer)
+
+    with profiler.file(file_key):
+        with profiler.stage('load_audio'):
+            buffer = _worker_transcriber.load_buffer(audio_path, media_path)
+        return _worker_transcriber.transcribe_audio(buffer)
+
+class TranscriptionPool:
+    def __init__(self, model_name='base', use_gpu=False, processes=2, profile_dir=None, torch_profile=False,
+                 vad=False, audio_cache=None):
+        """Run Whisper in separate processes so transcriptions use several cores.
+
+        Args:
+            model_name (str): Name of the Whisper model to load in each process
+            use_gpu (bool): Whether to use GPU acceleration
+            processes (int): Number of worker processes, each holding its own model
+            profile_dir (str, optional): Write per-file stage profiles here
+            torch_profile (bool): Also run the torch profiler around decoding
+            vad (bool): Skip non-speech audio before inference
+            audio_cache (AudioCache, optional): Store decoded audio for later runs
+        """
+        # Spawn rather than fork: forking a process that already imported torch is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_transcription_worker,
+            initargs=(model_name, use_gpu, profile_dir, torch_profile, vad, audio_cache)
+        )
+
+    def transcribe(self, audio_path, file_key=None, media_path=None):
+        """Transcribe a WAV file (or cached audio) in one of the worker processes."""
+        return self._executor.submit(_transcribe_in_worker, audio_path, file_key, media_path).result()
+
+    def rss_bytes(self):
+        """Combined resident memory of the worker processes."""
+        return sum(get_rss_bytes(pid) for pid in list(self._executor._processes or {}))
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=True)
+
+def _profiled(profiler, name, func):
+    """Wrap a stage function so each call is profiled under the job's file."""
+    if profiler is None:
+        return func
+
+    def profiled(job):
+        with profiler.file(job.rel_path), profiler.stage(name):
+            func(job)
+    return profiled
+
+def find_videos(input_dir, output_dir, format='srt'):
+    """Walk an input directory and create a job for every video file.
+
+    Args:
+        input_dir (str): Directory to search recursively
+        output_dir (str): Directory mirroring input_dir for the subtitle files
+        format (str): Subtitle format, used as the output extension
+
+    Returns:
+        list: BatchJob objects in os.walk order
+    """
+    jobs = []
+    for root, _, files in os.walk(input_dir):
+        for file in files:
+            if file.lower().endswith(VIDEO_EXTENSIONS):
+                input_path = os.path.join(root, file)
+                rel_path = os.path.relpath(input_path, input_dir)
+                output_path = os.path.join(output_dir, os.path.splitext(rel_path)[0] + '.' + format)
+                jobs.append(BatchJob(input_path, output_path, rel_path))
+    return jobs
+
+def find_artifacts(input_dir, output_dir, extension):
+    """Walk a directory of segment artifacts and create a job for each.
+
+    Args:
+        input_dir (str): Directory searched recursively for ARTIFACT_EXTENSION files
+        output_dir (str): Directory mirroring input_dir for the outputs
+        extension (str): Output extension, e.g. '.srt' or ARTIFACT_EXTENSION
+
+    Returns:
+        list: BatchJob objects in os.walk order
+    """
+    jobs = []
+    for root, _, files in os.walk(input_dir):
+        for file in files:
+            if file.endswith(ARTIFACT_EXTENSION):
+                input_path = os.path.join(root, file)
+                rel_path = os.path.relpath(input_path, input_dir)
+                output_path = os.path.join(output_dir, rel_path[:-len(ARTIFACT_EXTENSION)] + extension)
+                jobs.append(BatchJob(input_path, output_path, rel_path))
+    return jobs
+
+def create_batch_stages(transcriber, translator, formatter, target_lang, format='srt',
+                        extract_workers=1, transcribe_workers=1, translate_workers=2,
+                        format_workers=1, transcription_pool=None, profiler=None, audio_cache=None,
+                        only=None, artifact_metadata=None, memory_budget=None):
+    """Build the extraction → transcription → translation → formatting stages.
+
+    With only set, just that part of the pipeline runs and the jobs exchange
+    segment artifacts instead: 'transcribe' writes one per video, 'translate'
+    reads and writes them, and 'format' turns them into subtitle files.
+
+    Args:
+        transcriber (WhisperTranscriber): In-process transcriber, used when no pool is given
+        translator (Translator): Configured translator, shared by the translation workers
+        formatter (SubtitleFormatter): Subtitle formatter
+        target_lang (str): Target language code
+        format (str): Output subtitle format ('srt' or 'vtt')
+        extract_workers (int): Concurrent audio extractions
+        transcribe_workers (int): Concurrent transcriptions
+        translate_workers (int): Concurrent translations
+        format_workers (int): Concurrent subtitle writers
+        transcription_pool (TranscriptionPool, optional): Worker processes running Whisper
+        profiler (StageProfiler, optional): Profile every stage of every file
+        audio_cache (AudioCache, optional): Reuse decoded audio instead of extracting it
+        only (str, optional): 'transcribe', 'translate' or 'format' to run a single stage
+        artifact_metadata (dict, optional): Extra header fields for written artifacts
+        memory_budget (MemoryBudget, optional): Released for each job once its audio is freed
+
+    Returns:
+        list: Stage objects for PipelineEngine
+    """
+    configure_ffmpeg()
+
+    def extract(job):
+        if audio_cache is not None:
+            job.audio_path = audio_cache.lookup(job.input_path)
+            if job.audio_path:
+                return
+        job.audio_path = extract_audio(job.input_path)
+
+    def transcribe(job):
+        try:
+            if transcription_pool is not None:
+                job.transcription = transcription_pool.transcribe(job.audio_path, job.rel_path, job.input_path)
+            elif profiler is not None:
+                # The transcriber profiles its own language detection and decoding steps
+                with profiler.file(job.rel_path):
+                    with profiler.stage('load_audio'):
+                        buffer = transcriber.load_buffer(job.audio_path, job.input_path)
+                    job.transcription = transcriber.transcribe_audio(buffer)
+            else:
+                buffer = transcriber.load_buffer(job.audio_path, job.input_path)
+                job.transcription = transcriber.transcribe_audio(buffer)
+        finally:
+            # Cached audio stays for later runs; temporary WAVs go
+            if not is_cached_audio(job.audio_path) and os.path.exists(job.audio_path):
+                os.unlink(job.audio_path)
+            job.audio_path = None
+            if memory_budget is not None:
+                memory_budget.release(job)
+
+    def translate(job):
+        job.text, job.segments = translate_transcription(job.transcription, translator, target_lang)
+
+    def write(job):
+        formatter.format_subtitles(
+            text=job.text,
+            segments=job.segments,
+            output_path=job.output_path,
+            format=format
+        )
+
+    def load(job):
+        job.transcription = read_artifact(job.input_path)
+        job.text, job.segments = job.transcription['text'], job.transcription['segments']
+
+    def save_transcription(job):
+        write_artifact(job.output_path, job.transcription, 'transcribe',
+                       source=job.rel_path, **(artifact_metadata or {}))
+
+    def save_translation(job):
+        translated = dict(
+            job.transcription,
+            segments=job.segments,
+            language=target_lang,
+            source_language=job.transcription.get('source_language', job.transcription['language'])
+        )
+        # Carry provenance over from the transcription artifact
+        header = job.transcription.get('artifact', {})
+        metadata = {key: header[key] for key in ('source', 'model') if key in header}
+        metadata.update(artifact_metadata or {})
+        write_artifact(job.output_path, translated, 'translate', **metadata)
+
+    extraction = Stage('extraction', _profiled(profiler, 'extraction', extract), extract_workers)
+    transcription = Stage('transcription', transcribe, transcribe_workers)
+    translation = Stage('translation', _profiled(profiler, 'translation', translate), translate_workers)
+    formatting = Stage('formatting', _profiled(profiler, 'formatting', write), format_workers)
+    loading = Stage('loading', load, extract_workers)
+
+    if only == 'transcribe':
+        return [extraction, transcription, Stage('artifact', save_transcription, format_workers)]
+    if only == 'translate':
+        return [loading, translation, Stage('artifact', save_translation, format_workers)]
+    if only == 'format':
+        return [loading, formatting]
+    return [extraction, transcription, translation, formatting]
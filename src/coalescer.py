@@ -0,0 +1,120 @@
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+class _Pending:
+    def __init__(self, text):
+        self.text = text
+        self.future = Future()
+        self.queued_at = time.monotonic()
+
+class TranslationCoalescer:
+    def __init__(self, translator, max_chars=None, max_wait=2.0, senders=2):
+        """Combine short translations from many files into full-size requests.
+
+        Drop-in replacement for Translator.translate in batch mode: callers
+        block as usual, but their texts are queued per language pair and sent
+        together through Translator.translate_lines, which keeps a one-to-one
+        mapping so every caller gets its own translation back. A pair is sent
+        once its texts fill a request or the oldest has waited max_wait
+        seconds. Texts too long to share a request are translated directly, as
+        is each text of a combined request that fails.
+
+        Args:
+            translator (Translator): Configured translator doing the requests
+            max_chars (int, optional): Characters per combined request, defaults
+                to the translator's chunk size
+            max_wait (float): Longest a text waits for company before it is sent
+            senders (int): Combined requests in flight at once
+        """
+        self.translator = translator
+        self.max_chars = max_chars or translator.chunk_size
+        self.max_wait = max_wait
+        self.texts = 0
+        self.requests = 0
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max(1, senders))
+        self._thread = threading.Thread(target=self._dispatch, daemon=True)
+        self._thread.start()
+
+    def translate(self, text, source_lang='auto', target_lang='en', progress=None, task_id=None):
+        """Translate text, possibly sharing a request with other callers."""
+        if source_lang == target_lang or not text.strip():
+            return text
+        if len(text) > self.max_chars:
+            return self.translator.translate(text, source_lang=source_lang, target_lang=target_lang,
+                                             progress=progress, task_id=task_id)
+
+        pending = _Pending(text)
+        with self._condition:
+            if self._closed:
+                raise Exception("Translation coalescer is closed")
+            self._pending.setdefault((source_lang, target_lang), []).append(pending)
+            self.texts += 1
+            self._condition.notify_all()
+        return pending.future.result()
+
+    def _take_ready(self, flush_all=False):
+        """Pop the batches due to be sent. Called with the condition held."""
+        now = time.monotonic()
+        ready = []
+        for pair, items in list(self._pending.items()):
+            while items:
+                size = sum(len(item.text) + 1 for item in items)
+                if not (flush_all or size >= self.max_chars or now - items[0].queued_at >= self.max_wait):
+                    break
+                batch, total = [], 0
+                while items and (not batch or total + len(items[0].text) + 1 <= self.max_chars):
+                    total += len(items[0].text) + 1
+                    batch.append(items.pop(0))
+                ready.append((pair, batch))
+            if not items:
+                del self._pending[pair]
+        return ready
+
+    def _next_deadline(self):
+        oldest = min((items[0].queued_at for items in self._pending.values()), default=None)
+        return None if oldest is None else max(0.0, oldest + self.max_wait - time.monotonic())
+
+    def _dispatch(self):
+        while True:
+            with self._condition:
+                ready = self._take_ready(flush_all=self._closed)
+                while not ready and not self._closed:
+                    self._condition.wait(self._next_deadline())
+                    ready = self._take_ready()
+                if not ready and self._closed:
+                    return
+            for pair, batch in ready:
+                self.requests += 1
+                self._executor.submit(self._send, pair, batch)
+
+    def _send(self, pair, batch):
+        source_lang, target_lang = pair
+        try:
+            results = self.translator.translate_lines([item.text for item in batch], source_lang, target_lang)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            # One bad text shouldn't fail every file it was combined with,
+            # so fall back to a request per text and fail only those that fail again
+            for item in batch:
+                try:
+                    item.future.set_result(self.translator.translate(
+                        item.text, source_lang=source_lang, target_lang=target_lang))
+                except Exception as text_error:
+                    item.future.set_exception(text_error)
+            return
+        for item, result in zip(batch, results):
+            item.future.set_result(result)
+
+    def close(self):
+        """Send everything still queued and wait for the responses."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
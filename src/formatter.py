@@ -1,6 +1,12 @@
 import os
+import re
 from datetime import timedelta
 
+# Matches cue timing lines in both SRT (00:00:01,000) and WebVTT (00:01.000) files
+TIMING_PATTERN = re.compile(
+    r'((?:\d+:)?\d{1,2}:\d{2}[,.]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[,.]\d{1,3})'
+)
+
 class SubtitleFormatter:
     def __init__(self):
         """Initialize the subtitle formatter."""
@@ -27,6 +33,61 @@ class SubtitleFormatter:
         else:  # srt
             return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
     
+    def _parse_timestamp(self, timestamp):
+        """Convert an SRT or WebVTT timestamp to seconds.
+
+        Args:
+            timestamp (str): Timestamp such as '00:01:02,500' or '01:02.500'
+
+        Returns:
+            float: Time in seconds
+        """
+        parts = timestamp.replace(',', '.').split(':')
+        seconds = float(parts[-1])
+        minutes = int(parts[-2]) if len(parts) > 1 else 0
+        hours = int(parts[-3]) if len(parts) > 2 else 0
+        return hours * 3600 + minutes * 60 + seconds
+
+    def parse_subtitle_content(self, content):
+        """Parse SRT or WebVTT content into segments.
+
+        Args:
+            content (str): Subtitle file content
+
+        Returns:
+            list: Segment dictionaries with 'start', 'end' and 'text' keys
+        """
+        segments = []
+        # Cues are separated by blank lines in both formats
+        blocks = re.split(r'\n\s*\n', content.replace('\r\n', '\n').lstrip('\ufeff'))
+        for block in blocks:
+            lines = block.strip().split('\n')
+            for i, line in enumerate(lines):
+                match = TIMING_PATTERN.search(line)
+                if match:
+                    segments.append({
+                        'start': self._parse_timestamp(match.group(1)),
+                        'end': self._parse_timestamp(match.group(2)),
+                        'text': '\n'.join(lines[i + 1:]).strip()
+                    })
+                    break
+        return segments
+
+    def parse_subtitles(self, input_path):
+        """Read an existing SRT or WebVTT file.
+
+        Args:
+            input_path (str): Path to the subtitle file
+
+        Returns:
+            list: Segment dictionaries with 'start', 'end' and 'text' keys
+        """
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                return self.parse_subtitle_content(f.read())
+        except Exception as e:
+            raise Exception(f"Subtitle parsing failed: {str(e)}")
+
     def _format_srt(self, segments):
         """Format subtitles in SRT format."""
         srt_content = []
@@ -0,0 +1,118 @@
+import json
+import time
+import sqlite3
+import threading
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+class JobJournal:
+    def __init__(self, path):
+        """Durable per-file job state for batch runs, stored in SQLite.
+
+        Every state change is committed immediately, so a run that dies halfway
+        leaves an accurate record of what finished.
+
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' key TEXT PRIMARY KEY,'
+            ' input_path TEXT NOT NULL,'
+            ' output_path TEXT NOT NULL,'
+            ' state TEXT NOT NULL,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' error TEXT,'
+            ' started_at REAL,'
+            ' finished_at REAL,'
+            ' timings TEXT'
+            ')'
+        )
+        self._db.commit()
+
+    def _execute(self, sql, params=()):
+        """Run a statement and commit it."""
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            self._db.commit()
+            return cursor
+
+    def reset(self):
+        """Forget all jobs, for a fresh (non-resumed) run."""
+        self._execute('DELETE FROM jobs')
+
+    def add(self, key, input_path, output_path):
+        """Register a job as pending unless the journal already knows it."""
+        self._execute(
+            'INSERT OR IGNORE INTO jobs (key, input_path, output_path, state) VALUES (?, ?, ?, ?)',
+            (key, input_path, output_path, PENDING)
+        )
+
+    def start(self, key):
+        """Mark a job as running and count the attempt."""
+        self._execute(
+            'UPDATE jobs SET state = ?, attempts = attempts + 1, error = NULL, started_at = ? WHERE key = ?',
+            (RUNNING, time.time(), key)
+        )
+
+    def finish(self, key, timings=None):
+        """Mark a job as done.
+
+        Args:
+            key (str): Job key
+            timings (dict, optional): Seconds spent per stage
+        """
+        self._execute(
+            'UPDATE jobs SET state = ?, finished_at = ?, timings = ? WHERE key = ?',
+            (DONE, time.time(), json.dumps(timings or {}), key)
+        )
+
+    def fail(self, key, error, timings=None):
+        """Mark a job as failed.
+
+        Args:
+            key (str): Job key
+            error (str): Error message of the failed attempt
+            timings (dict, optional): Seconds spent per stage
+        """
+        self._execute(
+            'UPDATE jobs SET state = ?, error = ?, finished_at = ?, timings = ? WHERE key = ?',
+            (FAILED, error, time.time(), json.dumps(timings or {}), key)
+        )
+
+    def state(self, key):
+        """Current state of a job, or None if unknown."""
+        row = self._execute('SELECT state FROM jobs WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def unfinished(self):
+        """Keys of jobs that are not done, including ones left running by a crashed run."""
+        rows = self._execute('SELECT key FROM jobs WHERE state != ?', (DONE,)).fetchall()
+        return {row[0] for row in rows}
+
+    def summary(self):
+        """Number of jobs per state."""
+        rows = self._execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall()
+        return dict(rows)
+
+    def failures(self):
+        """Failed jobs with their attempts and last error.
+
+        Returns:
+            list: (key, attempts, error) tuples
+        """
+        return self._execute(
+            'SELECT key, attempts, error FROM jobs WHERE state = ? ORDER BY key', (FAILED,)
+        ).fetchall()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
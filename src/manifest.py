@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import hashlib
+
+MANIFEST_VERSION = 1
+
+# Seconds after which a manifest lock left by a crashed process is broken
+LOCK_STALE_SECONDS = 30
+
+# Partial hashes read this many bytes from the start, middle and end of a file
+PARTIAL_BLOCK_SIZE = 1 << 20
+
+def partial_hash(path, block_size=PARTIAL_BLOCK_SIZE):
+    """Hash the size and three sampled blocks of a file.
+
+    Cheap enough to run over large archives, but only a hint: files that
+    differ outside the sampled blocks hash the same.
+
+    Args:
+        path (str): File to hash
+        block_size (int): Bytes read at each sample point
+
+    Returns:
+        str: Hex digest
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, 'rb') as f:
+        for offset in sorted({0, max(0, size // 2 - block_size // 2), max(0, size - block_size)}):
+            f.seek(offset)
+            digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+def full_hash(path, block_size=PARTIAL_BLOCK_SIZE):
+    """Hash the full content of a file.
+
+    Args:
+        path (str): File to hash
+        block_size (int): Read size
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def settings_fingerprint(settings):
+    """Stable fingerprint of the settings that affect an output file.
+
+    Args:
+        settings (dict): JSON-serializable settings such as model, language and format
+
+    Returns:
+        str: Hex digest
+    """
+    encoded = json.dumps(settings, sort_keys=True).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+class BatchManifest:
+    def __init__(self, path, settings, save_interval=30):
+        """Record which outputs are up to date so batch runs can skip them.
+
+        Entries are keyed by the input path relative to the input directory and
+        store the input's size, mtime and hashes together with the settings
+        fingerprint that produced the output. Several nodes can share one
+        manifest: each save merges the entries this instance changed into
+        the file on disk under a lock file, keeping other nodes' records.
+
+        Args:
+            path (str): Manifest JSON file
+            settings (dict): Settings that affect the output (model, language, format, quality)
+            save_interval (float): Minimum seconds between automatic saves
+        """
+        self.path = path
+        self.fingerprint = settings_fingerprint(settings)
+        self.save_interval = save_interval
+        self.entries = {}
+        self._hashes = {}  # Full hashes computed by is_current, by key: (size, mtime_ns, hash)
+        self._last_save = time.monotonic()
+        self._changed = set()  # Keys written since the last save
+        self.load()
+
+    def _read(self):
+        """Entries in the file on disk; a missing or unreadable manifest is empty."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                return data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def load(self):
+        """Load entries from disk."""
+        self.entries = self._read()
+
+    def _acquire_lock(self):
+        """Create the lock file exclusively, waiting for other writers."""
+        lock_path = f"{self.path}.lock"
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+                return lock_path
+            except FileExistsError:
+                try:
+                    if time.time() - os.stat(lock_path).st_mtime > LOCK_STALE_SECONDS:
+                        os.unlink(lock_path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(0.05)
+
+    def save(self):
+        """Merge this instance's changes into the manifest on disk and write it atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_path = self._acquire_lock()
+        try:
+            # Other nodes may have saved since we loaded; keep their entries
+            entries = self._read()
+            entries.update({key: self.entries[key] for key in self._changed if key in self.entries})
+            self.entries = entries
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f)
+            os.replace(temp_path, self.path)
+        finally:
+            os.unlink(lock_path)
+        self._last_save = time.monotonic()
+        self._changed.clear()
+
+    def _maybe_save(self):
+        """Save if enough time has passed since the last write."""
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def is_current(self, key, input_path, output_path):
+        """Check whether an output is still valid for its input and the current settings.
+
+        Unchanged size and mtime are trusted without reading the file. If only
+        the mtime moved, a partial hash rules out most real changes and a full
+        hash confirms the rest. Entries are recorded without a full hash, so
+        files that are never touched are never read in full; the first time a
+        touched file passes the partial hash it is reprocessed, since nothing
+        trusted can confirm it, and the full hash computed here is recorded
+        with the new output to confirm later touches.
+
+        Args:
+            key (str): Manifest key, usually the relative input path
+            input_path (str): Path to the input file
+            output_path (str): Path to the output file
+
+        Returns:
+            bool: True if the file can be skipped
+        """
+        entry = self.entries.get(key)
+        if not entry or entry.get('settings') != self.fingerprint:
+            return False
+        if not os.path.exists(output_path):
+            return False
+
+        try:
+            stat = os.stat(input_path)
+        except OSError:
+            return False
+
+        if stat.st_size != entry['size']:
+            return False
+        if stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+
+        # Touched but possibly unchanged (copied, restored from backup, re-synced)
+        if partial_hash(input_path) != entry['partial_hash']:
+            return False
+        content_hash = full_hash(input_path)
+        if entry.get('hash') is None:
+            self._hashes[key] = (stat.st_size, stat.st_mtime_ns, content_hash)
+            return False
+        if content_hash != entry['hash']:
+            return False
+
+        entry['mtime_ns'] = stat.st_mtime_ns
+        self._changed.add(key)
+        self._maybe_save()
+        return True
+
+    def snapshot(self, input_path):
+        """Size, mtime and partial hash of an input, taken before processing it.
+
+        Args:
+            input_path (str): Path to the input file
+
+        Returns:
+            dict: State to pass to record, or None if the file can't be read
+        """
+        try:
+            stat = os.stat(input_path)
+            return {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'partial_hash': partial_hash(input_path)
+            }
+        except OSError:
+            return None
+
+    def record(self, key, input_path, snapshot=None):
+        """Mark an input as processed with the current settings.
+
+        Args:
+            key (str): Manifest key, usually the relative input path
+            input_path (str): Path to the input file
+            snapshot (dict, optional): State from snapshot taken when the job
+                started, so a file modified while it was processed is not
+                recorded as current; taken now if omitted
+        """
+        snapshot = snapshot or self.snapshot(input_path)
+        computed = self._hashes.pop(key, None)
+        if snapshot is None:
+            return
+        # A hash from is_current only describes the processed content if the file hasn't changed since
+        content_hash = None
+        if computed and computed[:2] == (snapshot['size'], snapshot['mtime_ns']):
+            content_hash = computed[2]
+        self.entries[key] = dict(snapshot, hash=content_hash, settings=self.fingerprint)
+        self._changed.add(key)
+        self._maybe_save()
+
+    def close(self):
+        """Flush pending changes."""
+        if self._changed:
+            self.save()
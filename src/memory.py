@@ -0,0 +1,115 @@
+import threading
+
+from src.utils import get_rss_bytes
+
+# Approximate resident memory of a loaded Whisper model on CPU (fp32 weights plus runtime)
+MODEL_MEMORY_BYTES = {
+    'tiny': 400 * 2**20,
+    'base': 600 * 2**20,
+    'small': 1.3 * 2**30,
+    'medium': 3.2 * 2**30,
+    'large': 6.5 * 2**30
+}
+
+# Peak working memory per second of audio: the decoded source audio held by
+# pydub during extraction, the float32 waveform, and the STFT and mel
+# spectrogram Whisper computes over the whole file
+BYTES_PER_AUDIO_SECOND = 320 * 2**10
+
+# Assumed length of files whose duration could not be probed
+UNKNOWN_DURATION_SECONDS = 1800
+
+class MemoryBudget:
+    def __init__(self, budget_bytes, model_name='base', resident_models=1, rss=get_rss_bytes):
+        """Admit batch jobs only while their estimated memory fits a budget.
+
+        Each job is estimated from its audio duration. Observed RSS corrects
+        the estimates: when the process tree uses more than was reserved the
+        correction rises immediately, and it decays slowly when jobs turn out
+        smaller, so concurrency grows back without risking an OOM.
+
+        Args:
+            budget_bytes (int): Memory the whole run may use
+            model_name (str): Whisper model size, for the resident model estimate
+            resident_models (int): Models loaded outside this process's current RSS,
+                e.g. one per transcription worker process
+            rss (callable): Returns the current RSS of the process tree in bytes
+        """
+        self.budget = budget_bytes
+        self.model_bytes = MODEL_MEMORY_BYTES.get(model_name, MODEL_MEMORY_BYTES['large'])
+        self.rss = rss
+        self.baseline = rss() + self.model_bytes * resident_models
+        self.scale = 1.0
+        self.peak_rss = 0
+        self.waits = 0
+        self._reserved = {}
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._monitor = None
+
+    @property
+    def available(self):
+        """Bytes left for jobs once the process and its models are accounted for."""
+        return self.budget - self.baseline
+
+    def estimate(self, audio_seconds):
+        """Uncorrected working memory of a job, in bytes."""
+        return (audio_seconds or UNKNOWN_DURATION_SECONDS) * BYTES_PER_AUDIO_SECOND
+
+    def _fits(self, amount):
+        if not self._reserved:
+            # Always admit one job, however large, so the batch can't stall
+            return True
+        reserved = sum(self._reserved.values())
+        if (reserved + amount) * self.scale > self.available:
+            return False
+        # Also check what is really in use, which catches growth the estimates miss
+        return self.rss() + amount * self.scale <= self.budget
+
+    def acquire(self, job):
+        """Block until the job fits the budget, then reserve its memory."""
+        amount = self.estimate(job.duration)
+        with self._condition:
+            if not self._fits(amount):
+                self.waits += 1
+                while not self._fits(amount):
+                    self._condition.wait(1.0)
+            self._reserved[id(job)] = amount
+
+    def release(self, job):
+        """Return a job's reservation; does nothing if it holds none."""
+        with self._condition:
+            if self._reserved.pop(id(job), None) is not None:
+                self._condition.notify_all()
+
+    def in_flight(self):
+        """Number of admitted jobs still holding a reservation."""
+        with self._condition:
+            return len(self._reserved)
+
+    def observe(self):
+        """Sample RSS and update the correction factor."""
+        rss = self.rss()
+        with self._condition:
+            self.peak_rss = max(self.peak_rss, rss)
+            reserved = sum(self._reserved.values())
+            if reserved > 0:
+                ratio = max(rss - self.baseline, 0) / reserved
+                # Rise at once, decay slowly
+                self.scale = min(4.0, max(ratio, self.scale * 0.95 + ratio * 0.05, 0.25))
+            self._condition.notify_all()
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            self.observe()
+
+    def start(self, interval=0.5):
+        """Sample RSS in a background thread."""
+        self._monitor = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+        self._monitor.start()
+
+    def stop(self):
+        """Stop the RSS sampler."""
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
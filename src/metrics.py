@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds, from single requests up to long files
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+METRIC_PREFIX = 'subtitle_'
+
+METRIC_HELP = {
+    'stage_seconds': 'Time spent per file in each pipeline stage',
+    'file_seconds': 'Total processing time per file',
+    'files_total': 'Files processed, by status',
+    'audio_seconds_total': 'Seconds of audio transcribed',
+    'vad_skipped_seconds_total': 'Seconds of non-speech audio skipped by VAD',
+    'audio_allocations_total': 'Waveform arrays allocated while loading and preparing audio',
+    'audio_allocated_bytes_total': 'Bytes of waveform arrays allocated while loading and preparing audio',
+    'translation_requests_total': 'Translation requests, by service and outcome',
+    'translation_request_seconds': 'Translation request latency, by service',
+    'translation_retries_total': 'Repeated translation requests for the same chunk, by service',
+    'cache_hits_total': 'Work skipped thanks to a cache, by cache',
+    'cache_misses_total': 'Cache lookups that found nothing usable, by cache'
+}
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Cumulative-bucket histogram in the Prometheus style.
+
+        Args:
+            buckets (tuple): Sorted bucket upper bounds
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, cumulative count) pairs, ending with +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'buckets': {('+Inf' if bound == float('inf') else str(bound)): count
+                        for bound, count in self.cumulative()}
+        }
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+class MetricsRecorder:
+    def __init__(self):
+        """Collect counters, latency histograms and per-file records for a run.
+
+        Thread-safe, so batch stage workers and translation threads can share
+        one recorder.
+        """
+        self.started_at = time.time()
+        self.counters = {}
+        self.histograms = {}
+        self.files = []
+        self._lock = threading.Lock()
+
+    def increment(self, name, value=1, **labels):
+        """Add to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """Add a duration to a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(seconds)
+
+    @contextmanager
+    def time(self, name, **labels):
+        """Context manager observing the duration of its block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def record_file(self, key, status, timings=None, audio_seconds=None, attempts=1, error=None, allocations=None):
+        """Record the outcome of one file.
+
+        Args:
+            key (str): File identifier, usually the relative input path
+            status (str): 'done', 'failed' or 'skipped'
+            timings (dict, optional): Seconds spent per stage
+            audio_seconds (float, optional): Duration of the transcribed audio
+            attempts (int): Attempts it took
+            error (str, optional): Last error for failed files
+            allocations (tuple, optional): (arrays, bytes) allocated for the file's waveform
+        """
+        timings = timings or {}
+        for stage, seconds in timings.items():
+            self.observe('stage_seconds', seconds, stage=stage)
+        if timings:
+            self.observe('file_seconds', sum(timings.values()))
+        if audio_seconds:
+            self.increment('audio_seconds_total', audio_seconds)
+        self.increment('files_total', status=status)
+        if allocations:
+            self.increment('audio_allocations_total', allocations[0])
+            self.increment('audio_allocated_bytes_total', allocations[1])
+
+        with self._lock:
+            self.files.append({
+                'file': key,
+                'status': status,
+                'attempts': attempts,
+                'audio_seconds': audio_seconds,
+                'timings': {stage: round(seconds, 6) for stage, seconds in timings.items()},
+                'error': error,
+                'audio_allocated_bytes': allocations[1] if allocations else None
+            })
+
+    def to_dict(self):
+        """Machine-readable report of everything recorded so far."""
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'finished_at': time.time(),
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                'histograms': [
+                    dict(histogram.to_dict(), name=name, labels=dict(labels))
+                    for (name, labels), histogram in sorted(self.histograms.items())
+                ],
+                'files': list(self.files)
+            }
+
+    def _write_atomic(self, path, content):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def write_json(self, path):
+        """Write the report as JSON."""
+        self._write_atomic(path, json.dumps(self.to_dict(), indent=2))
+
+    def to_prometheus(self):
+        """Render counters and histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+
+        described = set()
+        for (name, labels), value in counters:
+            metric = METRIC_PREFIX + name
+            if metric not in described:
+                lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} counter")
+                described.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+        for (name, labels), histogram in histograms:
+            metric = METRIC_PREFIX + name
+            if metric not in described:
+                lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} histogram")
+                described.add(metric)
+            for bound, count in histogram.cumulative():
+                le = '+Inf' if bound == float('inf') else str(bound)
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', le),))} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Write a textfile for the node_exporter textfile collector."""
+        self._write_atomic(path, self.to_prometheus())
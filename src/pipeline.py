@@ -0,0 +1,138 @@
+import queue
+import threading
+
+SENTENCE_ENDINGS = ('.', '!', '?', '。', '！', '？', '…')
+
+_DONE = object()
+
+def apply_translation(segments, original_text, translated_text):
+    """Spread a translated transcript back over the original segments.
+
+    The translated text is split into roughly proportional parts based on the
+    original segment lengths, cutting at the nearest sentence end.
+
+    Args:
+        segments (list): Transcription segments, updated in place
+        original_text (str): Full transcribed text
+        translated_text (str): Full translated text
+
+    Returns:
+        list: The updated segments
+    """
+    if len(segments) > 0:
+        # Split translated text into roughly equal parts based on original segment lengths
+        total_chars = len(translated_text)
+        total_orig_chars = len(original_text)
+        char_ratio = total_chars / total_orig_chars if total_orig_chars > 0 else 1
+
+        start_idx = 0
+        for segment in segments:
+            orig_len = len(segment['text'])
+            target_len = int(orig_len * char_ratio)
+            # Find the nearest sentence end or space
+            end_idx = min(start_idx + target_len, len(translated_text))
+            while end_idx < len(translated_text) and translated_text[end_idx] not in '.!?。，':
+                end_idx += 1
+            segment['text'] = translated_text[start_idx:end_idx].strip()
+            start_idx = end_idx
+
+    return segments
+
+def translate_transcription(transcription, translator, target_lang, progress=None, task_id=None):
+    """Translate a transcription and update its segments.
+
+    Args:
+        transcription (dict): Result of WhisperTranscriber.transcribe
+        translator (Translator): Configured translator
+        target_lang (str): Target language code
+        progress (Progress, optional): Rich progress instance
+        task_id: Task ID for progress tracking
+
+    Returns:
+        tuple: (text, segments) ready for the subtitle formatter
+    """
+    if transcription['language'] == target_lang or not transcription['segments']:
+        return transcription['text'], transcription['segments']
+
+    translated_text = translator.translate(
+        text=transcription['text'],
+        source_lang=transcription['language'],
+        target_lang=target_lang,
+        progress=progress,
+        task_id=task_id
+    )
+    segments = apply_translation(transcription['segments'], transcription['text'], translated_text)
+    return translated_text, segments
+
+class StreamingTranslation:
+    def __init__(self, translator, target_lang, batch_chars=None):
+        """Translate segments in the background while transcription continues.
+
+        Segments are buffered until they end a sentence and reach batch_chars,
+        then translated as one text by a worker thread, so translation overlaps
+        with decoding the rest of the file and each request keeps whole
+        sentences for context.
+
+        Args:
+            translator (Translator): Configured translator
+            target_lang (str): Target language code
+            batch_chars (int, optional): Minimum characters per batch, defaults
+                to the translator's chunk size
+        """
+        self.translator = translator
+        self.target_lang = target_lang
+        self.batch_chars = batch_chars or translator.chunk_size
+        self.batches = 0
+        self.segments = []
+        self._buffer = []
+        self._buffer_chars = 0
+        self._language = None
+        self._queue = queue.Queue()
+        self._error = None
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def feed(self, segments, source_lang):
+        """Add transcribed segments; usable as WhisperTranscriber's on_segments callback."""
+        self._language = source_lang
+        for segment in segments:
+            self._buffer.append(segment)
+            self._buffer_chars += len(segment['text'])
+            if self._buffer_chars >= self.batch_chars and segment['text'].rstrip().endswith(SENTENCE_ENDINGS):
+                self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._queue.put((self._buffer, self._language))
+            self._buffer = []
+            self._buffer_chars = 0
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            segments, source_lang = item
+            if self._error is None:
+                try:
+                    if source_lang != self.target_lang:
+                        text = ''.join(segment['text'] for segment in segments)
+                        translated = self.translator.translate(text, source_lang=source_lang, target_lang=self.target_lang)
+                        segments = apply_translation(segments, text, translated)
+                        self.batches += 1
+                except Exception as e:
+                    self._error = e
+            self.segments.extend(segments)
+
+    def finish(self):
+        """Translate what is still buffered and wait for all batches.
+
+        Returns:
+            tuple: (text, segments) ready for the subtitle formatter
+        """
+        self._flush()
+        self._queue.put(_DONE)
+        self._thread.join()
+        if self._error is not None:
+            raise Exception(f"Translation failed: {str(self._error)}")
+        return ' '.join(segment['text'] for segment in self.segments), self.segments
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import shutil
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+PROBE_CACHE_VERSION = 1
+
+def get_ffprobe_path():
+    """Get the FFprobe path, or None if it is not installed."""
+    return shutil.which('ffprobe')
+
+def probe_media(path, ffprobe='ffprobe', timeout=60):
+    """Read duration and audio stream information from a media file.
+
+    Args:
+        path (str): Media file
+        ffprobe (str): FFprobe executable
+        timeout (float): Seconds before giving up on a file
+
+    Returns:
+        dict: duration (seconds), audio_streams, codec, sample_rate, channels and
+            error (None when the file could be probed)
+    """
+    info = {'duration': 0.0, 'audio_streams': 0, 'codec': None, 'sample_rate': None, 'channels': None, 'error': None}
+    try:
+        output = subprocess.run(
+            [ffprobe, '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', path],
+            capture_output=True, timeout=timeout, check=True
+        ).stdout
+        data = json.loads(output or b'{}')
+    except subprocess.CalledProcessError as e:
+        info['error'] = e.stderr.decode(errors='replace').strip() or 'ffprobe failed'
+        return info
+    except (subprocess.TimeoutExpired, ValueError, OSError) as e:
+        # OSError covers a missing ffprobe as well as a file that vanished
+        info['error'] = str(e)
+        return info
+
+    audio = [stream for stream in data.get('streams', []) if stream.get('codec_type') == 'audio']
+    info['audio_streams'] = len(audio)
+    if audio:
+        info['codec'] = audio[0].get('codec_name')
+        info['sample_rate'] = int(audio[0].get('sample_rate') or 0) or None
+        info['channels'] = audio[0].get('channels')
+
+    # Prefer the audio stream's duration; containers may be longer than their audio
+    for source in ([audio[0]] if audio else []) + [data.get('format', {})]:
+        try:
+            info['duration'] = float(source['duration'])
+            break
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    return info
+
+def unusable_reason(info):
+    """Why a probed file can't be transcribed, or None if it can."""
+    if info.get('error'):
+        return f"Probe failed: {info['error']}"
+    if not info.get('audio_streams'):
+        return "No audio stream"
+    if not info.get('duration'):
+        return "Zero-length audio"
+    return None
+
+class ProbeCache:
+    def __init__(self, path):
+        """Persist probe results keyed by file path, size and mtime.
+
+        Args:
+            path (str): Cache JSON file
+        """
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == PROBE_CACHE_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+
+    def _identity(self, media_path):
+        """Cache key and (size, mtime) of a file, or None if it can't be read."""
+        try:
+            stat = os.stat(media_path)
+        except OSError:
+            return None
+        return os.path.abspath(media_path), [stat.st_size, stat.st_mtime_ns]
+
+    def get(self, media_path):
+        """Cached probe result, or None if missing or stale."""
+        identity = self._identity(media_path)
+        if identity is None:
+            return None
+        key, identity = identity
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry and entry['identity'] == identity:
+            return entry['info']
+        return None
+
+    def put(self, media_path, info):
+        """Store a probe result; skipped if the file is gone."""
+        identity = self._identity(media_path)
+        if identity is None:
+            return
+        key, identity = identity
+        with self._lock:
+            self.entries[key] = {'identity': identity, 'info': info, 'probed_at': time.time()}
+
+    def save(self):
+        """Write the cache atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': PROBE_CACHE_VERSION, 'entries': self.entries}, f)
+        os.replace(temp_path, self.path)
+
+def probe_all(paths, cache=None, workers=8, ffprobe='ffprobe'):
+    """Probe many files in parallel, reusing cached results.
+
+    Args:
+        paths (list): Media files
+        cache (ProbeCache, optional): Cache to read from and update
+        workers (int): Concurrent ffprobe processes
+        ffprobe (str): FFprobe executable
+
+    Returns:
+        dict: Probe info by path
+    """
+    def probe(path):
+        info = cache.get(path) if cache is not None else None
+        if info is None:
+            info = probe_media(path, ffprobe=ffprobe)
+            # Failures such as timeouts may be transient, so only successes are cached
+            if cache is not None and info['error'] is None:
+                cache.put(path, info)
+        return path, info
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(executor.map(probe, paths))
+
+class BatchETA:
+    def __init__(self, total_audio_seconds):
+        """Estimate time remaining from the audio duration processed so far.
+
+        Args:
+            total_audio_seconds (float): Audio duration of all scheduled files
+        """
+        self.total = total_audio_seconds
+        self.done = 0.0
+        self.started = time.monotonic()
+
+    def complete(self, audio_seconds):
+        """Account for a finished (or abandoned) file."""
+        self.done += audio_seconds
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 1.0
+
+    def remaining_seconds(self):
+        """Estimated wall seconds left, or None before the first file finishes."""
+        elapsed = time.monotonic() - self.started
+        if self.done <= 0 or elapsed <= 0:
+            return None
+        return (self.total - self.done) * elapsed / self.done
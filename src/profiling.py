@@ -0,0 +1,125 @@
+import io
+import os
+import glob
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager, nullcontext
+
+def _safe_name(key):
+    """Turn a relative file path into a single directory name."""
+    return key.replace(os.sep, '__').replace('/', '__') or 'file'
+
+class StageProfiler:
+    def __init__(self, output_dir, top_n=30, torch_profile=False):
+        """Profile pipeline stages with cProfile, one profile per file and stage.
+
+        Profiles are written to OUTPUT_DIR/<file>/<stage>.prof and can be merged
+        into a hotspot summary for the whole run. Worker processes can write
+        into the same directory; summarize() picks up everything in it.
+
+        Args:
+            output_dir (str): Directory for .prof files and the summary
+            top_n (int): Functions listed per section of the summary
+            torch_profile (bool): Also run the torch profiler around Whisper decoding
+        """
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.torch_profile = torch_profile
+        self.skipped = 0
+        self._local = threading.local()
+        os.makedirs(output_dir, exist_ok=True)
+
+    @contextmanager
+    def file(self, key):
+        """Attribute stages run by this thread inside the block to a file."""
+        previous = getattr(self._local, 'key', None)
+        self._local.key = key
+        try:
+            yield
+        finally:
+            self._local.key = previous
+
+    def _path(self, key, name):
+        directory = os.path.join(self.output_dir, _safe_name(key))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, name)
+
+    @contextmanager
+    def stage(self, name, file_key=None):
+        """Profile the block as one stage of the current file."""
+        key = file_key or getattr(self._local, 'key', None) or 'unknown'
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per interpreter, so a
+            # stage running concurrently in another thread goes unprofiled
+            self.skipped += 1
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(self._path(key, f"{name}.prof"))
+
+    def torch_stage(self, name):
+        """Context manager running the torch profiler, if enabled and available."""
+        if not self.torch_profile:
+            return nullcontext()
+        try:
+            import torch.profiler
+        except ImportError:
+            return nullcontext()
+        return self._torch_stage(name, torch.profiler)
+
+    @contextmanager
+    def _torch_stage(self, name, profiler_module):
+        key = getattr(self._local, 'key', None) or 'unknown'
+        activities = [profiler_module.ProfilerActivity.CPU]
+        import torch
+        if torch.cuda.is_available():
+            activities.append(profiler_module.ProfilerActivity.CUDA)
+
+        with profiler_module.profile(activities=activities) as prof:
+            yield
+        prof.export_chrome_trace(self._path(key, f"{name}.trace.json"))
+        with open(self._path(key, f"{name}.torch.txt"), 'w', encoding='utf-8') as f:
+            f.write(prof.key_averages().table(sort_by='self_cpu_time_total', row_limit=self.top_n))
+
+    def summarize(self):
+        """Merge every profile into a top-N hotspot summary.
+
+        Returns:
+            str: Path of the summary file, or None if nothing was profiled
+        """
+        paths = sorted(glob.glob(os.path.join(self.output_dir, '*', '*.prof')))
+        if not paths:
+            return None
+
+        by_stage = {}
+        for path in paths:
+            by_stage.setdefault(os.path.splitext(os.path.basename(path))[0], []).append(path)
+
+        stream = io.StringIO()
+        stream.write(f"Profiled {len(paths)} stage runs across "
+                     f"{len({os.path.dirname(p) for p in paths})} files\n\n")
+
+        stream.write("Time per stage\n")
+        for stage, stage_paths in sorted(by_stage.items()):
+            stats = pstats.Stats(*stage_paths)
+            stream.write(f"  {stage:<20} {stats.total_tt:10.3f}s over {len(stage_paths)} runs\n")
+
+        for sort_key in ('tottime', 'cumulative'):
+            stream.write(f"\n=== Top {self.top_n} functions by {sort_key} (all files) ===\n")
+            stats = pstats.Stats(*paths, stream=stream)
+            # Don't list every merged .prof file in the header
+            stats.files = []
+            stats.sort_stats(sort_key).print_stats(self.top_n)
+
+        summary_path = os.path.join(self.output_dir, 'summary.txt')
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(stream.getvalue())
+        return summary_path
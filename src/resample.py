@@ -0,0 +1,167 @@
+import math
+import wave
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+TARGET_RATE = 16000
+
+def design_filter(up, down, taps_per_phase=32, beta=8.6, rolloff=0.94):
+    """Kaiser-windowed sinc low-pass filter for resampling by up/down.
+
+    Args:
+        up (int): Interpolation factor
+        down (int): Decimation factor
+        taps_per_phase (int): Filter taps per polyphase branch
+        beta (float): Kaiser window shape; 8.6 gives about 90 dB stopband attenuation
+        rolloff (float): Cutoff as a fraction of the lower Nyquist frequency
+
+    Returns:
+        np.ndarray: (up, taps_per_phase) float32 polyphase matrix, each branch
+            reversed so it can be applied to input windows directly
+    """
+    length = taps_per_phase * up
+    cutoff = rolloff * 0.5 / max(up, down)  # Cycles per upsampled sample
+    # Centre on a whole sample so the delay is exact; the extra window point is dropped
+    n = np.arange(length) - length // 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length + 1, beta)[:length]
+    taps *= up / taps.sum()
+    # Branch p holds taps p, p + up, p + 2*up, ...
+    return taps.reshape(taps_per_phase, up).T[:, ::-1].astype(np.float32)
+
+def pcm_to_float(block, out=None):
+    """Scale PCM samples to float32 in [-1, 1].
+
+    Args:
+        block (np.ndarray): Integer PCM or float samples
+        out (np.ndarray, optional): float32 array of the same shape to write
+            into instead of allocating a new one
+
+    Returns:
+        np.ndarray: The float32 samples
+    """
+    if block.dtype == np.uint8:
+        out = np.subtract(block, np.float32(128), out=out, dtype=np.float32)
+        return np.multiply(out, np.float32(1 / 128), out=out)
+    if np.issubdtype(block.dtype, np.integer):
+        scale = np.float32(1 / 2 ** (8 * block.dtype.itemsize - 1))
+        return np.multiply(block, scale, out=out, dtype=np.float32, casting='unsafe')
+    if out is None:
+        return block.astype(np.float32, copy=False)
+    out[...] = block
+    return out
+
+class StreamingResampler:
+    def __init__(self, source_rate, target_rate=TARGET_RATE, taps_per_phase=32):
+        """Polyphase resampler that converts audio block by block.
+
+        Only the current block and a short filter history are held, so memory
+        stays constant however long the input is. Integer PCM is converted to
+        float one block at a time and multi-channel input is mixed down to mono.
+
+        Args:
+            source_rate (int): Input sample rate in Hz
+            target_rate (int): Output sample rate in Hz
+            taps_per_phase (int): Filter taps per polyphase branch
+        """
+        divisor = math.gcd(int(source_rate), int(target_rate))
+        self.up = int(target_rate) // divisor
+        self.down = int(source_rate) // divisor
+        self.taps = taps_per_phase
+        self.filter = design_filter(self.up, self.down, taps_per_phase)
+        # Delay of the linear-phase filter, in upsampled samples
+        self._delay = taps_per_phase * self.up // 2
+        # Zeros before the first sample stand in for the missing history
+        self._buffer = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self._buffer_start = -(taps_per_phase - 1)
+        self._consumed = 0
+        self._produced = 0
+
+    def output_length(self, input_length):
+        """Samples produced for an input of the given length."""
+        return -(-input_length * self.up // self.down)
+
+    def _emit(self, limit=None):
+        """Produce every output sample whose input window is complete."""
+        last = self._buffer_start + len(self._buffer) - 1
+        end = (last * self.up + self.up - 1 - self._delay) // self.down + 1
+        if limit is not None:
+            end = min(end, limit)
+        if end <= self._produced:
+            return np.zeros(0, dtype=np.float32)
+
+        positions = np.arange(self._produced, end, dtype=np.int64) * self.down + self._delay
+        bases = positions // self.up - self._buffer_start
+        phases = positions % self.up
+        windows = sliding_window_view(self._buffer, self.taps)[bases - (self.taps - 1)]
+        output = np.einsum('ij,ij->i', windows, self.filter[phases])
+        self._produced = end
+
+        # Keep only the history the next output still needs
+        keep_from = (end * self.down + self._delay) // self.up - (self.taps - 1) - self._buffer_start
+        if keep_from > 0:
+            self._buffer = self._buffer[keep_from:]
+            self._buffer_start += keep_from
+        return output
+
+    def process(self, block):
+        """Resample one block.
+
+        Args:
+            block (np.ndarray): (frames,) or (frames, channels) samples, integer PCM or float
+
+        Returns:
+            np.ndarray: float32 mono output for this block (may be empty)
+        """
+        samples = pcm_to_float(np.asarray(block))
+        if samples.ndim == 2:
+            samples = samples.mean(axis=1, dtype=np.float32)
+        self._consumed += len(samples)
+        if self.up == self.down:
+            self._produced += len(samples)
+            return samples
+
+        self._buffer = np.concatenate((self._buffer, samples))
+        return self._emit()
+
+    def flush(self):
+        """Produce the output still held back by the filter delay."""
+        if self.up == self.down:
+            return np.zeros(0, dtype=np.float32)
+        self._buffer = np.concatenate((self._buffer, np.zeros(self.taps + 1, dtype=np.float32)))
+        return self._emit(limit=self.output_length(self._consumed))
+
+def resample_wav(path, target_rate=TARGET_RATE, block_frames=65536):
+    """Read a PCM WAV file as a mono float32 waveform at the target rate.
+
+    Args:
+        path (str): WAV file with 8, 16 or 32-bit integer samples
+        target_rate (int): Output sample rate in Hz
+        block_frames (int): Frames read and resampled at a time
+
+    Returns:
+        np.ndarray: float32 samples in the range [-1, 1]
+    """
+    with wave.open(path, 'rb') as f:
+        channels = f.getnchannels()
+        width = f.getsampwidth()
+        if width not in (1, 2, 4):
+            raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+        dtype = np.dtype('u1' if width == 1 else f'<i{width}')
+        resampler = StreamingResampler(f.getframerate(), target_rate)
+
+        # The output length is known up front, so fill one preallocated array
+        audio = np.empty(resampler.output_length(f.getnframes()), dtype=np.float32)
+        position = 0
+        while True:
+            data = f.readframes(block_frames)
+            if not data:
+                break
+            block = np.frombuffer(data, dtype=dtype).reshape(-1, channels)
+            output = resampler.process(block)
+            audio[position:position + len(output)] = output
+            position += len(output)
+
+        output = resampler.flush()
+        audio[position:position + len(output)] = output
+        position += len(output)
+    return audio[:position]
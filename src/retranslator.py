@@ -0,0 +1,93 @@
+from difflib import SequenceMatcher
+from rich.console import Console
+
+console = Console()
+
+class IncrementalRetranslator:
+    def __init__(self, translator):
+        """Initialize the incremental re-translator.
+
+        Args:
+            translator (Translator): Translator used for the changed cues
+        """
+        self.translator = translator
+
+    def _normalize(self, text):
+        """Normalize cue text so whitespace-only edits don't count as changes."""
+        return ' '.join(text.split())
+
+    def diff_cues(self, previous_source, current_source):
+        """Match the cues of two versions of a source subtitle file.
+
+        Args:
+            previous_source (list): Segments of the source file the translation was made from
+            current_source (list): Segments of the corrected source file
+
+        Returns:
+            list: One entry per current cue, the index of the identical previous
+                cue or None if the cue text is new or changed
+        """
+        matcher = SequenceMatcher(
+            a=[self._normalize(cue['text']) for cue in previous_source],
+            b=[self._normalize(cue['text']) for cue in current_source],
+            autojunk=False
+        )
+
+        matches = [None] * len(current_source)
+        for tag, i1, _, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                for offset in range(j2 - j1):
+                    matches[j1 + offset] = i1 + offset
+
+        return matches
+
+    def retranslate(self, previous_source, current_source, translation, source_lang='auto', target_lang='en'):
+        """Refresh a translation after its source subtitles were edited.
+
+        Cues whose source text is unchanged keep their existing translation and
+        timing. Only new or edited cues are sent to the translator.
+
+        Args:
+            previous_source (list): Segments of the source file the translation was made from
+            current_source (list): Segments of the corrected source file
+            translation (list): Segments of the existing translation, aligned with previous_source
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+
+        Returns:
+            tuple: (segments, stats) where segments is the refreshed translation and
+                stats counts reused and re-translated cues
+        """
+        if len(previous_source) != len(translation):
+            raise Exception(
+                f"Existing translation has {len(translation)} cues but the previous source has "
+                f"{len(previous_source)}; cannot align them"
+            )
+
+        matches = self.diff_cues(previous_source, current_source)
+        changed = [i for i, match in enumerate(matches) if match is None]
+
+        console.print(f"🔍 [cyan]{len(current_source) - len(changed)} cues unchanged, {len(changed)} to re-translate[/cyan]")
+
+        translated_lines = []
+        if changed:
+            translated_lines = self.translator.translate_lines(
+                [current_source[i]['text'] for i in changed],
+                source_lang=source_lang,
+                target_lang=target_lang
+            )
+
+        segments = []
+        new_translations = dict(zip(changed, translated_lines))
+        for i, (cue, match) in enumerate(zip(current_source, matches)):
+            if match is None:
+                segments.append({'start': cue['start'], 'end': cue['end'], 'text': new_translations[i]})
+            else:
+                segments.append(dict(translation[match]))
+
+        stats = {
+            'total': len(current_source),
+            'reused': len(current_source) - len(changed),
+            'retranslated': len(changed)
+        }
+        return segments, stats
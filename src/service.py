@@ -0,0 +1,382 @@
+import os
+import json
+import time
+import uuid
+import queue
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from rich.console import Console
+from src.pipeline import translate_transcription
+
+console = Console()
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Events kept per job; older ones are dropped, so long jobs stay bounded
+MAX_JOB_EVENTS = 500
+
+# Finished jobs kept for status queries before the oldest are forgotten
+MAX_FINISHED_JOBS = 1000
+
+SUBTITLE_FORMATS = ('srt', 'vtt')
+
+class JobProgress:
+    def __init__(self, job):
+        """Stand-in for a rich Progress that turns updates into job events.
+
+        Args:
+            job (ServiceJob): Job receiving the events
+        """
+        self.job = job
+        self._task_ids = itertools.count(1)
+        self._tasks = {}
+
+    def add_task(self, description, total=100):
+        """Start tracking a task, mirroring Progress.add_task."""
+        task_id = next(self._task_ids)
+        self._tasks[task_id] = {'description': description, 'completed': 0.0, 'total': total}
+        self.job.emit('progress', task=task_id, description=description, percent=0.0)
+        return task_id
+
+    def update(self, task_id, advance=0, description=None):
+        """Record progress on a task, mirroring Progress.update."""
+        task = self._tasks.setdefault(task_id, {'description': '', 'completed': 0.0, 'total': 100})
+        task['completed'] = min(task['total'], task['completed'] + advance)
+        if description:
+            task['description'] = description
+        self.job.emit(
+            'progress',
+            task=task_id,
+            description=task['description'],
+            percent=round(100.0 * task['completed'] / task['total'], 1)
+        )
+
+class ServiceJob:
+    def __init__(self, input_path, output_path, language='en', format='srt', priority=0):
+        """A subtitle job submitted to the service.
+
+        Args:
+            input_path (str): Path to the video file, as seen by the service
+            output_path (str): Path of the subtitle file to write
+            language (str): Target language code
+            format (str): Output format ('srt' or 'vtt')
+            priority (int): Higher priorities run first
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.input_path = input_path
+        self.output_path = output_path
+        self.language = language
+        self.format = format
+        self.priority = priority
+        self.state = QUEUED
+        self.error = None
+        self.result = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        self.events_dropped = 0  # Events trimmed from the front of events
+        self._condition = threading.Condition()
+
+    def _append(self, event):
+        """Add an event, trimming the oldest past MAX_JOB_EVENTS. Called with the condition held."""
+        self.events.append(event)
+        excess = len(self.events) - MAX_JOB_EVENTS
+        if excess > 0:
+            del self.events[:excess]
+            self.events_dropped += excess
+        self._condition.notify_all()
+
+    def emit(self, event, **data):
+        """Append an event and wake up anyone streaming this job."""
+        with self._condition:
+            self._append(dict(data, event=event, time=time.time()))
+
+    def finish(self, state, event, **data):
+        """Set the final state and emit the final event in one step.
+
+        Streams stop once a job is finished and every event has been sent, so
+        the state must never be visible as finished before its event exists.
+        """
+        with self._condition:
+            self.state = state
+            self.finished_at = time.time()
+            self._append(dict(data, event=event, time=self.finished_at))
+
+    @property
+    def event_count(self):
+        """Events emitted so far, including trimmed ones."""
+        return self.events_dropped + len(self.events)
+
+    def wait_events(self, start, timeout=15):
+        """Block until there are events after index start or the job has finished.
+
+        Indexes count every event ever emitted; events already trimmed are skipped.
+
+        Returns:
+            tuple: (new events, possibly empty on timeout, index to continue from)
+        """
+        with self._condition:
+            if self.event_count <= start and self.state in (QUEUED, RUNNING):
+                self._condition.wait(timeout)
+            return self.events[max(0, start - self.events_dropped):], self.event_count
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED)
+
+    def to_dict(self):
+        """JSON-serializable job status."""
+        return {
+            'id': self.id,
+            'input': self.input_path,
+            'output': self.output_path,
+            'language': self.language,
+            'format': self.format,
+            'priority': self.priority,
+            'state': self.state,
+            'error': self.error,
+            'result': self.result,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+class SubtitleService:
+    def __init__(self, transcribers, translator, formatter, max_finished_jobs=MAX_FINISHED_JOBS):
+        """Keep models resident and process submitted jobs by priority.
+
+        Each transcriber gets its own worker thread, so the number of
+        transcribers is the number of jobs that run at once.
+
+        Args:
+            transcribers (list): Loaded WhisperTranscriber instances
+            translator (Translator): Configured translator, shared by all workers
+            formatter (SubtitleFormatter): Subtitle formatter
+            max_finished_jobs (int): Finished jobs remembered for status queries;
+                the oldest are forgotten beyond this
+        """
+        self.max_finished_jobs = max_finished_jobs
+        self.transcribers = transcribers
+        self.translator = translator
+        self.formatter = formatter
+        self.jobs = {}
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def start(self):
+        """Start one worker thread per transcriber."""
+        for transcriber in self.transcribers:
+            worker = threading.Thread(target=self._work, args=(transcriber,), daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, job):
+        """Queue a job.
+
+        Returns:
+            ServiceJob: The queued job
+        """
+        with self._lock:
+            self.jobs[job.id] = job
+            self._prune()
+        # Higher priority first, then first come first served
+        self._queue.put((-job.priority, next(self._sequence), job))
+        job.emit('queued', position=self._queue.qsize())
+        return job
+
+    def _prune(self):
+        """Forget the oldest finished jobs past max_finished_jobs. Called with the lock held."""
+        finished = [job for job in self.jobs.values() if job.finished]
+        excess = len(finished) - self.max_finished_jobs
+        if excess > 0:
+            for job in sorted(finished, key=lambda job: job.finished_at)[:excess]:
+                del self.jobs[job.id]
+
+    def get(self, job_id):
+        """Look up a job by id, or None."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        """All known jobs, newest first."""
+        with self._lock:
+            return sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def _work(self, transcriber):
+        """Worker loop: run queued jobs with a resident transcriber."""
+        while True:
+            _, _, job = self._queue.get()
+            self._run(job, transcriber)
+
+    def _run(self, job, transcriber):
+        """Process one job end to end."""
+        job.state = RUNNING
+        job.started_at = time.time()
+        job.emit('started')
+        progress = JobProgress(job)
+
+        try:
+            task1 = progress.add_task("Transcribing audio")
+            transcription = transcriber.transcribe(job.input_path, progress, task1)
+
+            task2 = progress.add_task("Translating")
+            text, segments = translate_transcription(
+                transcription, self.translator, job.language, progress=progress, task_id=task2
+            )
+
+            task3 = progress.add_task("Formatting subtitles")
+            self.formatter.format_subtitles(
+                text=text,
+                segments=segments,
+                output_path=job.output_path,
+                format=job.format,
+                progress=progress,
+                task_id=task3
+            )
+
+            job.result = {
+                'output': job.output_path,
+                'detected_language': transcription['language'],
+                'segments': len(segments)
+            }
+            job.finish(DONE, 'done', result=job.result, seconds=round(time.time() - job.started_at, 3))
+        except Exception as e:
+            job.error = str(e)
+            job.finish(FAILED, 'failed', error=job.error)
+            console.print(f"❌ [red]Job {job.id} failed: {job.error}[/red]")
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP API for the subtitle service.
+
+    POST /jobs               submit a job: {"input", "output", "language", "format", "priority"}
+    GET  /jobs               list jobs
+    GET  /jobs/<id>          job status and result
+    GET  /jobs/<id>/events   stream progress events as JSON lines until the job finishes
+    GET  /health             liveness check
+    """
+
+    server_version = "SubtitleGenerator"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+
+        if parts == ['health']:
+            self._send_json(200, {'status': 'ok', 'workers': len(self.service.transcribers)})
+        elif parts == ['jobs']:
+            self._send_json(200, [job.to_dict() for job in self.service.list()])
+        elif len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.service.get(parts[1])
+            if job is None:
+                self._send_json(404, {'error': f"Unknown job: {parts[1]}"})
+            elif len(parts) == 2:
+                self._send_json(200, job.to_dict())
+            elif parts[2] == 'events':
+                self._stream_events(job)
+            else:
+                self._send_json(404, {'error': 'Not found'})
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            input_path = request['input']
+            output_path = request['output']
+            priority = int(request.get('priority', 0))
+            format = request.get('format', 'srt')
+            if format not in SUBTITLE_FORMATS:
+                raise ValueError(f"format must be one of {', '.join(SUBTITLE_FORMATS)}")
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f"Invalid job request: {str(e)}"})
+            return
+
+        if not os.path.isfile(input_path):
+            self._send_json(400, {'error': f"Input file does not exist: {input_path}"})
+            return
+
+        job = self.service.submit(ServiceJob(
+            input_path,
+            output_path,
+            language=request.get('language', 'en'),
+            format=format,
+            priority=priority
+        ))
+        self._send_json(202, job.to_dict())
+
+    def _stream_events(self, job):
+        """Send events as newline-delimited JSON, closing the response when the job finishes."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        sent = 0
+        try:
+            while True:
+                events, sent = job.wait_events(sent)
+                for event in events:
+                    self.wfile.write((json.dumps(event) + '\n').encode('utf-8'))
+                self.wfile.flush()
+                # The final event is appended together with the finished state
+                if job.finished and sent >= job.event_count:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+def create_server(service, host='127.0.0.1', port=8765, socket_path=None):
+    """Create the HTTP server for a service.
+
+    Args:
+        service (SubtitleService): Running service
+        host (str): Interface to listen on for TCP
+        port (int): TCP port
+        socket_path (str, optional): Listen on this Unix socket instead of TCP
+
+    Returns:
+        socketserver.BaseServer: Server ready for serve_forever()
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, ServiceRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
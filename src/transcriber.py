@@ -5,7 +5,11 @@ from pydub import AudioSegment
 import tempfile
 import os
 import subprocess
+from contextlib import nullcontext
 from rich.console import Console
+from src.audio_buffer import AudioBuffer
+from src.audio_cache import is_cached_audio, open_cached_audio
+from src.vad import SpeechTimeline, detect_speech_regions, split_points
 
 console = Console()
 
@@ -28,6 +32,57 @@ def get_ffmpeg_path():
                 return path
         return 'ffmpeg'  # Default to just the command name
 
+def configure_ffmpeg():
+    """Point pydub at the FFmpeg binary."""
+    AudioSegment.converter = get_ffmpeg_path()
+
+def extract_audio(video_path):
+    """Extract 16kHz mono audio from a video file into a temporary WAV file.
+    
+    Args:
+        video_path (str): Path to the video file
+        
+    Returns:
+        str: Path to the temporary WAV file; the caller is responsible for removing it
+    """
+    try:
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
+            # Extract audio using pydub with specific parameters
+            audio = AudioSegment.from_file(video_path)
+            
+            # Convert to mono and set sample rate to 16kHz (Whisper's expected format)
+            audio = audio.set_channels(1)
+            audio = audio.set_frame_rate(16000)
+            
+            # Export with specific parameters
+            audio.export(
+                temp_audio.name, 
+                format='wav',
+                parameters=["-ac", "1", "-ar", "16000"]  # Mono, 16kHz
+            )
+            
+            return temp_audio.name
+    except Exception as e:
+        console.print(f"❌ [red]Error preprocessing audio: {str(e)}[/red]")
+        raise
+
+def decode_audio(video_path):
+    """Decode a video's audio track straight into an AudioBuffer, without a WAV file.
+    
+    Args:
+        video_path (str): Path to the video file
+        
+    Returns:
+        AudioBuffer: 16kHz mono float32 waveform
+    """
+    try:
+        audio = AudioSegment.from_file(video_path)
+        audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+        return AudioBuffer.from_pcm(audio.raw_data)
+    except Exception as e:
+        console.print(f"❌ [red]Error preprocessing audio: {str(e)}[/red]")
+        raise
+
 class WhisperTranscriber:
     def __init__(self, model_name='base', use_gpu=False):
         """Initialize the Whisper transcriber.
@@ -37,8 +92,12 @@ class WhisperTranscriber:
             use_gpu (bool): Whether to use GPU acceleration
         """
         # Set FFmpeg path for pydub
-        AudioSegment.converter = get_ffmpeg_path()
+        configure_ffmpeg()
         
+        self.profiler = None  # Optional StageProfiler
+        self.vad = False  # Skip non-speech audio before inference
+        self.audio_cache = None  # Optional AudioCache of decoded audio
+        self.stream_chunk_seconds = 120  # Chunk length when segments are streamed out
         self.device = "cuda" if use_gpu and torch.cuda.is_available() else "cpu"
         if use_gpu and torch.cuda.is_available():
             console.print("⚡ [green]GPU acceleration enabled![/green]")
@@ -83,130 +142,289 @@ class WhisperTranscriber:
         except Exception as e:
             raise Exception(f"Model test failed: {str(e)}")
     
+    def _profile(self, stage):
+        """Profile a step when a StageProfiler is attached."""
+        return self.profiler.stage(stage) if self.profiler is not None else nullcontext()
+    
+    def _torch_profile(self, stage):
+        """Run the torch profiler around a step when one is requested."""
+        return self.profiler.torch_stage(stage) if self.profiler is not None else nullcontext()
+    
     def _preprocess_audio(self, video_path):
         """Extract and preprocess audio from video file."""
+        return extract_audio(video_path)
+    
+    def load_buffer(self, audio_path, media_path=None):
+        """Load a WAV file or decoded-audio cache file as an AudioBuffer.
+        
+        Args:
+            audio_path (str): Path to the WAV file produced by _preprocess_audio,
+                or to a decoded-audio cache file
+            media_path (str, optional): Source media; with an audio cache attached,
+                the decoded waveform is stored for later runs. Also decoded
+                instead if a cache entry was evicted before it could be opened
+            
+        Returns:
+            AudioBuffer: 16kHz mono float32 waveform
+        """
+        if is_cached_audio(audio_path):
+            try:
+                audio = open_cached_audio(audio_path)
+            except FileNotFoundError:
+                if not media_path:
+                    raise
+                # Evicted, e.g. by another worker storing a file, since the lookup
+                console.print(f"⚠️ [yellow]Cached audio was evicted, decoding {media_path} again...[/yellow]")
+                buffer = decode_audio(media_path)
+            else:
+                # float32 entries are memory-mapped rather than allocated
+                return AudioBuffer(audio) if isinstance(audio, np.memmap) else AudioBuffer.decoded(audio)
+        else:
+            try:
+                # PCM WAVs are read in blocks straight into one float32 array
+                buffer = AudioBuffer.from_wav(audio_path)
+            except Exception:
+                console.print(f"⚠️ [yellow]Reading WAV directly failed, trying alternative method...[/yellow]")
+                try:
+                    buffer = AudioBuffer.decoded(whisper.load_audio(audio_path))
+                except Exception:
+                    # Try with librosa
+                    import librosa
+                    audio, sr = librosa.load(audio_path, sr=16000, mono=True)
+                    buffer = AudioBuffer.decoded(audio)
+        
+        if media_path and self.audio_cache is not None:
+            self.audio_cache.store(media_path, buffer.samples)
+        
+        return buffer
+    
+    def load_audio(self, audio_path, media_path=None):
+        """Load a 16kHz mono WAV file as a float32 waveform.
+        
+        Same as load_buffer, but returns the samples array.
+        
+        Returns:
+            np.ndarray: Audio samples in the range [-1, 1]
+        """
+        return self.load_buffer(audio_path, media_path).samples
+    
+    def _apply_vad(self, buffer):
+        """Cut a waveform down to its speech regions, in place when the buffer owns it.
+        
+        Args:
+            buffer (AudioBuffer): 16kHz mono float32 waveform
+            
+        Returns:
+            tuple: (the buffer holding only speech, SpeechTimeline mapping its times back);
+                both are empty when there is no speech
+        """
+        regions = detect_speech_regions(buffer.samples)
+        if not regions:
+            console.print("🔇 [cyan]VAD: no speech detected, nothing to transcribe[/cyan]")
+            return buffer.compact([]), SpeechTimeline([])
+        
+        timeline = SpeechTimeline(regions)
+        total_seconds = buffer.duration
+        skipped = 1 - timeline.speech_seconds / total_seconds if total_seconds else 0
+        console.print(
+            f"🔇 [cyan]VAD: {len(regions)} speech regions, skipping {skipped * 100:.0f}% of the audio "
+            f"(~{total_seconds / max(timeline.speech_seconds, 1e-3):.1f}x less to decode)[/cyan]"
+        )
+        return buffer.compact(regions), timeline
+    
+    def _decode(self, audio, language, initial_prompt=None):
+        """Run Whisper on a waveform, falling back to auto-detection on failure.
+        
+        Returns:
+            tuple: (Whisper result, language it was decoded as)
+        """
+        try:
+            result = self.model.transcribe(
+                audio,
+                language=language,
+                task="transcribe",
+                initial_prompt=initial_prompt,
+                verbose=False,  # Reduce verbosity
+                fp16=False  # Disable FP16 to avoid precision issues
+            )
+        except Exception as e:
+            console.print(f"⚠️ [yellow]Transcription with detected language failed, trying auto-detect...[/yellow]")
+            # Retry without specifying language
+            result = self.model.transcribe(
+                audio,
+                task="transcribe",
+                initial_prompt=initial_prompt,
+                verbose=False,
+                fp16=False
+            )
+            language = result.get('language', 'en')
+        return result, language
+    
+    def _decode_in_chunks(self, buffer, language, on_segments, timeline=None):
+        """Decode a waveform chunk by chunk, handing over segments as each chunk completes.
+        
+        Chunks are cut at quiet moments, and each chunk is prompted with the end
+        of the previous one so the text reads continuously across the cuts.
+        
+        Args:
+            buffer (AudioBuffer): 16kHz mono float32 waveform
+            language (str): Language to decode as
+            on_segments (callable): Called with (segments, language) after every chunk
+            timeline (SpeechTimeline, optional): Maps VAD-compacted times back
+            
+        Returns:
+            tuple: (result with 'text' and 'segments' for the whole waveform, language)
+        """
+        bounds = [0] + split_points(buffer.samples, self.stream_chunk_seconds) + [len(buffer)]
+        texts, segments = [], []
+        prompt = None
+        for start, end in zip(bounds, bounds[1:]):
+            result, language = self._decode(buffer.view(start, end), language, initial_prompt=prompt)
+            offset = start / 16000
+            chunk_segments = result.get('segments') or []
+            for segment in chunk_segments:
+                segment['id'] = len(segments)
+                segment['start'] += offset
+                segment['end'] += offset
+                for word in segment.get('words') or []:
+                    word['start'] += offset
+                    word['end'] += offset
+                segments.append(segment)
+            if timeline is not None:
+                timeline.remap_segments(chunk_segments)
+            
+            text = result.get('text') or ''
+            texts.append(text)
+            prompt = text[-200:] or None
+            if chunk_segments:
+                on_segments(chunk_segments, language)
+        
+        return {'text': ''.join(texts), 'segments': segments}, language
+    
+    def _no_speech(self, buffer, duration):
+        """Empty transcript for a file without speech.
+
+        Silent files get an empty subtitle file rather than a failed job,
+        whether VAD or Whisper found nothing. The language is None, since
+        there was nothing to detect it from.
+        """
+        return {
+            'text': '',
+            'segments': [],
+            'language': None,
+            'duration': duration,
+            'speech_seconds': 0.0,
+            'audio_allocations': len(buffer.allocations),
+            'audio_allocated_bytes': buffer.allocated_bytes
+        }
+    
+    def transcribe_audio(self, audio, progress=None, task_id=None, on_segments=None):
+        """Detect the language of a waveform and transcribe it.
+        
+        Args:
+            audio (AudioBuffer or np.ndarray): 16kHz mono float32 waveform; an
+                AudioBuffer from load_buffer or decode_audio may be compacted in place
+            progress (Progress, optional): Rich progress instance
+            task_id: Task ID for progress tracking
+            on_segments (callable, optional): Decode in chunks of stream_chunk_seconds
+                and call this with (segments, language) as each chunk completes
+            
+        Returns:
+            dict: Transcription results including text, segments, and detected language
+        """
+        buffer = audio if isinstance(audio, AudioBuffer) else AudioBuffer.from_array(audio)
+        duration = buffer.duration
+        timeline = None
+        if self.vad:
+            with self._profile('vad'):
+                buffer, timeline = self._apply_vad(buffer)
+            if not timeline.speech_seconds:
+                return self._no_speech(buffer, duration)
+        
+        if progress and task_id:
+            progress.update(task_id, advance=20, description="🔍 [cyan]Detecting language...")
+        
+        # Detect language with error handling
         try:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                # Extract audio using pydub with specific parameters
-                audio = AudioSegment.from_file(video_path)
-                
-                # Convert to mono and set sample rate to 16kHz (Whisper's expected format)
-                audio = audio.set_channels(1)
-                audio = audio.set_frame_rate(16000)
-                
-                # Export with specific parameters
-                audio.export(
-                    temp_audio.name, 
-                    format='wav',
-                    parameters=["-ac", "1", "-ar", "16000"]  # Mono, 16kHz
-                )
-                
-                return temp_audio.name
+            with self._profile('language_detection'):
+                # A view of the first 30 seconds instead of pad_or_trim's copy
+                mel = whisper.log_mel_spectrogram(buffer.window()).to(self.device)
+                _, probs = self.model.detect_language(mel)
+            detected_language = max(probs, key=probs.get)
         except Exception as e:
-            console.print(f"❌ [red]Error preprocessing audio: {str(e)}[/red]")
-            raise
+            console.print(f"⚠️ [yellow]Language detection failed, defaulting to English: {str(e)}[/yellow]")
+            detected_language = 'en'
+        
+        if progress and task_id:
+            progress.update(task_id, advance=20, description="🎙️ [cyan]Converting speech to text...")
+        
+        # Transcribe with enhanced error handling
+        with self._profile('decoding'), self._torch_profile('decoding'):
+            if on_segments is not None:
+                result, detected_language = self._decode_in_chunks(buffer, detected_language, on_segments, timeline)
+            else:
+                result, detected_language = self._decode(buffer.samples, detected_language)
+        
+        if progress and task_id:
+            progress.update(task_id, advance=30, description="✨ [cyan]Finalizing transcription...")
+        
+        # Whisper found nothing to say, the same outcome as VAD finding no speech
+        if not (result.get('text') or '').strip() or not result.get('segments'):
+            console.print("🔇 [yellow]Transcription is empty, no speech detected[/yellow]")
+            return self._no_speech(buffer, duration)
+        
+        if timeline is not None and on_segments is None:
+            timeline.remap_segments(result['segments'])
+        
+        console.print(f"✅ [green]Transcription completed! Language: {detected_language}[/green]")
+        
+        return {
+            'text': result['text'],
+            'segments': result['segments'],
+            'language': detected_language,
+            'duration': duration,  # Seconds of audio processed
+            'speech_seconds': timeline.speech_seconds if timeline is not None else duration,
+            'audio_allocations': len(buffer.allocations),  # Waveform arrays allocated for this file
+            'audio_allocated_bytes': buffer.allocated_bytes
+        }
     
-    def transcribe(self, video_path, progress=None, task_id=None):
+    def transcribe(self, video_path, progress=None, task_id=None, on_segments=None):
         """Transcribe audio from a video file.
         
         Args:
             video_path (str): Path to the video file
             progress (Progress, optional): Rich progress instance
             task_id: Task ID for progress tracking
+            on_segments (callable, optional): Called with (segments, language) as
+                chunks of the file finish decoding
             
         Returns:
             dict: Transcription results including text, segments, and detected language
         """
-        audio_path = None
         try:
+            cached_path = self.audio_cache.lookup(video_path) if self.audio_cache is not None else None
+            if cached_path:
+                console.print("♻️ [cyan]Using cached decoded audio, skipping extraction[/cyan]")
+                with self._profile('load_audio'):
+                    buffer = self.load_buffer(cached_path, video_path)
+                return self.transcribe_audio(buffer, progress, task_id, on_segments)
+            
             # Update progress
             if progress and task_id:
                 progress.update(task_id, advance=10, description="🎵 [cyan]Extracting audio...")
             
-            # Preprocess audio
-            audio_path = self._preprocess_audio(video_path)
+            # Decode in memory; no WAV file is written and read back
+            with self._profile('extraction'):
+                buffer = decode_audio(video_path)
             
             if progress and task_id:
                 progress.update(task_id, advance=20, description="📊 [cyan]Processing audio waveform...")
             
-            # Load audio using whisper's load_audio function with proper error handling
-            try:
-                audio = whisper.load_audio(audio_path)
-            except Exception as e:
-                console.print(f"⚠️ [yellow]Whisper load_audio failed, trying alternative method...[/yellow]")
-                # Alternative: load audio manually
-                from scipy.io import wavfile
-                import librosa
-                
-                try:
-                    # Try with librosa
-                    audio, sr = librosa.load(audio_path, sr=16000, mono=True)
-                    audio = audio.astype(np.float32)
-                except:
-                    # Try with scipy
-                    sr, audio = wavfile.read(audio_path)
-                    if sr != 16000:
-                        import scipy.signal
-                        audio = scipy.signal.resample(audio, int(len(audio) * 16000 / sr))
-                    audio = audio.astype(np.float32) / 32768.0  # Normalize
-            
-            if progress and task_id:
-                progress.update(task_id, advance=20, description="🔍 [cyan]Detecting language...")
-            
-            # Detect language with error handling
-            try:
-                audio_segment = whisper.pad_or_trim(audio)
-                mel = whisper.log_mel_spectrogram(audio_segment).to(self.device)
-                _, probs = self.model.detect_language(mel)
-                detected_language = max(probs, key=probs.get)
-            except Exception as e:
-                console.print(f"⚠️ [yellow]Language detection failed, defaulting to English: {str(e)}[/yellow]")
-                detected_language = 'en'
-            
-            if progress and task_id:
-                progress.update(task_id, advance=20, description="🎙️ [cyan]Converting speech to text...")
-            
-            # Transcribe with enhanced error handling
-            try:
-                result = self.model.transcribe(
-                    audio,
-                    language=detected_language,
-                    task="transcribe",
-                    verbose=False,  # Reduce verbosity
-                    fp16=False  # Disable FP16 to avoid precision issues
-                )
-            except Exception as e:
-                console.print(f"⚠️ [yellow]Transcription with detected language failed, trying auto-detect...[/yellow]")
-                # Retry without specifying language
-                result = self.model.transcribe(
-                    audio,
-                    task="transcribe",
-                    verbose=False,
-                    fp16=False
-                )
-                detected_language = result.get('language', 'en')
-            
-            if progress and task_id:
-                progress.update(task_id, advance=30, description="✨ [cyan]Finalizing transcription...")
-            
-            # Clean up temporary file
-            if audio_path and os.path.exists(audio_path):
-                os.unlink(audio_path)
-            
-            # Validate results
-            if not result.get('text') or not result.get('segments'):
-                raise Exception("Transcription returned empty results")
-            
-            console.print(f"✅ [green]Transcription completed! Language: {detected_language}[/green]")
+            if self.audio_cache is not None:
+                self.audio_cache.store(video_path, buffer.samples)
             
-            return {
-                'text': result['text'],
-                'segments': result['segments'],
-                'language': detected_language
-            }
+            return self.transcribe_audio(buffer, progress, task_id, on_segments)
             
         except Exception as e:
-            if audio_path and os.path.exists(audio_path):
-                os.unlink(audio_path)
             console.print(f"❌ [red]Transcription failed: {str(e)}[/red]")
             raise Exception(f"Transcription failed: {str(e)}") 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from deep_translator import GoogleTranslator, MyMemoryTranslator, LibreTranslator
 import re
-from time import sleep
+from time import sleep, perf_counter
 from rich.console import Console
 
 console = Console()
@@ -120,6 +120,23 @@ LANGUAGE_CODES = {
     'zu': 'zulu'
 }
 
+# Translation backends by service name. Each factory is called with source and
+# target language names and returns an object with a translate(text) method.
+TRANSLATION_SERVICES = {
+    'google': GoogleTranslator,
+    'mymemory': MyMemoryTranslator
+}
+
+def register_translation_service(name, factory):
+    """Make an additional translation backend available to Translator.
+    
+    Args:
+        name (str): Service name, usable in Translator.translation_services
+        factory (callable): Called as factory(source=..., target=...) and returning
+            an object with a translate(text) method
+    """
+    TRANSLATION_SERVICES[name] = factory
+
 class Translator:
     def __init__(self):
         """Initialize the translator with multiple services for better accuracy."""
@@ -129,6 +146,8 @@ class Translator:
         self.chunk_size = 3000
         self.context_aware = True
         self.quality_mode = 'balanced'
+        self.verbose = True  # Per-chunk console output
+        self.metrics = None  # Optional MetricsRecorder
         console.print("🌐 [green]Translation service initialized with multiple engines![/green]")
     
     def configure_quality(self, quality_mode='balanced', chunk_size=3000, context_aware=True):
@@ -215,19 +234,14 @@ class Translator:
             source = self._get_language_code(source_lang)
             target = self._get_language_code(target_lang)
             
-            if service == 'google':
-                translator = GoogleTranslator(
-                    source=source if source != 'auto' else 'auto',
-                    target=target
-                )
-            elif service == 'mymemory':
-                translator = MyMemoryTranslator(
-                    source=source if source != 'auto' else 'auto',
-                    target=target
-                )
-            else:
+            if service not in TRANSLATION_SERVICES:
                 raise Exception(f"Unknown translation service: {service}")
             
+            translator = TRANSLATION_SERVICES[service](
+                source=source if source != 'auto' else 'auto',
+                target=target
+            )
+            
             result = translator.translate(text)
             
             if not result or result.strip() == "":
@@ -241,20 +255,33 @@ class Translator:
     def _translate_chunk(self, text, source_lang=None, target_lang='en', retries=0):
         """Translate a chunk of text with multiple service fallback and retry logic."""
         for service in self.translation_services:
+            started = perf_counter()
+            outcome = 'error'
             try:
-                console.print(f"🔄 [cyan]Translating with {service.title()}...[/cyan]")
+                if self.verbose:
+                    console.print(f"🔄 [cyan]Translating with {service.title()}...[/cyan]")
                 result = self._translate_with_service(text, source_lang, target_lang, service)
                 
                 # Validate translation quality
                 if self._validate_translation(text, result, source_lang, target_lang):
+                    outcome = 'ok'
                     return result
                 else:
-                    console.print(f"⚠️ [yellow]Translation quality check failed for {service}[/yellow]")
+                    outcome = 'rejected'
+                    if self.verbose:
+                        console.print(f"⚠️ [yellow]Translation quality check failed for {service}[/yellow]")
                     continue
                     
             except Exception as e:
-                console.print(f"⚠️ [yellow]{service.title()} failed: {str(e)}[/yellow]")
+                if self.verbose:
+                    console.print(f"⚠️ [yellow]{service.title()} failed: {str(e)}[/yellow]")
                 continue
+            finally:
+                if self.metrics is not None:
+                    self.metrics.observe('translation_request_seconds', perf_counter() - started, service=service)
+                    self.metrics.increment('translation_requests_total', service=service, outcome=outcome)
+                    if retries > 0:
+                        self.metrics.increment('translation_retries_total', service=service)
         
         # If all services failed, retry with exponential backoff
         if retries < self.max_retries:
@@ -304,6 +331,66 @@ class Translator:
         
         return text
     
+    def _pack_lines(self, lines, max_length=None):
+        """Group lines into newline-joined batches that fit in one request."""
+        if max_length is None:
+            max_length = self.chunk_size
+        
+        batches = []
+        current = []
+        current_len = 0
+        for line in lines:
+            if current and current_len + len(line) + 1 > max_length:
+                batches.append(current)
+                current = []
+                current_len = 0
+            current.append(line)
+            current_len += len(line) + 1
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    def translate_lines(self, lines, source_lang='auto', target_lang='en'):
+        """Translate a list of independent lines, keeping a one-to-one mapping.
+        
+        Lines are packed into as few requests as the chunk size allows. If a
+        service does not preserve the line breaks of a batch, that batch is
+        translated line by line instead.
+        
+        Args:
+            lines (list): Lines of text to translate
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+            
+        Returns:
+            list: Translated lines, in the same order as the input
+        """
+        if source_lang == target_lang:
+            return list(lines)
+        
+        # Line breaks are the batch separator, so flatten each line and leave blanks untouched
+        flattened = [' '.join(line.split()) for line in lines]
+        pending = [line for line in flattened if line]
+        
+        translated = []
+        for batch in self._pack_lines(pending):
+            result = self._translate_chunk('\n'.join(batch), source_lang, target_lang)
+            parts = [part for part in result.split('\n') if part.strip()]
+            
+            if len(parts) != len(batch):
+                console.print(f"⚠️ [yellow]Line structure lost in batch of {len(batch)}, translating lines individually...[/yellow]")
+                parts = [self._translate_chunk(line, source_lang, target_lang) for line in batch]
+            
+            translated.extend(self._post_process_translation(part, target_lang) for part in parts)
+            
+            # Brief pause to avoid rate limiting
+            sleep(0.1)
+        
+        results = iter(translated)
+        return [next(results) if line else line for line in flattened]
+    
     def translate(self, text, source_lang='auto', target_lang='en', progress=None, task_id=None):
         """Translate text to target language with enhanced accuracy."""
         if progress and task_id:
@@ -318,15 +405,17 @@ class Translator:
         
         try:
             # Log translation attempt
-            console.print(f"\n📝 [cyan]Text length: {len(text)} characters[/cyan]")
-            console.print(f"🌐 [cyan]Translating from '{source_lang}' to '{target_lang}'[/cyan]")
-            console.print(f"⚙️ [cyan]Quality mode: {self.quality_mode} | Chunk size: {self.chunk_size}[/cyan]")
+            if self.verbose:
+                console.print(f"\n📝 [cyan]Text length: {len(text)} characters[/cyan]")
+                console.print(f"🌐 [cyan]Translating from '{source_lang}' to '{target_lang}'[/cyan]")
+                console.print(f"⚙️ [cyan]Quality mode: {self.quality_mode} | Chunk size: {self.chunk_size}[/cyan]")
             
             # Smart text splitting for better context preservation
             chunks = self._smart_split_text(text, max_length=self.chunk_size)
             total_chunks = len(chunks)
             
-            console.print(f"📚 [cyan]Split into {total_chunks} intelligent chunks[/cyan]")
+            if self.verbose:
+                console.print(f"📚 [cyan]Split into {total_chunks} intelligent chunks[/cyan]")
             
             if progress and task_id:
                 progress.update(task_id, advance=5, description=f"📚 [yellow]Processing {total_chunks} chunks...")
@@ -372,7 +461,8 @@ class Translator:
             final_text = ' '.join(translated_chunks)
             final_text = self._post_process_translation(final_text, target_lang)
             
-            console.print(f"✨ [green]Translation completed successfully! ({len(final_text)} characters)[/green]")
+            if self.verbose:
+                console.print(f"✨ [green]Translation completed successfully! ({len(final_text)} characters)[/green]")
             return final_text
             
         except Exception as e:
@@ -1,4 +1,5 @@
 import os
+import sys
 import logging
 from rich.logging import RichHandler
 from rich.console import Console
@@ -46,6 +47,20 @@ def validate_input(args):
         console.print("❌ [red]Error: --output_dir must be provided when using --input_dir[/red]")
         return False
     
+    # Incremental re-translation works on subtitle files only
+    if args.retranslate:
+        if args.input_dir:
+            console.print("❌ [red]Error: --retranslate works on a single --input subtitle file[/red]")
+            return False
+        
+        for option, path in (('--previous-source', args.previous_source), ('--translation', args.translation)):
+            if not path:
+                console.print(f"❌ [red]Error: {option} must be provided when using --retranslate[/red]")
+                return False
+            if not os.path.isfile(path):
+                console.print(f"❌ [red]Error: {option} file does not exist: {path}[/red]")
+                return False
+    
     # Validate input file existence
     if args.input and not os.path.isfile(args.input):
         console.print(f"❌ [red]Error: Input file does not exist: {args.input}[/red]")
@@ -71,4 +86,36 @@ def create_output_dir(directory):
             os.makedirs(directory, exist_ok=True)
             console.print(f"📁 [green]Created output directory: {directory}[/green]")
         except Exception as e:
-            console.print(f"❌ [red]Error creating output directory: {str(e)}[/red]") 
\ No newline at end of file
+            console.print(f"❌ [red]Error creating output directory: {str(e)}[/red]") 
+
+def get_rss_bytes(pid=None):
+    """Current resident set size of this process, or of another one.
+    
+    Args:
+        pid (int, optional): Process to measure instead of this one
+        
+    Returns:
+        int: RSS in bytes; falls back to the peak RSS where /proc is unavailable
+            (0 for other processes)
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        if pid is not None:
+            return 0
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+def format_duration(seconds):
+    """Format a number of seconds as e.g. '1h 02m', '3m 15s' or '42s'."""
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
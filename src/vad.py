@@ -0,0 +1,181 @@
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+def frame_energy_db(audio, frame_length):
+    """RMS energy of consecutive non-overlapping frames, in dB.
+
+    Args:
+        audio (np.ndarray): Mono waveform
+        frame_length (int): Samples per frame
+
+    Returns:
+        np.ndarray: One value per frame; a trailing partial frame is included
+    """
+    frames = -(-len(audio) // frame_length)
+    if frames == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    full = len(audio) // frame_length * frame_length
+    # Reshape is a view and einsum sums the squares frame by frame, so only
+    # the per-frame results are allocated
+    frames_view = audio[:full].reshape(-1, frame_length)
+    power = np.einsum('ij,ij->i', frames_view, frames_view) / frame_length
+    if full < len(audio):
+        tail = audio[full:]
+        power = np.append(power, np.dot(tail, tail) / len(tail))
+    return 10.0 * np.log10(power + 1e-10)
+
+def _runs(mask):
+    """Start and end indices (end exclusive) of the True runs in a boolean array."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+def _fill(length, starts, ends):
+    """Boolean array of the given length that is True inside each [start, end) run."""
+    marks = np.zeros(length + 1, dtype=np.int32)
+    np.add.at(marks, starts, 1)
+    np.add.at(marks, ends, -1)
+    return np.cumsum(marks[:-1]) > 0
+
+def detect_speech_regions(audio, sample_rate=SAMPLE_RATE, frame_ms=30, margin_db=12.0,
+                          min_speech_ms=250, min_silence_ms=500, padding_ms=300):
+    """Find the regions of a waveform that contain speech-level energy.
+
+    The threshold adapts to each file: frames louder than the noise floor
+    (10th energy percentile) by margin_db count as speech. Short pauses inside
+    speech are bridged, short blips are dropped and every region is padded so
+    word onsets and endings aren't cut.
+
+    Args:
+        audio (np.ndarray): 16kHz mono float32 waveform
+        sample_rate (int): Sample rate in Hz
+        frame_ms (int): Analysis frame length
+        margin_db (float): Required level above the noise floor
+        min_speech_ms (int): Shorter speech runs are discarded
+        min_silence_ms (int): Shorter pauses are treated as speech
+        padding_ms (int): Audio kept before and after each region
+
+    Returns:
+        list: (start_sample, end_sample) tuples, sorted and non-overlapping
+    """
+    frame_length = max(1, sample_rate * frame_ms // 1000)
+    energy = frame_energy_db(audio, frame_length)
+    if len(energy) == 0:
+        return []
+
+    floor, loud = np.percentile(energy, [10, 90])
+    if loud - floor < margin_db:
+        # No contrast between quiet and loud frames: all speech, or all silence
+        return [(0, len(audio))] if loud > -50.0 else []
+
+    speech = energy > floor + margin_db
+
+    # Bridge pauses shorter than min_silence_ms (leading and trailing silence stays)
+    starts, ends = _runs(~speech)
+    short = ((ends - starts) < min_silence_ms // frame_ms) & (starts > 0) & (ends < len(speech))
+    speech |= _fill(len(speech), starts[short], ends[short])
+
+    # Drop speech runs shorter than min_speech_ms
+    starts, ends = _runs(speech)
+    keep = (ends - starts) >= max(1, min_speech_ms // frame_ms)
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return []
+
+    padding = sample_rate * padding_ms // 1000
+    sample_starts = np.maximum(starts * frame_length - padding, 0)
+    sample_ends = np.minimum(ends * frame_length + padding, len(audio))
+
+    # Merge regions whose padding overlaps
+    regions = [[int(sample_starts[0]), int(sample_ends[0])]]
+    for start, end in zip(sample_starts[1:], sample_ends[1:]):
+        if start <= regions[-1][1]:
+            regions[-1][1] = max(regions[-1][1], int(end))
+        else:
+            regions.append([int(start), int(end)])
+    return [tuple(region) for region in regions]
+
+def split_points(audio, chunk_seconds, sample_rate=SAMPLE_RATE, search_seconds=5.0, frame_ms=30):
+    """Cut points that split a waveform into chunks of about chunk_seconds.
+
+    Each cut is moved to the quietest frame within search_seconds of its
+    nominal position, so words are rarely split between chunks.
+
+    Args:
+        audio (np.ndarray): Mono waveform
+        chunk_seconds (float): Target chunk length
+        sample_rate (int): Sample rate in Hz
+        search_seconds (float): How far a cut may move to find a quiet frame
+        frame_ms (int): Analysis frame length
+
+    Returns:
+        list: Increasing sample offsets, not including 0 and len(audio)
+    """
+    chunk = int(chunk_seconds * sample_rate)
+    search = int(search_seconds * sample_rate)
+    frame_length = max(1, sample_rate * frame_ms // 1000)
+
+    points = []
+    position = 0
+    # Don't leave a final chunk shorter than the search window
+    while len(audio) - position > chunk + search:
+        low = position + chunk - search
+        energy = frame_energy_db(audio[low:low + 2 * search], frame_length)
+        position = low + int(np.argmin(energy)) * frame_length + frame_length // 2
+        points.append(position)
+    return points
+
+class SpeechTimeline:
+    def __init__(self, regions, sample_rate=SAMPLE_RATE):
+        """Map times in speech-only audio back to the original timeline.
+
+        Args:
+            regions (list): (start_sample, end_sample) tuples from detect_speech_regions
+            sample_rate (int): Sample rate in Hz
+        """
+        self.sample_rate = sample_rate
+        self.original_starts = np.array([start for start, _ in regions], dtype=np.float64) / sample_rate
+        lengths = np.array([end - start for start, end in regions], dtype=np.float64) / sample_rate
+        self.compact_starts = np.concatenate(([0.0], np.cumsum(lengths)[:-1]))
+        self.speech_seconds = float(lengths.sum())
+
+    def to_original(self, times, side='right'):
+        """Convert compact-audio times to original times.
+
+        Args:
+            times (array-like): Times in the speech-only audio
+            side (str): 'right' maps a time on a region boundary to the later
+                region (for start times), 'left' to the earlier one (for end times)
+
+        Returns:
+            np.ndarray: Times in the original audio
+        """
+        times = np.asarray(times, dtype=np.float64)
+        index = np.searchsorted(self.compact_starts, times, side=side) - 1
+        index = np.clip(index, 0, len(self.compact_starts) - 1)
+        return self.original_starts[index] + (times - self.compact_starts[index])
+
+    def remap_segments(self, segments):
+        """Rewrite segment (and word) timestamps in place onto the original timeline."""
+        for segment in segments:
+            segment['start'] = float(self.to_original(segment['start']))
+            segment['end'] = float(self.to_original(segment['end'], side='left'))
+            for word in segment.get('words') or []:
+                word['start'] = float(self.to_original(word['start']))
+                word['end'] = float(self.to_original(word['end'], side='left'))
+        return segments
+
+def extract_speech(audio, regions):
+    """Concatenate the speech regions of a waveform.
+
+    Args:
+        audio (np.ndarray): Original waveform
+        regions (list): (start_sample, end_sample) tuples
+
+    Returns:
+        np.ndarray: Speech-only waveform
+    """
+    if len(regions) == 1 and regions[0] == (0, len(audio)):
+        return audio
+    return np.concatenate([audio[start:end] for start, end in regions])
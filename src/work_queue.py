@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import socket
+import hashlib
+import threading
+
+CLAIMED = 'claimed'
+HELD = 'held'
+FINISHED = 'finished'
+
+def default_node_id():
+    """Host name plus process id, unique among nodes sharing a queue."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueue:
+    def __init__(self, directory, node_id=None, lease_ttl=120.0, poll_interval=5.0):
+        """Lease-based work queue on a shared filesystem.
+
+        Several nodes can drain the same batch: each file is claimed by creating
+        a lease file exclusively, and the holder keeps the lease alive by
+        touching it from a heartbeat thread. A lease not touched for lease_ttl
+        seconds belongs to a crashed node and is taken over. Finished files get
+        a marker so no node picks them up again, and every outcome is appended
+        to a results journal shared by all nodes.
+
+        Lock files are used rather than SQLite because SQLite locking is not
+        reliable on network filesystems. Use a fresh directory for each batch.
+
+        Args:
+            directory (str): Queue directory on storage shared by all nodes
+            node_id (str, optional): Name of this node, defaults to host-pid
+            lease_ttl (float): Seconds without a heartbeat before a lease expires
+            poll_interval (float): Seconds between checks for files leased elsewhere
+        """
+        self.directory = directory
+        self.node_id = node_id or default_node_id()
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self.results_path = os.path.join(directory, 'results.jsonl')
+        self.claimed = 0
+        self.reclaimed = 0
+        self._leases_dir = os.path.join(directory, 'leases')
+        self._done_dir = os.path.join(directory, 'done')
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = None
+        os.makedirs(self._leases_dir, exist_ok=True)
+        os.makedirs(self._done_dir, exist_ok=True)
+
+    def _name(self, key):
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _lease_path(self, key):
+        return os.path.join(self._leases_dir, self._name(key) + '.lease')
+
+    def _done_path(self, key):
+        return os.path.join(self._done_dir, self._name(key))
+
+    def _create_lease(self, key):
+        """Create the lease file if nobody holds it. Returns True on success."""
+        try:
+            fd = os.open(self._lease_path(key), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'node': self.node_id, 'claimed_at': time.time()}, f)
+        return True
+
+    def _expired(self, path):
+        try:
+            return time.time() - os.stat(path).st_mtime > self.lease_ttl
+        except FileNotFoundError:
+            return True
+
+    def _take_over(self, key):
+        """Remove an expired lease so it can be claimed. Returns True if it was removed."""
+        path = self._lease_path(key)
+        if not self._expired(path):
+            return False
+
+        # Only one node's rename of the expired lease succeeds
+        stale_path = f"{path}.{self.node_id}.stale"
+        try:
+            os.rename(path, stale_path)
+        except FileNotFoundError:
+            return True
+
+        if not self._expired(stale_path):
+            # Another node took the lease over between our check and the rename;
+            # put its fresh lease back unless yet another claim appeared
+            try:
+                os.link(stale_path, path)
+            except FileExistsError:
+                pass
+            os.unlink(stale_path)
+            return False
+
+        os.unlink(stale_path)
+        return True
+
+    def try_claim(self, key):
+        """Try to lease a file for this node.
+
+        Returns:
+            str: CLAIMED, HELD (leased by another live node) or FINISHED
+        """
+        if os.path.exists(self._done_path(key)):
+            return FINISHED
+
+        claimed = self._create_lease(key)
+        if not claimed and self._take_over(key):
+            claimed = self._create_lease(key)
+            if claimed:
+                self.reclaimed += 1
+        if not claimed:
+            return HELD
+
+        # The file may have finished between the done check and the claim
+        if os.path.exists(self._done_path(key)):
+            os.unlink(self._lease_path(key))
+            return FINISHED
+
+        with self._lock:
+            self._held.add(key)
+            self.claimed += 1
+        self._start_heartbeat()
+        return CLAIMED
+
+    def claim_jobs(self, jobs, on_skip=None, yield_idle=False):
+        """Yield the jobs this node wins, in order, until every job is finished somewhere.
+
+        Jobs leased by other nodes are revisited every poll_interval seconds,
+        so work of a node that crashed is picked up once its lease expires.
+
+        Args:
+            jobs (iterable): BatchJob objects, identified by rel_path
+            on_skip (callable, optional): Called with each job finished by another node
+            yield_idle (bool): Yield None before waiting for leased jobs, so the
+                consumer can serve its own retries instead of blocking on other
+                nodes (which may in turn be waiting on this node's leases)
+        """
+        pending = list(jobs)
+        while pending:
+            waiting = []
+            for job in pending:
+                state = self.try_claim(job.rel_path)
+                if state == CLAIMED:
+                    yield job
+                elif state == HELD:
+                    waiting.append(job)
+                elif on_skip is not None:
+                    on_skip(job)
+            pending = waiting
+            if pending and yield_idle:
+                yield None
+            if pending and self._stop.wait(self.poll_interval):
+                return
+
+    def complete(self, key, status, error=None, attempts=1, timings=None):
+        """Record a final outcome, mark the file finished and release its lease.
+
+        Args:
+            key (str): Job key
+            status (str): 'done' or 'failed'
+            error (str, optional): Last error for failed files
+            attempts (int): Attempts it took on this node
+            timings (dict, optional): Seconds spent per stage
+        """
+        record = {
+            'key': key,
+            'node': self.node_id,
+            'status': status,
+            'attempts': attempts,
+            'error': error,
+            'timings': {stage: round(seconds, 6) for stage, seconds in (timings or {}).items()},
+            'finished_at': time.time()
+        }
+        line = (json.dumps(record) + '\n').encode('utf-8')
+        # One write per record with O_APPEND, so lines from different nodes don't interleave
+        fd = os.open(self.results_path, os.O_CREAT | os.O_APPEND | os.O_WRONLY, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+        with open(self._done_path(key), 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        self.release(key)
+
+    def release(self, key):
+        """Give up a lease without finishing the file."""
+        with self._lock:
+            self._held.discard(key)
+        try:
+            os.unlink(self._lease_path(key))
+        except FileNotFoundError:
+            pass
+
+    def results(self):
+        """Every outcome in the shared results journal, in order of completion."""
+        try:
+            with open(self.results_path, 'r', encoding='utf-8') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _start_heartbeat(self):
+        with self._lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(target=self._beat, daemon=True)
+            self._heartbeat.start()
+
+    def _beat(self):
+        while not self._stop.wait(self.lease_ttl / 4):
+            with self._lock:
+                held = list(self._held)
+            for key in held:
+                try:
+                    os.utime(self._lease_path(key))
+                except FileNotFoundError:
+                    # Lost to another node after missing heartbeats; it will redo the file
+                    pass
+
+    def close(self):
+        """Stop the heartbeat and release leases still held, e.g. after Ctrl+C."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        with self._lock:
+            held = list(self._held)
+        for key in held:
+            self.release(key)
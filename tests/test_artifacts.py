@@ -0,0 +1,48 @@
+"""
+Tests for the segment artifacts exchanged by stage-separated runs.
+"""
+
+import json
+
+import pytest
+
+from src.artifacts import ARTIFACT_VERSION, read_artifact, write_artifact
+
+TRANSCRIPTION = {
+    'text': ' Hello there. General Kenobi.',
+    'segments': [
+        {'id': 0, 'start': 0.0, 'end': 1.23456, 'text': ' Hello there.', 'tokens': [1, 2], 'avg_logprob': -0.2},
+        {'id': 1, 'start': 1.5, 'end': 3.0, 'text': ' General Kenobi.', 'tokens': [3], 'avg_logprob': -0.1}
+    ],
+    'language': 'en',
+    'duration': 3.5
+}
+
+def test_round_trip_keeps_only_what_later_stages_need(tmp_path):
+    """Segments come back with text, timing and language; decoder internals are dropped."""
+    path = str(tmp_path / "clip.segments.jsonl")
+    write_artifact(path, TRANSCRIPTION, 'transcribe', source='clip.mp4', model='base')
+
+    loaded = read_artifact(path)
+    assert loaded['text'] == TRANSCRIPTION['text']
+    assert loaded['language'] == loaded['source_language'] == 'en'
+    assert loaded['duration'] == 3.5
+    assert loaded['segments'][0] == {'id': 0, 'start': 0.0, 'end': 1.235, 'text': ' Hello there.'}
+    assert loaded['artifact']['stage'] == 'transcribe'
+    assert loaded['artifact']['model'] == 'base'
+
+def test_truncated_and_newer_artifacts_are_rejected(tmp_path):
+    """Incomplete files and unknown future versions fail loudly."""
+    path = tmp_path / "clip.segments.jsonl"
+    write_artifact(str(path), TRANSCRIPTION, 'transcribe')
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    path.write_text('\n'.join(lines[:-1]) + '\n', encoding='utf-8')
+    with pytest.raises(ValueError, match="truncated"):
+        read_artifact(str(path))
+
+    header = json.loads(lines[0])
+    header['version'] = ARTIFACT_VERSION + 1
+    path.write_text('\n'.join([json.dumps(header)] + lines[1:]) + '\n', encoding='utf-8')
+    with pytest.raises(ValueError, match="newer version"):
+        read_artifact(str(path))
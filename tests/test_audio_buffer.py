@@ -0,0 +1,44 @@
+"""
+Tests for the zero-copy audio buffer.
+"""
+
+import numpy as np
+
+from src.audio_buffer import WINDOW_SAMPLES, AudioBuffer
+
+def test_pcm_is_decoded_once_and_handed_out_as_views():
+    """PCM becomes one float32 allocation; windows and slices share its memory."""
+    pcm = (np.sin(np.arange(40 * 16000) / 50) * 20000).astype(np.int16)
+    buffer = AudioBuffer.from_pcm(pcm.tobytes())
+
+    np.testing.assert_allclose(buffer.samples, pcm / 32768.0, atol=1e-7)
+    assert buffer.allocations == [('decode', pcm.size * 4)]
+    assert np.shares_memory(buffer.window(), buffer.samples)
+    assert len(buffer.window()) == WINDOW_SAMPLES
+    assert np.shares_memory(buffer.view(16000, 32000), buffer.samples)
+
+    # Short audio is padded in a scratch array allocated once
+    short = AudioBuffer.from_array(np.ones(1000, dtype=np.float32))
+    window = short.window()
+    assert window[:1000].sum() == 1000 and not window[1000:].any()
+    short.window()
+    assert [purpose for purpose, _ in short.allocations] == ['padding']
+
+def test_compact_moves_regions_in_place_and_leaves_borrowed_arrays_alone():
+    audio = np.arange(100, dtype=np.float32)
+    regions = [(10, 20), (50, 55), (90, 100)]
+    expected = np.concatenate([audio[start:end] for start, end in regions])
+
+    owned = AudioBuffer.decoded(audio.copy())
+    storage = owned.samples
+    owned.compact(regions)
+    np.testing.assert_array_equal(owned.samples, expected)
+    assert np.shares_memory(owned.samples, storage)
+    assert [purpose for purpose, _ in owned.allocations] == ['decode']
+
+    borrowed = AudioBuffer.from_array(audio)
+    assert np.shares_memory(borrowed.samples, audio)
+    borrowed.compact(regions)
+    np.testing.assert_array_equal(borrowed.samples, expected)
+    np.testing.assert_array_equal(audio, np.arange(100, dtype=np.float32))
+    assert [purpose for purpose, _ in borrowed.allocations] == ['vad']
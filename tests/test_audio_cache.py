@@ -0,0 +1,85 @@
+"""
+Tests for the decoded-audio cache.
+"""
+
+import os
+import pickle
+
+import numpy as np
+
+from src.audio_cache import AudioCache, is_cached_audio, open_cached_audio
+
+def _media(tmp_path, name, content=b"video"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+def test_store_and_lookup_round_trip(tmp_path):
+    """Stored audio is found again and memory-mapped unchanged."""
+    cache = AudioCache(str(tmp_path / "cache"))
+    media = _media(tmp_path, "clip.mp4")
+    audio = np.linspace(-1, 1, 16000, dtype=np.float32)
+
+    assert cache.lookup(media) is None
+    cache.store(media, audio)
+    path = cache.lookup(media)
+
+    assert is_cached_audio(path)
+    assert np.array_equal(open_cached_audio(path), audio)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Worker processes receive a pickled copy
+    assert pickle.loads(pickle.dumps(cache)).lookup(media) == path
+
+def test_int16_cache_and_changed_input(tmp_path):
+    """int16 entries round-trip approximately and an edited input misses."""
+    cache = AudioCache(str(tmp_path / "cache"), dtype='int16')
+    media = _media(tmp_path, "clip.mp4")
+    audio = np.sin(np.linspace(0, 100, 8000)).astype(np.float32)
+    cache.store(media, audio)
+
+    loaded = open_cached_audio(cache.lookup(media))
+    assert loaded.dtype == np.float32
+    assert np.abs(loaded - audio).max() < 1e-3
+
+    stat = os.stat(media)
+    os.utime(media, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.lookup(media) is None
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Going over the quota removes the entries used longest ago."""
+    audio = np.zeros(1000, dtype=np.float32)  # 4000 bytes per entry
+    cache = AudioCache(str(tmp_path / "cache"), max_bytes=10000)
+    first, second, third = (_media(tmp_path, f"{name}.mp4") for name in ("a", "b", "c"))
+
+    for age, media in ((300, first), (200, second)):
+        path = cache.store(media, audio)
+        os.utime(path, (os.path.getmtime(path) - age,) * 2)
+    # Using the first entry makes the second the least recently used
+    cache.lookup(first)
+    cache.store(third, audio)
+
+    assert cache.lookup(first) is not None
+    assert cache.lookup(second) is None
+    assert cache.lookup(third) is not None
+
+def test_entry_evicted_after_lookup_is_decoded_again(tmp_path, monkeypatch):
+    """An entry removed between lookup and load falls back to decoding the media."""
+    from src import transcriber as transcriber_module
+    from src.audio_buffer import AudioBuffer
+
+    cache = AudioCache(str(tmp_path / "cache"))
+    media = _media(tmp_path, "clip.mp4")
+    audio = np.linspace(-1, 1, 1600, dtype=np.float32)
+    path = cache.store(media, audio)
+    assert cache.lookup(media) == path
+    os.unlink(path)  # Evicted by another worker
+
+    monkeypatch.setattr(transcriber_module, 'decode_audio', lambda media_path: AudioBuffer.decoded(audio))
+    transcriber = transcriber_module.WhisperTranscriber.__new__(transcriber_module.WhisperTranscriber)
+    transcriber.audio_cache = cache
+    buffer = transcriber.load_buffer(path, media)
+
+    np.testing.assert_array_equal(buffer.samples, audio)
+    # Stored again for the next run
+    assert cache.lookup(media) == path
@@ -0,0 +1,133 @@
+"""
+Tests for the staged batch pipeline engine.
+"""
+
+import threading
+import time
+
+from src.batch import BatchJob, PipelineEngine, RetryingFeed, Stage
+
+def make_jobs(count):
+    return [BatchJob(f"in{i}.mp4", f"out{i}.srt", f"in{i}.mp4") for i in range(count)]
+
+def test_all_jobs_pass_through_every_stage():
+    """Every job visits each stage once, in order."""
+    def visit(name):
+        def func(job):
+            job.timings.setdefault('order', []).append(name)
+        return func
+
+    stages = [Stage('a', visit('a'), 2), Stage('b', visit('b'), 3), Stage('c', visit('c'), 1)]
+    engine = PipelineEngine(stages, queue_size=1)
+    finished = list(engine.run(make_jobs(10)))
+
+    assert len(finished) == 10
+    assert all(job.timings['order'] == ['a', 'b', 'c'] for job in finished)
+    assert [s['jobs'] for s in engine.report()] == [10, 10, 10]
+
+def test_failed_job_skips_remaining_stages():
+    """A failure is recorded on the job and later stages are skipped."""
+    def fail_odd(job):
+        if job.input_path in ('in1.mp4', 'in3.mp4'):
+            raise Exception("boom")
+
+    stages = [Stage('first', fail_odd), Stage('second', lambda job: None)]
+    engine = PipelineEngine(stages)
+    finished = {job.input_path: job for job in engine.run(make_jobs(4))}
+
+    assert finished['in1.mp4'].error == "boom"
+    assert finished['in1.mp4'].failed_stage == 'first'
+    assert finished['in0.mp4'].error is None
+    assert engine.report()[1]['jobs'] == 2
+
+def test_stages_overlap():
+    """A stage with several workers processes jobs concurrently."""
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow(job):
+        with lock:
+            active.append(job)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(job)
+
+    engine = PipelineEngine([Stage('slow', slow, 4)], queue_size=4)
+    list(engine.run(make_jobs(8)))
+
+    assert max(peak) > 1
+
+def test_retrying_feed_retries_failed_jobs():
+    """Failed jobs are fed back until they succeed or run out of attempts."""
+    calls = {}
+
+    def flaky(job):
+        calls[job.input_path] = calls.get(job.input_path, 0) + 1
+        if job.input_path == 'in0.mp4' and calls[job.input_path] < 2:
+            raise Exception("transient")
+        if job.input_path == 'in1.mp4':
+            raise Exception("permanent")
+
+    started = []
+    feed = RetryingFeed(make_jobs(3), max_attempts=3, retry_delay=0.01, on_start=started.append)
+    engine = PipelineEngine([Stage('flaky', flaky)])
+
+    final = {}
+    for job in engine.run(feed):
+        if not feed.settle(job):
+            final[job.input_path] = (job.error, job.attempts)
+
+    assert final == {
+        'in0.mp4': (None, 2),
+        'in1.mp4': ('permanent', 3),
+        'in2.mp4': (None, 1)
+    }
+    assert len(started) == 6
+
+def test_nodes_serve_retries_while_waiting_on_each_other(tmp_path):
+    """Two queue nodes that each fail one job once both finish, rather than
+    waiting forever on the lease the other holds for its pending retry."""
+    from src.work_queue import CLAIMED, WorkQueue
+
+    first_claims = {'a': threading.Event(), 'b': threading.Event()}
+    results = {}
+
+    def run_node(name, order, other):
+        queue = WorkQueue(str(tmp_path), node_id=name, lease_ttl=60, poll_interval=0.05)
+        try_claim = queue.try_claim
+
+        def claim_after_other(key):
+            if key != order[0]:
+                # Try the second file only once the other node holds it
+                first_claims[other].wait(5)
+            state = try_claim(key)
+            if key == order[0] and state == CLAIMED:
+                first_claims[name].set()
+            return state
+        queue.try_claim = claim_after_other
+
+        def fail_first_attempt(job):
+            if job.attempts == 1:
+                raise Exception("transient")
+
+        jobs = [BatchJob(key, key + '.srt', key) for key in order]
+        feed = RetryingFeed(queue.claim_jobs(jobs, yield_idle=True), max_attempts=3, retry_delay=0.01)
+        done = []
+        for job in PipelineEngine([Stage('work', fail_first_attempt)]).run(feed):
+            if not feed.settle(job):
+                queue.complete(job.rel_path, 'done' if job.error is None else 'failed')
+                done.append((job.rel_path, job.error, job.attempts))
+        queue.close()
+        results[name] = done
+
+    threads = [threading.Thread(target=run_node, args=('a', ['a.mp4', 'b.mp4'], 'b'), daemon=True),
+               threading.Thread(target=run_node, args=('b', ['b.mp4', 'a.mp4'], 'a'), daemon=True)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert results == {'a': [('a.mp4', None, 2)], 'b': [('b.mp4', None, 2)]}
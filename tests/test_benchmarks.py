@@ -0,0 +1,29 @@
+"""
+Tests for the benchmark suite's baseline comparison.
+"""
+
+from benchmarks.run_benchmarks import compare
+
+def record(wall=1.0, rss=100 * 2**20, requests=2):
+    return {'wall_seconds': wall, 'peak_rss_bytes': rss, 'requests': requests}
+
+def test_regressions_past_the_threshold_are_reported():
+    """Slower, larger or chattier stages are flagged; changes within the threshold are not."""
+    baseline = {'translation': record(), 'formatting_srt': record()}
+    results = {
+        'translation': record(wall=1.5, rss=200 * 2**20, requests=3),
+        'formatting_srt': record(wall=1.2, rss=110 * 2**20, requests=2)
+    }
+
+    assert compare(results, baseline, threshold=0.25) == [
+        "translation: wall time 1.000s -> 1.500s",
+        "translation: peak RSS 100 MiB -> 200 MiB",
+        "translation: requests 2 -> 3"
+    ]
+
+def test_noise_and_new_stages_are_ignored():
+    """Tiny wall-time changes and stages missing from the baseline never fail a run."""
+    baseline = {'formatting_vtt': record(wall=0.01)}
+    results = {'formatting_vtt': record(wall=0.04), 'transcription': record(wall=100.0)}
+
+    assert compare(results, baseline, threshold=0.25) == []
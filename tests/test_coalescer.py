@@ -0,0 +1,77 @@
+"""
+Tests for cross-file translation request coalescing.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.coalescer import TranslationCoalescer
+
+class BatchTranslator:
+    chunk_size = 100
+
+    def __init__(self):
+        self.requests = []
+
+    def translate_lines(self, lines, source_lang='auto', target_lang='en'):
+        self.requests.append((source_lang, target_lang, list(lines)))
+        return [f"{target_lang}:{line}" for line in lines]
+
+    def translate(self, text, source_lang='auto', target_lang='en', progress=None, task_id=None):
+        self.requests.append((source_lang, target_lang, [text]))
+        return f"{target_lang}:{text}"
+
+def test_texts_from_many_callers_share_requests_per_language_pair():
+    """Concurrent short texts are combined per pair and every caller gets its own result."""
+    translator = BatchTranslator()
+    coalescer = TranslationCoalescer(translator, max_wait=0.2)
+    calls = [(f"clip {i}", 'en' if i % 2 else 'de', 'fr') for i in range(10)]
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda call: coalescer.translate(*call), calls))
+    coalescer.close()
+
+    assert results == [f"fr:clip {i}" for i in range(10)]
+    assert len(translator.requests) == 2
+    assert {pair for pair in ((src, tgt) for src, tgt, _ in translator.requests)} == {('en', 'fr'), ('de', 'fr')}
+
+def test_full_requests_go_out_early_and_long_texts_bypass():
+    """A full batch doesn't wait for the deadline; oversized texts are translated directly."""
+    translator = BatchTranslator()
+    coalescer = TranslationCoalescer(translator, max_chars=20, max_wait=10)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda text: coalescer.translate(text, 'en', 'fr'), ["a" * 9, "b" * 9]))
+    assert time.monotonic() - started < 5
+    assert results == ["fr:" + "a" * 9, "fr:" + "b" * 9]
+
+    assert coalescer.translate("x" * 50, 'en', 'fr') == "fr:" + "x" * 50
+    assert coalescer.translate("same", 'fr', 'fr') == "same"
+    coalescer.close()
+    assert len(translator.requests) == 2
+
+def test_failed_shared_request_falls_back_to_each_text():
+    """When a combined request fails, texts are retried alone and only the bad one fails."""
+    class FlakyTranslator(BatchTranslator):
+        def translate_lines(self, lines, source_lang='auto', target_lang='en'):
+            raise Exception("batch rejected")
+
+        def translate(self, text, source_lang='auto', target_lang='en', progress=None, task_id=None):
+            if text == "bad":
+                raise Exception("text rejected")
+            return super().translate(text, source_lang, target_lang)
+
+    coalescer = TranslationCoalescer(FlakyTranslator(), max_wait=0.2)
+
+    def call(text):
+        try:
+            return coalescer.translate(text, 'en', 'fr')
+        except Exception as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(call, ["good", "bad", "fine"]))
+    coalescer.close()
+
+    assert results == ["fr:good", "text rejected", "fr:fine"]
@@ -0,0 +1,39 @@
+"""
+Tests for the batch job journal.
+"""
+
+from src.journal import JobJournal, DONE, FAILED, PENDING, RUNNING
+
+def test_job_lifecycle_survives_reopen(tmp_path):
+    """States, attempts and errors are persisted across journal instances."""
+    path = str(tmp_path / "journal.sqlite")
+    journal = JobJournal(path)
+    for key in ('a.mp4', 'b.mp4', 'c.mp4'):
+        journal.add(key, key, key + '.srt')
+
+    journal.start('a.mp4')
+    journal.finish('a.mp4', {'transcription': 1.5})
+    journal.start('b.mp4')
+    journal.fail('b.mp4', 'decoder error')
+    journal.start('b.mp4')
+    journal.start('c.mp4')
+    journal.close()
+
+    # Simulate a crash: b.mp4 and c.mp4 were left running
+    journal = JobJournal(path)
+    assert journal.state('a.mp4') == DONE
+    assert journal.state('b.mp4') == RUNNING
+    assert journal.unfinished() == {'b.mp4', 'c.mp4'}
+
+    journal.fail('b.mp4', 'decoder error')
+    assert journal.failures() == [('b.mp4', 2, 'decoder error')]
+    assert journal.summary() == {DONE: 1, FAILED: 1, RUNNING: 1}
+
+    # Adding a known job keeps its state
+    journal.add('a.mp4', 'a.mp4', 'a.mp4.srt')
+    assert journal.state('a.mp4') == DONE
+
+    journal.reset()
+    journal.add('a.mp4', 'a.mp4', 'a.mp4.srt')
+    assert journal.state('a.mp4') == PENDING
+    journal.close()
@@ -0,0 +1,126 @@
+"""
+Tests for the incremental batch manifest.
+"""
+
+import os
+
+from src.manifest import BatchManifest
+
+SETTINGS = {'model': 'base', 'language': 'en', 'format': 'srt'}
+
+def make_files(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(os.urandom(4096))
+    output = tmp_path / "clip.srt"
+    output.write_text("1\n")
+    return str(video), str(output)
+
+def test_recorded_file_is_current_across_runs(tmp_path):
+    """A recorded file is skipped by a later run with the same settings."""
+    video, output = make_files(tmp_path)
+    path = str(tmp_path / "manifest.json")
+
+    manifest = BatchManifest(path, SETTINGS)
+    assert not manifest.is_current("clip.mp4", video, output)
+    manifest.record("clip.mp4", video)
+    manifest.close()
+
+    assert BatchManifest(path, SETTINGS).is_current("clip.mp4", video, output)
+
+def test_changed_settings_or_content_reprocess(tmp_path):
+    """Different settings, edited content or a missing output invalidate an entry."""
+    video, output = make_files(tmp_path)
+    path = str(tmp_path / "manifest.json")
+    manifest = BatchManifest(path, SETTINGS)
+    manifest.record("clip.mp4", video)
+    manifest.close()
+
+    assert not BatchManifest(path, dict(SETTINGS, model='small')).is_current("clip.mp4", video, output)
+
+    # A touched file has no trusted full hash yet, so it is reprocessed
+    stat = os.stat(video)
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not BatchManifest(path, SETTINGS).is_current("clip.mp4", video, output)
+
+    with open(video, 'r+b') as f:
+        f.write(b'changed!')
+    assert not BatchManifest(path, SETTINGS).is_current("clip.mp4", video, output)
+
+    os.unlink(output)
+    assert not BatchManifest(path, SETTINGS).is_current("clip.mp4", video, output)
+
+def test_record_uses_state_from_job_start(tmp_path):
+    """A file edited while it was processed is not recorded as current."""
+    video, output = make_files(tmp_path)
+    manifest = BatchManifest(str(tmp_path / "manifest.json"), SETTINGS)
+    snapshot = manifest.snapshot(video)
+
+    with open(video, 'ab') as f:
+        f.write(b'appended during the run')
+    manifest.record("clip.mp4", video, snapshot)
+
+    assert manifest.entries["clip.mp4"]['hash'] is None
+    assert not manifest.is_current("clip.mp4", video, output)
+
+def touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def test_first_touch_reprocesses_and_stores_full_hash(tmp_path):
+    """Without a trusted full hash a touched file is reprocessed; later touches are confirmed by it."""
+    video, output = make_files(tmp_path)
+    manifest = BatchManifest(str(tmp_path / "manifest.json"), SETTINGS)
+    manifest.record("clip.mp4", video)
+    assert manifest.entries["clip.mp4"]['hash'] is None
+
+    touch(video)
+    assert not manifest.is_current("clip.mp4", video, output)
+    manifest.record("clip.mp4", video, manifest.snapshot(video))
+    assert manifest.entries["clip.mp4"]['hash'] is not None
+
+    touch(video)
+    assert manifest.is_current("clip.mp4", video, output)
+
+def test_edit_outside_sampled_blocks_is_reprocessed(tmp_path):
+    """Changes the partial hash can't see are caught, with or without a stored full hash."""
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(os.urandom(8 * 2**20))
+    output = tmp_path / "clip.srt"
+    output.write_text("1\n")
+    video, output = str(video), str(output)
+    manifest = BatchManifest(str(tmp_path / "manifest.json"), SETTINGS)
+    manifest.record("clip.mp4", video)
+
+    def edit(data):
+        with open(video, 'r+b') as f:
+            f.seek(2 * 2**20)
+            f.write(data)
+        touch(video)
+
+    edit(b'changed!')
+    assert not manifest.is_current("clip.mp4", video, output)
+
+    manifest.record("clip.mp4", video, manifest.snapshot(video))
+    edit(b'again!!!')
+    assert not manifest.is_current("clip.mp4", video, output)
+
+def test_nodes_sharing_a_manifest_keep_each_others_entries(tmp_path):
+    """Saving merges into the file on disk instead of overwriting other nodes' records."""
+    first, output = make_files(tmp_path)
+    second = str(tmp_path / "other.mp4")
+    with open(second, 'wb') as f:
+        f.write(os.urandom(4096))
+    (tmp_path / "other.srt").write_text("1\n")
+    path = str(tmp_path / "manifest.json")
+
+    node_a = BatchManifest(path, SETTINGS)
+    node_b = BatchManifest(path, SETTINGS)
+    node_a.record("clip.mp4", first)
+    node_a.close()
+    node_b.record("other.mp4", second)
+    node_b.close()
+
+    reloaded = BatchManifest(path, SETTINGS)
+    assert reloaded.is_current("clip.mp4", first, output)
+    assert reloaded.is_current("other.mp4", second, str(tmp_path / "other.srt"))
+    assert not os.path.exists(path + ".lock")
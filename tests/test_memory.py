@@ -0,0 +1,43 @@
+"""
+Tests for memory-budget admission control.
+"""
+
+import threading
+from types import SimpleNamespace
+
+from src.memory import BYTES_PER_AUDIO_SECOND, MemoryBudget
+
+MiB = 2**20
+
+def test_jobs_wait_until_memory_is_released():
+    """A job that doesn't fit next to the running ones is admitted after a release."""
+    budget = MemoryBudget(100 * MiB, 'tiny', resident_models=0, rss=lambda: 0)
+    seconds = 40 * MiB / BYTES_PER_AUDIO_SECOND  # 40 MiB per job
+    first, second, third = (SimpleNamespace(duration=seconds) for _ in range(3))
+
+    budget.acquire(first)
+    budget.acquire(second)
+    admitted = threading.Event()
+    waiter = threading.Thread(target=lambda: (budget.acquire(third), admitted.set()))
+    waiter.start()
+
+    assert not admitted.wait(0.2)
+    budget.release(first)
+    assert admitted.wait(2)
+    waiter.join()
+    assert budget.in_flight() == 2 and budget.waits == 1
+
+def test_oversized_job_runs_alone_and_observed_rss_raises_estimates():
+    """A single huge job is never blocked, and RSS above the estimates scales them up."""
+    rss = [0]
+    budget = MemoryBudget(100 * MiB, 'tiny', resident_models=0, rss=lambda: rss[0])
+    huge = SimpleNamespace(duration=10**6)
+    budget.acquire(huge)
+    budget.release(huge)
+
+    job = SimpleNamespace(duration=20 * MiB / BYTES_PER_AUDIO_SECOND)
+    budget.acquire(job)
+    rss[0] = 60 * MiB  # The job really uses three times its estimate
+    budget.observe()
+    assert budget.scale == 3.0
+    assert budget.peak_rss == 60 * MiB
@@ -0,0 +1,29 @@
+"""
+Tests for run metrics and report output.
+"""
+
+import json
+
+from src.metrics import MetricsRecorder
+
+def test_report_and_prometheus_output(tmp_path):
+    """Recorded files, counters and histograms appear in both outputs."""
+    metrics = MetricsRecorder()
+    metrics.record_file('a.mp4', 'done', {'transcription': 3.0, 'translation': 0.2}, audio_seconds=60.0)
+    metrics.record_file('b.mp4', 'skipped')
+    metrics.increment('translation_requests_total', service='google', outcome='ok')
+    metrics.increment('translation_requests_total', service='google', outcome='ok')
+    metrics.observe('translation_request_seconds', 0.3, service='google')
+
+    metrics.write_json(str(tmp_path / "report.json"))
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert [f['status'] for f in report['files']] == ['done', 'skipped']
+    requests = [c for c in report['counters'] if c['name'] == 'translation_requests_total']
+    assert requests == [{'name': 'translation_requests_total', 'labels': {'outcome': 'ok', 'service': 'google'}, 'value': 2}]
+
+    metrics.write_prometheus(str(tmp_path / "metrics.prom"))
+    text = (tmp_path / "metrics.prom").read_text()
+    assert '# TYPE subtitle_stage_seconds histogram' in text
+    assert 'subtitle_stage_seconds_bucket{stage="transcription",le="5"} 1' in text
+    assert 'subtitle_audio_seconds_total 60.0' in text
+    assert 'subtitle_translation_request_seconds_count{service="google"} 1' in text
@@ -0,0 +1,56 @@
+"""
+Tests for translating segments alongside transcription.
+"""
+
+import threading
+
+import pytest
+
+from src.pipeline import StreamingTranslation
+
+class RecordingTranslator:
+    chunk_size = 20
+
+    def __init__(self, fail=False):
+        self.requests = []
+        self.threads = set()
+        self.fail = fail
+
+    def translate(self, text, source_lang='auto', target_lang='en'):
+        self.requests.append(text)
+        self.threads.add(threading.get_ident())
+        if self.fail:
+            raise RuntimeError("service down")
+        return text.upper()
+
+def segment(text, start):
+    return {'start': start, 'end': start + 1, 'text': text}
+
+def test_sentence_complete_batches_are_translated_in_the_background():
+    """Batches close on sentence ends past the size limit and keep segment order."""
+    translator = RecordingTranslator()
+    streaming = StreamingTranslation(translator, 'fr')
+
+    streaming.feed([segment(' The first sentence', 0), segment(' ends here.', 1)], 'en')
+    streaming.feed([segment(' Second one', 2)], 'en')
+    streaming.feed([segment(' too.', 3)], 'en')
+    text, segments = streaming.finish()
+
+    assert translator.requests == [' The first sentence ends here.', ' Second one too.']
+    assert threading.get_ident() not in translator.threads
+    assert [s['start'] for s in segments] == [0, 1, 2, 3]
+    assert text.startswith('THE FIRST SENTENCE')
+    assert streaming.batches == 2
+
+def test_same_language_passes_through_and_errors_surface():
+    """No requests are made for the target language; failures are raised by finish()."""
+    translator = RecordingTranslator()
+    streaming = StreamingTranslation(translator, 'en')
+    streaming.feed([segment(' Already English.', 0)], 'en')
+    assert streaming.finish()[1][0]['text'] == ' Already English.'
+    assert translator.requests == []
+
+    failing = StreamingTranslation(RecordingTranslator(fail=True), 'fr')
+    failing.feed([segment(' Bonjour tout le monde.', 0)], 'en')
+    with pytest.raises(Exception, match="service down"):
+        failing.finish()
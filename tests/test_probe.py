@@ -0,0 +1,45 @@
+"""
+Tests for media probing and batch scheduling helpers.
+"""
+
+import os
+
+from src.probe import ProbeCache, probe_all, unusable_reason
+
+def test_unusable_reasons():
+    """Files without audio or with probe errors are rejected up front."""
+    assert unusable_reason({'duration': 12.0, 'audio_streams': 1, 'error': None}) is None
+    assert unusable_reason({'duration': 12.0, 'audio_streams': 0, 'error': None}) == "No audio stream"
+    assert unusable_reason({'duration': 0.0, 'audio_streams': 1, 'error': None}) == "Zero-length audio"
+    assert unusable_reason({'error': 'moov atom not found'}).startswith("Probe failed")
+
+def test_probe_cache_is_reused_until_file_changes(tmp_path):
+    """Cached results are served without probing and invalidated by a new mtime."""
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"data")
+    info = {'duration': 3.0, 'audio_streams': 1, 'error': None}
+
+    cache = ProbeCache(str(tmp_path / "probe.json"))
+    cache.put(str(video), info)
+    cache.save()
+
+    reloaded = ProbeCache(str(tmp_path / "probe.json"))
+    # A missing ffprobe binary proves the cached entry was used
+    assert probe_all([str(video)], cache=reloaded, ffprobe='/nonexistent/ffprobe') == {str(video): info}
+
+    stat = os.stat(video)
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert reloaded.get(str(video)) is None
+
+def test_failed_and_missing_files_are_reported_not_cached(tmp_path):
+    """Probe failures come back as errors per file and are retried on the next run."""
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"data")
+    missing = str(tmp_path / "deleted.mp4")
+
+    cache = ProbeCache(str(tmp_path / "probe.json"))
+    results = probe_all([str(video), missing], cache=cache, ffprobe='/nonexistent/ffprobe')
+
+    assert results[str(video)]['error']
+    assert results[missing]['error']
+    assert cache.entries == {}
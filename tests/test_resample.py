@@ -0,0 +1,51 @@
+"""
+Tests for the streaming polyphase resampler.
+"""
+
+import wave
+import numpy as np
+
+from src.resample import StreamingResampler, resample_wav
+
+def sine(frequency, seconds, sample_rate, amplitude=0.5):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+def resample_in_blocks(audio, sample_rate, block):
+    resampler = StreamingResampler(sample_rate)
+    output = [resampler.process(audio[i:i + block]) for i in range(0, len(audio), block)]
+    output.append(resampler.flush())
+    return np.concatenate(output)
+
+def test_tone_is_preserved_and_block_size_does_not_matter():
+    """A 440 Hz tone survives resampling and any block size gives the same output."""
+    for sample_rate in (44100, 48000, 22050, 8000):
+        audio = (sine(440, 2, sample_rate) * 32767).astype(np.int16)
+        whole = resample_in_blocks(audio, sample_rate, len(audio))
+        blocks = resample_in_blocks(audio, sample_rate, 1001)
+
+        assert whole.dtype == np.float32
+        assert len(whole) == 32000
+        np.testing.assert_allclose(blocks, whole, atol=1e-6)
+        expected = sine(440, 2, 16000)
+        assert np.abs(whole[500:-500] - expected[500:-500]).max() < 1e-3
+
+def test_frequencies_above_target_nyquist_are_removed():
+    """A 12 kHz tone would alias at 16 kHz, so it is filtered out."""
+    audio = sine(12000, 1, 48000).astype(np.float32)
+    output = resample_in_blocks(audio, 48000, 4096)
+    assert np.abs(output[500:-500]).max() < 1e-3
+
+def test_resample_wav_mixes_stereo_pcm_down(tmp_path):
+    path = str(tmp_path / 'stereo.wav')
+    left = (sine(300, 1.5, 44100) * 32767).astype('<i2')
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(np.stack([left, np.zeros_like(left)], axis=1).tobytes())
+
+    audio = resample_wav(path, block_frames=5000)
+    assert len(audio) == 24000
+    expected = sine(300, 1.5, 16000) / 2
+    assert np.abs(audio[500:-500] - expected[500:-500]).max() < 1e-3
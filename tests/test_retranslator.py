@@ -0,0 +1,57 @@
+"""
+Tests for subtitle parsing and incremental re-translation.
+"""
+
+from src.formatter import SubtitleFormatter
+from src.retranslator import IncrementalRetranslator
+
+SOURCE_SRT = """1
+00:00:01,000 --> 00:00:02,500
+Hello there.
+
+2
+00:00:03,000 --> 00:00:04,000
+How are you?
+
+3
+00:00:05,000 --> 00:00:06,000
+Goodbye.
+"""
+
+class UppercaseTranslator:
+    """Stand-in translator that records every line it is asked to translate."""
+
+    def __init__(self):
+        self.requests = []
+
+    def translate_lines(self, lines, source_lang='auto', target_lang='en'):
+        self.requests.append(list(lines))
+        return [line.upper() for line in lines]
+
+def test_parse_srt_and_vtt():
+    """Both formats parse back into the same segments."""
+    formatter = SubtitleFormatter()
+    segments = formatter.parse_subtitle_content(SOURCE_SRT)
+    vtt = formatter._format_vtt(segments)
+
+    assert [s['text'] for s in segments] == ['Hello there.', 'How are you?', 'Goodbye.']
+    assert segments[0]['start'] == 1.0 and segments[0]['end'] == 2.5
+    assert formatter.parse_subtitle_content(vtt) == segments
+
+def test_only_changed_cues_are_retranslated():
+    """Unchanged cues keep their translation and timing."""
+    formatter = SubtitleFormatter()
+    previous = formatter.parse_subtitle_content(SOURCE_SRT)
+    translation = [dict(s, text=f"T{i}", start=s['start'] + 0.1) for i, s in enumerate(previous)]
+    current = [dict(s) for s in previous]
+    current[1]['text'] = 'How are you doing?'
+
+    translator = UppercaseTranslator()
+    segments, stats = IncrementalRetranslator(translator).retranslate(previous, current, translation)
+
+    assert translator.requests == [['How are you doing?']]
+    assert stats == {'total': 3, 'reused': 2, 'retranslated': 1}
+    assert segments[0] == translation[0]
+    assert segments[1]['text'] == 'HOW ARE YOU DOING?'
+    assert segments[1]['start'] == current[1]['start']
+    assert segments[2] == translation[2]
@@ -0,0 +1,118 @@
+"""
+Tests for the long-running subtitle service.
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+from src.service import ServiceJob, SubtitleService, create_server
+
+class FakeTranscriber:
+    def transcribe(self, video_path, progress=None, task_id=None):
+        progress.update(task_id, advance=100, description="done")
+        return {'text': 'Hello.', 'segments': [{'start': 0.0, 'end': 1.0, 'text': 'Hello.'}], 'language': 'en'}
+
+class FakeFormatter:
+    def __init__(self):
+        self.written = []
+
+    def format_subtitles(self, text, segments, output_path, format='srt', progress=None, task_id=None):
+        self.written.append((output_path, segments))
+
+def test_jobs_run_through_http_api(tmp_path):
+    """A submitted job runs on a resident transcriber and streams its events."""
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    formatter = FakeFormatter()
+    service = SubtitleService([FakeTranscriber()], translator=None, formatter=formatter)
+    service.start()
+
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        request = urllib.request.Request(
+            f"{base}/jobs",
+            data=json.dumps({'input': str(video), 'output': str(tmp_path / "clip.srt")}).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        job = json.loads(urllib.request.urlopen(request).read())
+
+        with urllib.request.urlopen(f"{base}/jobs/{job['id']}/events") as response:
+            events = [json.loads(line) for line in response]
+
+        status = json.loads(urllib.request.urlopen(f"{base}/jobs/{job['id']}").read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert events[0]['event'] == 'queued'
+    assert events[-1]['event'] == 'done'
+    assert status['state'] == 'done'
+    assert status['result']['segments'] == 1
+    assert formatter.written[0][0] == str(tmp_path / "clip.srt")
+
+def test_higher_priority_runs_first():
+    """Queued jobs are taken in priority order."""
+    service = SubtitleService([], translator=None, formatter=None)
+    low = service.submit(ServiceJob('a.mp4', 'a.srt', priority=0))
+    high = service.submit(ServiceJob('b.mp4', 'b.srt', priority=5))
+
+    assert service._queue.get()[2] is high
+    assert service._queue.get()[2] is low
+
+def test_final_event_is_in_place_once_job_is_finished():
+    """A stream that sees the finished state always finds the final event."""
+    job = ServiceJob('a.mp4', 'a.srt')
+    job.finish('failed', 'failed', error='boom')
+
+    assert job.finished
+    assert job.wait_events(0)[0][-1]['event'] == 'failed'
+    assert job.finished_at == job.events[-1]['time']
+
+def test_invalid_priority_or_format_is_rejected(tmp_path):
+    """Bad priority or format values get a 400 instead of a dropped connection."""
+    service = SubtitleService([], translator=None, formatter=None)
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    statuses = []
+    try:
+        for extra in ({'priority': 'high'}, {'priority': None}, {'format': 'txt'}):
+            body = dict({'input': 'a.mp4', 'output': 'a.srt'}, **extra)
+            request = urllib.request.Request(f"{base}/jobs", data=json.dumps(body).encode(), method='POST')
+            try:
+                urllib.request.urlopen(request)
+            except urllib.error.HTTPError as e:
+                statuses.append(e.code)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert statuses == [400, 400, 400]
+    assert service.jobs == {}
+
+def test_finished_jobs_and_events_are_bounded(monkeypatch):
+    """Old finished jobs are forgotten and long jobs keep only recent events."""
+    monkeypatch.setattr('src.service.MAX_JOB_EVENTS', 3)
+    service = SubtitleService([], translator=None, formatter=None, max_finished_jobs=1)
+    first = service.submit(ServiceJob('a.mp4', 'a.srt'))
+    first.finish('done', 'done')
+    second = service.submit(ServiceJob('b.mp4', 'b.srt'))
+    second.finish('done', 'done')
+    third = service.submit(ServiceJob('c.mp4', 'c.srt'))
+
+    assert service.get(first.id) is None
+    assert service.get(second.id) is second
+    assert service.get(third.id) is third
+
+    for i in range(5):
+        third.emit('progress', step=i)
+    events, next_index = third.wait_events(1)
+    assert [event.get('step') for event in events] == [2, 3, 4]
+    assert next_index == 6
@@ -0,0 +1,37 @@
+"""
+Tests for the local translation-service simulator used by the load test.
+"""
+
+from src.translator import Translator
+from benchmarks.translation_simulator import (
+    ServiceProfile, SimulatedBackend, TranslationSimulator, install
+)
+
+def test_failures_fall_back_and_rate_limits_answer_429():
+    """A failing primary hands over to the fallback; a throttled service answers 429."""
+    profiles = {
+        'broken': ServiceProfile(latency='fixed', latency_mean=0.0, failure_rate=1.0),
+        'healthy': ServiceProfile(latency='fixed', latency_mean=0.0),
+        'throttled': ServiceProfile(latency='fixed', latency_mean=0.0, rate_limit=0.01, burst=1)
+    }
+    server = TranslationSimulator(profiles).start()
+    try:
+        translator = Translator()
+        translator.verbose = False
+        translator.translation_services = [install(server.url, 'broken'), install(server.url, 'healthy')]
+        SimulatedBackend.reset()
+
+        assert translator.translate("hello world", source_lang='en', target_lang='fr') == "olleh dlrow"
+        assert SimulatedBackend.responses == {503: 1, 200: 1}
+
+        install(server.url, 'throttled')
+        backend = SimulatedBackend(server.url, 'throttled')
+        assert backend.translate("first request") == "tsrif tseuqer"
+        try:
+            backend.translate("second request")
+            assert False, "expected a rate limit"
+        except Exception as e:
+            assert '429' in str(e)
+        assert server.stats()['throttled'] == {'ok': 1, 'rate_limited': 1}
+    finally:
+        server.stop()
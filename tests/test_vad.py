@@ -0,0 +1,88 @@
+"""
+Tests for the energy-based voice activity detection.
+"""
+
+import numpy as np
+
+from src.vad import SpeechTimeline, detect_speech_regions, extract_speech, split_points
+
+SAMPLE_RATE = 16000
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+def silence(seconds):
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 0.001, int(seconds * SAMPLE_RATE)).astype(np.float32)
+
+def test_speech_regions_and_timestamp_remapping():
+    """Loud parts are found, silence is skipped and times map back to the original."""
+    audio = np.concatenate([silence(5), tone(2), silence(0.2), tone(1), silence(10), tone(3), silence(4)])
+    regions = detect_speech_regions(audio, padding_ms=100)
+
+    # The short pause is bridged, the long one splits the regions
+    assert len(regions) == 2
+    assert abs(regions[0][0] / SAMPLE_RATE - 4.9) < 0.05
+    assert abs(regions[1][0] / SAMPLE_RATE - 18.1) < 0.05
+
+    speech = extract_speech(audio, regions)
+    assert len(speech) < len(audio) * 0.5
+
+    timeline = SpeechTimeline(regions)
+    first_length = (regions[0][1] - regions[0][0]) / SAMPLE_RATE
+    segments = [
+        {'start': 0.1, 'end': first_length},
+        {'start': first_length, 'end': first_length + 1.0}
+    ]
+    timeline.remap_segments(segments)
+    assert abs(segments[0]['start'] - 5.0) < 0.05
+    assert abs(segments[0]['end'] - regions[0][1] / SAMPLE_RATE) < 1e-6
+    assert abs(segments[1]['start'] - regions[1][0] / SAMPLE_RATE) < 1e-6
+
+def test_uniform_audio():
+    """Continuous speech is kept whole and pure silence yields nothing."""
+    audio = tone(5)
+    assert detect_speech_regions(audio) == [(0, len(audio))]
+    assert detect_speech_regions(np.zeros(SAMPLE_RATE * 5, dtype=np.float32)) == []
+
+def test_split_points_cut_at_quiet_moments():
+    """Chunk boundaries move to the pause nearest their nominal position."""
+    rng = np.random.default_rng(1)
+    audio = (0.3 * rng.standard_normal(16000 * 25)).astype(np.float32)
+    audio[16000 * 11:16000 * 11 + 4800] = 0.0  # 300 ms pause 1 s after the nominal 10 s cut
+
+    points = split_points(audio, chunk_seconds=10, search_seconds=2)
+    assert 16000 * 11 <= points[0] < 16000 * 11 + 4800
+    lengths = np.diff([0] + points + [len(audio)]) / SAMPLE_RATE
+    assert all(8 <= length <= 12 for length in lengths[:-1])
+    assert lengths[-1] >= 2
+
+def test_silent_audio_gives_empty_transcription():
+    """A file without speech is transcribed as empty instead of failing the job."""
+    from src.transcriber import WhisperTranscriber
+    from src.pipeline import translate_transcription
+
+    transcriber = WhisperTranscriber.__new__(WhisperTranscriber)
+    transcriber.vad = True
+    transcriber.profiler = None
+    result = transcriber.transcribe_audio(silence(5))
+
+    assert result['text'] == '' and result['segments'] == []
+    assert result['speech_seconds'] == 0.0
+    # Nothing is sent for translation
+    assert translate_transcription(result, translator=None, target_lang='fr') == ('', [])
+
+def test_empty_whisper_result_is_treated_like_no_speech():
+    """Without VAD, a silent file that Whisper transcribes as nothing also gives an empty transcription."""
+    from src.transcriber import WhisperTranscriber
+
+    transcriber = WhisperTranscriber.__new__(WhisperTranscriber)
+    transcriber.vad = False
+    transcriber.profiler = None
+    transcriber.model = None  # Language detection fails and falls back to English
+    transcriber._decode = lambda audio, language: ({'text': ' ', 'segments': []}, language)
+    result = transcriber.transcribe_audio(silence(5))
+
+    assert result['text'] == '' and result['segments'] == []
+    assert result['language'] is None
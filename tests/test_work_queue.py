@@ -0,0 +1,56 @@
+"""
+Tests for the shared-filesystem work queue.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+from src.work_queue import CLAIMED, FINISHED, HELD, WorkQueue
+
+def test_each_file_is_claimed_by_one_node(tmp_path):
+    """A live lease keeps other nodes away until the file is finished."""
+    first = WorkQueue(str(tmp_path), node_id='a')
+    second = WorkQueue(str(tmp_path), node_id='b')
+
+    assert first.try_claim('clip.mp4') == CLAIMED
+    assert second.try_claim('clip.mp4') == HELD
+
+    first.complete('clip.mp4', 'done', timings={'transcription': 1.5})
+    assert second.try_claim('clip.mp4') == FINISHED
+    assert [(r['key'], r['node'], r['status']) for r in second.results()] == [('clip.mp4', 'a', 'done')]
+
+    first.close()
+    second.close()
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    """A lease without heartbeats for lease_ttl seconds goes to another node."""
+    crashed = WorkQueue(str(tmp_path), node_id='crashed', lease_ttl=60)
+    assert crashed.try_claim('clip.mp4') == CLAIMED
+    crashed._stop.set()  # Simulate a dead node: no more heartbeats
+
+    lease = crashed._lease_path('clip.mp4')
+    old = time.time() - 120
+    os.utime(lease, (old, old))
+
+    survivor = WorkQueue(str(tmp_path), node_id='survivor', lease_ttl=60)
+    assert survivor.try_claim('clip.mp4') == CLAIMED
+    assert survivor.reclaimed == 1
+    survivor.close()
+
+def test_claim_jobs_skips_finished_and_waits_for_leased(tmp_path):
+    """Jobs finished elsewhere are skipped; leased ones are retried until they expire."""
+    jobs = [SimpleNamespace(rel_path=name) for name in ('a.mp4', 'b.mp4', 'c.mp4')]
+    other = WorkQueue(str(tmp_path), node_id='other', lease_ttl=0.2)
+    other.try_claim('a.mp4')
+    other.complete('a.mp4', 'done')
+    other.try_claim('c.mp4')
+    other._stop.set()  # Crashes while holding c.mp4
+
+    queue = WorkQueue(str(tmp_path), node_id='node', lease_ttl=0.2, poll_interval=0.05)
+    skipped = []
+    claimed = [job.rel_path for job in queue.claim_jobs(jobs, on_skip=skipped.append)]
+
+    assert claimed == ['b.mp4', 'c.mp4']
+    assert [job.rel_path for job in skipped] == ['a.mp4']
+    queue.close()